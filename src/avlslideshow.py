@@ -46,8 +46,12 @@ class AVL_Slideshow(avl.AVLTree):
     def display(self):
         print(util.util.display(self, True))
 
+    def new_node(self, key, style=""):
+        return AVL_Slideshow.AVL_Slideshow_Node(key, self, style=style)
+
     def add_root(self, key, style=""):
-        self.root = AVL_Slideshow.AVL_Slideshow_Node(key, self, style=style)
+        self.edits += 1
+        self.root = self.new_node(key, style)
 
     def add_slide(self, title="", pause=1):
         def copy_children(original, copy):
@@ -69,6 +73,7 @@ class AVL_Slideshow(avl.AVLTree):
             yield self.slides.dequeue()
 
     def add_slideshow(self, key):
+        self.edits += 1
         title = f"Add -> {key}\n"
         self.add_slide(title, 2)
 
@@ -155,6 +160,7 @@ class AVL_Slideshow(avl.AVLTree):
         self.add_slide("Finish\n", 2)
 
     def delete_slideshow(self, key):
+        self.edits += 1
         title = f"Delete -> {key}\n"
         self.add_slide(title, 2)
 
@@ -0,0 +1,826 @@
+"""
+Benchmarks.
+
+Timing comparisons between the data structures in ./ds and the alternatives they are
+designed to improve on. Run all benchmarks with:
+
+    python benchmarks.py
+
+or a selection of them by name:
+
+    python benchmarks.py queue_latency
+"""
+
+import gc
+import heapq
+import random
+import sys
+import tracemalloc
+from concurrent.futures import Future, wait
+from threading import Condition, Thread
+from time import perf_counter, perf_counter_ns
+
+from ds.abt import ArrayBinaryTree
+from ds.avl import AVLTree
+from ds.bt import BinaryTree
+from ds.dcqueue import DynamicCircularQueue
+from ds.heap import Heap, heapsort, merge, nlargest, partial_sort
+from ds.npheap import NumericHeap, np
+from ds.pheap import PairingHeap
+from ds.queue import Queue
+from ds.rheap import RadixHeap
+from ds.rquantile import RunningMedian
+from ds.squeue import SegmentedQueue
+from ds.wsexecutor import WorkStealingExecutor
+
+
+def percentile(samples: list[int], p: float) -> int:
+    """Return the pth percentile of an already sorted list of samples."""
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+
+def report(title: str, rows: list[tuple]):
+    """Print a table of benchmark results, one row per label."""
+    print(title)
+    for row in rows:
+        print("  " + "".join(f"{str(x):>14}" for x in row))
+    print()
+
+
+def bench_queue_latency(n: int = 1_000_000):
+    """
+    Tail latency of enqueue and dequeue.
+
+    Records the time taken by every individual operation while a queue is filled with n
+    items and then drained. The dynamic circular queue has to copy every item when it
+    grows, which shows up in the highest percentiles. In incremental mode it copies a
+    few items per operation instead, and the segmented queue never copies. The garbage
+    collector is disabled while timing so that its pauses are not mistaken for resizes.
+    """
+    rows = [("queue", "op", "p50 ns", "p99 ns", "p99.9 ns", "max ns")]
+    for name, factory in (
+        ("dynamic", DynamicCircularQueue),
+        ("incremental", lambda: DynamicCircularQueue(resize_mode="incremental")),
+        ("segmented", SegmentedQueue),
+    ):
+        queue = factory()
+        for op in ("enqueue", "dequeue"):
+            method = getattr(queue, op)
+            args = (0,) if op == "enqueue" else ()
+            samples = [0] * n
+            gc.disable()
+            for i in range(n):
+                start = perf_counter_ns()
+                method(*args)
+                samples[i] = perf_counter_ns() - start
+            gc.enable()
+            samples.sort()
+            rows.append(
+                (
+                    name,
+                    op,
+                    percentile(samples, 50),
+                    percentile(samples, 99),
+                    percentile(samples, 99.9),
+                    samples[-1],
+                )
+            )
+    report(f"Queue operation latency, {n} items", rows)
+
+
+class SharedQueuePool:
+    """
+    A thread pool where every worker takes tasks from one shared ds.queue.Queue under
+    a single lock. The baseline for the work-stealing executor.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.queue = Queue()
+        self.condition = Condition()
+        self.running = True
+        self.threads = [Thread(target=self.work, daemon=True) for _ in range(workers)]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn, *args):
+        future = Future()
+        with self.condition:
+            self.queue.enqueue((future, fn, args))
+            self.condition.notify()
+        return future
+
+    def take(self):
+        with self.condition:
+            if not self.queue.is_empty():
+                return self.queue.dequeue()
+        return None
+
+    def run(self, task):
+        future, fn, args = task
+        try:
+            future.set_result(fn(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def work(self):
+        while self.running:
+            task = self.take()
+            if task is not None:
+                self.run(task)
+                continue
+            with self.condition:
+                if self.running and self.queue.is_empty():
+                    self.condition.wait(0.01)
+
+    def join(self, future):
+        while not future.done():
+            task = self.take()
+            if task is not None:
+                self.run(task)
+            else:
+                wait((future,), 0.001)
+        return future.result()
+
+    def shutdown(self):
+        self.running = False
+        with self.condition:
+            self.condition.notify_all()
+        for thread in self.threads:
+            thread.join()
+
+
+def fork_join_fib(pool, n: int) -> int:
+    """Naive Fibonacci which submits both recursive calls as subtasks."""
+    if n < 2:
+        return n
+    a = pool.submit(fork_join_fib, pool, n - 1)
+    b = pool.submit(fork_join_fib, pool, n - 2)
+    return pool.join(a) + pool.join(b)
+
+
+def bench_fork_join(n: int = 20, workers: int = 4):
+    """
+    Fork-join throughput.
+
+    Computes Fibonacci numbers by submitting every recursive call as a task, comparing
+    the work-stealing executor against a pool sharing a single ds.queue.Queue. Every
+    operation on the shared queue takes the one lock, and dequeuing from the front of
+    its list is O(n), while the work-stealing workers mostly touch only their own
+    deque. A worker which joins on the shared queue helps with the oldest task rather
+    than one of its own subtasks, so joins nest far deeper and the recursion limit is
+    raised for the duration of the benchmark.
+    """
+    limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(limit, 200_000))
+    rows = [("pool", "workers", "tasks", "seconds", "tasks/s")]
+    tasks = 2 * fork_join_fib_calls(n) - 1
+    for name, factory in (
+        ("shared queue", SharedQueuePool),
+        ("work stealing", WorkStealingExecutor),
+    ):
+        for count in sorted({1, workers}):
+            pool = factory(workers=count)
+            start = perf_counter()
+            pool.join(pool.submit(fork_join_fib, pool, n))
+            seconds = perf_counter() - start
+            pool.shutdown()
+            rows.append((name, count, tasks, f"{seconds:.3f}", int(tasks / seconds)))
+    sys.setrecursionlimit(limit)
+    report(f"Fork-join Fibonacci({n})", rows)
+
+
+def fork_join_fib_calls(n: int) -> int:
+    """Return the number of leaf calls made by fork_join_fib(n)."""
+    a, b = 1, 1
+    for _ in range(n - 1):
+        a, b = b, a + b
+    return b if n > 0 else 1
+
+
+def timed(fn, *args) -> float:
+    """Return the seconds taken by fn(*args)."""
+    start = perf_counter()
+    fn(*args)
+    return perf_counter() - start
+
+
+def bench_heap(n: int = 200_000):
+    """
+    Heap push and pop throughput.
+
+    Pushes n random floats onto an empty heap then pops them all, for Heap as a min
+    heap and as a max heap, and for the C implementation in heapq. Entries mode is
+    compared with pushing (priority, sequence number, item) tuples onto heapq.
+    """
+    data = [random.random() for _ in range(n)]
+    rows = [("heap", "push/s", "pop/s", "heapify s")]
+
+    def run_heap(max_or_min):
+        heap = Heap(max_or_min=max_or_min)
+        add, pop = heap.add, heap.pop
+        push_s = timed(lambda: [add(x) for x in data])
+        pop_s = timed(lambda: [pop() for _ in range(n)])
+        heapify_s = timed(Heap, data[:], max_or_min)
+        rows.append(
+            (f"Heap {max_or_min}", int(n / push_s), int(n / pop_s), f"{heapify_s:.4f}")
+        )
+
+    def run_heapq():
+        heap = []
+        push_s = timed(lambda: [heapq.heappush(heap, x) for x in data])
+        pop_s = timed(lambda: [heapq.heappop(heap) for _ in range(n)])
+        heapify_s = timed(heapq.heapify, data[:])
+        rows.append(("heapq", int(n / push_s), int(n / pop_s), f"{heapify_s:.4f}"))
+
+    def run_entries():
+        heap = Heap(max_or_min="min", entries=True)
+        add, pop = heap.add, heap.pop
+        push_s = timed(lambda: [add(None, x) for x in data])
+        pop_s = timed(lambda: [pop() for _ in range(n)])
+        rows.append(("Heap entries", int(n / push_s), int(n / pop_s), ""))
+
+    def run_heapq_entries():
+        heap = []
+        push_s = timed(
+            lambda: [heapq.heappush(heap, (x, i, None)) for i, x in enumerate(data)]
+        )
+        pop_s = timed(lambda: [heapq.heappop(heap)[2] for _ in range(n)])
+        rows.append(("heapq entries", int(n / push_s), int(n / pop_s), ""))
+
+    run_heap("min")
+    run_heap("max")
+    run_heapq()
+    run_entries()
+    run_heapq_entries()
+    report(f"Heap throughput, {n} random floats", rows)
+
+
+def bench_heap_arity(n: int = 200_000):
+    """
+    Heap throughput by arity.
+
+    A push-heavy workload adds n random floats and pops a tenth as many, while a
+    pop-heavy workload heapifies n floats and pops them all. A wider heap is shallower,
+    which makes add cheaper, but each level of a pop compares more children.
+    """
+    data = [random.random() for _ in range(n)]
+    rows = [("arity", "push/s", "pop/s", "push-heavy s", "pop-heavy s")]
+    for arity in (2, 3, 4, 8, 16):
+        heap = Heap(max_or_min="min", arity=arity)
+        add, pop = heap.add, heap.pop
+        push_s = timed(lambda: [add(x) for x in data])
+        pop_s = timed(lambda: [pop() for _ in range(n)])
+
+        def push_heavy():
+            heap = Heap(max_or_min="min", arity=arity)
+            for i, x in enumerate(data):
+                heap.add(x)
+                if i % 10 == 0:
+                    heap.pop()
+
+        def pop_heavy():
+            heap = Heap(data[:], max_or_min="min", arity=arity)
+            for _ in range(n):
+                heap.pop()
+
+        rows.append(
+            (
+                arity,
+                int(n / push_s),
+                int(n / pop_s),
+                f"{timed(push_heavy):.3f}",
+                f"{timed(pop_heavy):.3f}",
+            )
+        )
+    report(f"Heap throughput by arity, {n} random floats", rows)
+
+
+def bench_meld(shards: int = 64, size: int = 5_000):
+    """
+    Merging heaps.
+
+    Builds a number of shard heaps and merges them into one, then pops the first
+    thousand items. Merging array heaps concatenates their data and heapifies again,
+    which is O(n) for every merge, while pairing heaps meld in O(1) and pay for it in
+    the first pops.
+    """
+    data = [[random.random() for _ in range(size)] for _ in range(shards)]
+    rows = [("heap", "merge s", "1000 pops s")]
+
+    def merge_heaps():
+        heap = Heap(max_or_min="min")
+        for shard in [Heap(d[:], max_or_min="min") for d in data]:
+            heap = Heap(heap.data + shard.data, max_or_min="min")
+        return heap
+
+    def merge_pairing():
+        heap = PairingHeap(max_or_min="min")
+        for shard in [PairingHeap(d, max_or_min="min") for d in data]:
+            heap.meld(shard)
+        return heap
+
+    for name, merge in (("Heap", merge_heaps), ("PairingHeap", merge_pairing)):
+        start = perf_counter()
+        heap = merge()
+        merge_s = perf_counter() - start
+        pop_s = timed(lambda: [heap.pop() for _ in range(1000)])
+        rows.append((name, f"{merge_s:.3f}", f"{pop_s:.4f}"))
+    report(f"Merging {shards} heaps of {size} random floats", rows)
+
+
+def bench_fused(n: int = 200_000, k: int = 100, runs: int = 16):
+    """
+    Fused heap operations.
+
+    Compares pushpop with add followed by pop on a heap of k items, streaming the k
+    largest of n items, and lazily merging sorted runs, each against heapq.
+    """
+    data = [random.random() for _ in range(n)]
+    rows = [("operation", "Heap s", "heapq s")]
+
+    def add_pop():
+        heap = Heap(data=data[:k], max_or_min="min")
+        add, pop = heap.add, heap.pop
+        for x in data:
+            add(x)
+            pop()
+
+    def pushpop():
+        heap = Heap(data=data[:k], max_or_min="min")
+        for x in data:
+            heap.pushpop(x)
+
+    def heapq_pushpop():
+        heap = data[:k]
+        heapq.heapify(heap)
+        for x in data:
+            heapq.heappushpop(heap, x)
+
+    sorted_runs = [sorted(data[i::runs]) for i in range(runs)]
+    rows.append(("add + pop", f"{timed(add_pop):.3f}", ""))
+    rows.append(("pushpop", f"{timed(pushpop):.3f}", f"{timed(heapq_pushpop):.3f}"))
+    rows.append(
+        (
+            f"nlargest {k}",
+            f"{timed(nlargest, k, data):.3f}",
+            f"{timed(heapq.nlargest, k, data):.3f}",
+        )
+    )
+    rows.append(
+        (
+            f"merge {runs}",
+            f"{timed(lambda: list(merge(*sorted_runs))):.3f}",
+            f"{timed(lambda: list(heapq.merge(*sorted_runs))):.3f}",
+        )
+    )
+    report(f"Fused heap operations, {n} random floats", rows)
+
+
+def bench_numeric_heap(n: int = 1_000_000, batch: int = 10_000):
+    """
+    Numeric heap batch operations.
+
+    Compares Heap with NumericHeap building a min heap of n random floats, pushing
+    them in batches, and popping them in batches. Skipped without numpy.
+    """
+    if np is None:
+        print("Numeric heap benchmark skipped, numpy not installed\n")
+        return
+    data = [random.random() for _ in range(n)]
+    array = np.array(data)
+    rows = [("heap", "heapify s", "push s", "pop s")]
+
+    def heap_push():
+        heap = Heap(data=[], max_or_min="min")
+        add = heap.add
+        for x in data:
+            add(x)
+        return heap
+
+    def heap_pop(heap):
+        pop = heap.pop
+        for _ in range(0, n, batch):
+            [pop() for _ in range(batch)]
+
+    def numeric_push():
+        heap = NumericHeap()
+        for i in range(0, n, batch):
+            heap.push_many(array[i : i + batch])
+        return heap
+
+    def numeric_pop(heap):
+        for _ in range(0, n, batch):
+            heap.pop_many(batch)
+
+    for name, build, push, pop in (
+        ("Heap", lambda: Heap(data[:], "min"), heap_push, heap_pop),
+        ("NumericHeap", lambda: NumericHeap(array), numeric_push, numeric_pop),
+    ):
+        heapify_s = timed(build)
+        start = perf_counter()
+        heap = push()
+        push_s = perf_counter() - start
+        pop_s = timed(pop, heap)
+        rows.append((name, f"{heapify_s:.3f}", f"{push_s:.3f}", f"{pop_s:.3f}"))
+    report(f"Numeric heap, {n} random floats in batches of {batch}", rows)
+
+
+def bench_running_median(n: int = 100_000, window: int = 10_000):
+    """
+    Sliding window median.
+
+    Finds the median of the last window samples after every one of n samples, by
+    sorting the window each time and with a running median, which adds the new sample
+    and removes the one leaving the window in O(log n).
+    """
+    samples = [random.random() for _ in range(n)]
+    rows = [("method", "seconds", "medians/s")]
+    refreshes = n // 100
+
+    def sort_window():
+        for i in range(0, n, 100):
+            ordered = sorted(samples[max(0, i - window + 1) : i + 1])
+            mid = len(ordered) // 2
+            if len(ordered) % 2 == 0:
+                (ordered[mid - 1] + ordered[mid]) / 2
+            else:
+                ordered[mid]
+
+    def running():
+        median = RunningMedian()
+        for i, x in enumerate(samples):
+            median.add(x)
+            if i >= window:
+                median.remove(samples[i - window])
+            median.median()
+
+    sort_s = timed(sort_window)
+    rows.append(("sort window", f"{sort_s:.3f}", int(refreshes / sort_s)))
+    running_s = timed(running)
+    rows.append(("RunningMedian", f"{running_s:.3f}", int(n / running_s)))
+    report(
+        f"Median of a {window} sample window, every 100th of {n} samples by sorting,"
+        " every sample with RunningMedian",
+        rows,
+    )
+
+
+def bench_heap_extend(n: int = 100_000):
+    """
+    Bulk insertion into a heap.
+
+    Adds m items to a max heap of n random floats with repeated add, with heapify
+    after appending them all, and with extend, which picks one of the two. Random
+    items usually only sift up a level or two, while ascending items larger than
+    everything in the heap all sift up to the root, the worst case for add.
+    """
+    base = [random.random() for _ in range(n)]
+    rows = [("items", "m", "add s", "heapify s", "extend s")]
+    for name in ("random", "ascending"):
+        for m in (n // 100, n // 10, n // 2, n, 2 * n):
+            if name == "random":
+                new = [random.random() for _ in range(m)]
+            else:
+                new = [1 + (x / m) for x in range(m)]
+
+            def add():
+                heap = Heap(base)
+                for x in new:
+                    heap.add(x)
+
+            def rebuild():
+                heap = Heap(base)
+                heap.data.extend(new)
+                heap.heapify()
+
+            def extend():
+                Heap(base).extend(new)
+
+            # Subtract the cost of copying and heapifying the base heap
+            setup_s = timed(Heap, base)
+            rows.append(
+                (
+                    name,
+                    m,
+                    f"{timed(add) - setup_s:.4f}",
+                    f"{timed(rebuild) - setup_s:.4f}",
+                    f"{timed(extend) - setup_s:.4f}",
+                )
+            )
+    report(f"Adding m items to a heap of {n}", rows)
+
+
+def bench_partial_sort(n: int = 200_000):
+    """
+    Partial and full sorting.
+
+    Finds the k smallest of n random floats in order with partial_sort, which works
+    in place, against sorted()[:k] and heapq.nsmallest, at several ratios of k to n.
+    Sorting the whole list with heapsort is compared against sorted and list.sort.
+    """
+    data = [random.random() for _ in range(n)]
+    rows = [("k", "partial s", "sorted s", "nsmallest s")]
+    for k in (10, n // 1000, n // 100, n // 10, n // 2, n):
+        copy = data[:]
+        rows.append(
+            (
+                k,
+                f"{timed(partial_sort, copy, k):.4f}",
+                f"{timed(lambda: sorted(data)[:k]):.4f}",
+                f"{timed(heapq.nsmallest, k, data):.4f}",
+            )
+        )
+    report(f"k smallest of {n} random floats", rows)
+    copy, other = data[:], data[:]
+    rows = [("sort", "seconds")]
+    rows.append(("heapsort", f"{timed(heapsort, copy):.4f}"))
+    rows.append(("sorted", f"{timed(sorted, data):.4f}"))
+    rows.append(("list.sort", f"{timed(other.sort):.4f}"))
+    report(f"Sorting {n} random floats", rows)
+
+
+def bench_radix_heap(nodes: int = 50_000, degree: int = 8, max_weight: int = 1000):
+    """
+    Shortest paths.
+
+    Runs Dijkstra's algorithm from one node of a random directed graph with integer
+    edge weights, the monotone workload a radix heap is built for. Each priority queue
+    is used the same way: a node is added again whenever its distance improves, and
+    stale entries are skipped as they are popped.
+    """
+    graph = [
+        [
+            (random.randrange(nodes), random.randint(1, max_weight))
+            for _ in range(degree)
+        ]
+        for _ in range(nodes)
+    ]
+
+    def dijkstra(add, pop, is_empty):
+        distances = [None] * nodes
+        best = [0] + [float("inf")] * (nodes - 1)
+        add(0, 0)
+        while not is_empty():
+            distance, node = pop()
+            if distances[node] is not None:
+                continue
+            distances[node] = distance
+            for neighbour, weight in graph[node]:
+                candidate = distance + weight
+                if candidate < best[neighbour]:
+                    best[neighbour] = candidate
+                    add(neighbour, candidate)
+        return distances
+
+    def with_heap():
+        heap = Heap(max_or_min="min", entries=True)
+        return dijkstra(heap.add, heap.pop_entry, lambda: not heap.data)
+
+    def with_radix_heap():
+        heap = RadixHeap()
+        return dijkstra(heap.add, heap.pop_entry, heap.is_empty)
+
+    def with_heapq():
+        heap = []
+        return dijkstra(
+            lambda node, distance: heapq.heappush(heap, (distance, node)),
+            lambda: heapq.heappop(heap),
+            lambda: not heap,
+        )
+
+    rows = [("queue", "seconds")]
+    for name, fn in (
+        ("Heap", with_heap),
+        ("RadixHeap", with_radix_heap),
+        ("heapq", with_heapq),
+    ):
+        rows.append((name, f"{timed(fn):.3f}"))
+    assert with_heap() == with_radix_heap() == with_heapq()
+    report(
+        f"Dijkstra on {nodes} nodes with {degree} edges each, weights up to"
+        f" {max_weight}",
+        rows,
+    )
+
+
+def bench_bt_build(largest: int = 1_000_000):
+    """
+    Building a binary tree.
+
+    Times BinaryTree.extend, which adds each key in the next free place breadth-first,
+    for trees of growing size. Each add follows the path to the free place from the
+    root, so the time per node should only grow with the height of the tree. A tree
+    which is no longer complete after a delete is also timed, as each add then has to
+    search for the free place until the gaps are filled. from_level_order, which links
+    every node to its parent directly, is timed for comparison.
+    """
+    rows = [("nodes", "extend s", "us/node", "level order s")]
+    n = 1000
+    while n <= largest:
+        seconds = timed(BinaryTree().extend, [x for x in range(n)])
+        rows.append(
+            (
+                n,
+                f"{seconds:.3f}",
+                f"{seconds / n * 1e6:.2f}",
+                f"{timed(BinaryTree.from_level_order, range(n)):.3f}",
+            )
+        )
+        n *= 10
+    report("Building a complete BinaryTree with extend and from_level_order", rows)
+    rows = [("nodes", "gap fill s", "append s")]
+    for n in (1000, 4000):
+        tree = BinaryTree().preset(n)
+        # Removes the subtree at place 4, about a quarter of the tree
+        tree.delete(3)
+        gaps = n - tree.node_count
+        rows.append(
+            (
+                n,
+                f"{timed(tree.extend, [x for x in range(gaps)]):.3f}",
+                f"{timed(tree.extend, [x for x in range(gaps)]):.3f}",
+            )
+        )
+    report(
+        "Adding a quarter of the nodes back after a delete, then as many again", rows
+    )
+
+
+def bench_traversal(largest: int = 100_000):
+    """
+    Depth-first traversals.
+
+    Times a full in-order, preorder and postorder traversal of balanced trees, built
+    with from_level_order, and skewed ones, a single chain of right children like a
+    binary search tree made from sorted keys. The traversals keep their own stacks,
+    so the time per node should not grow with the size or the depth of the tree.
+    Morris in-order traversal, which uses no stack, is timed alongside.
+
+    The peak memory of an in-order traversal of a tree skewed to the left, where the
+    stack holds every node, is then compared with the Morris traversal.
+    """
+    rows = [("tree", "nodes", "inorder us", "preorder us", "postorder us", "morris us")]
+    n = 1000
+    while n <= largest:
+        balanced = BinaryTree.from_level_order(range(n))
+        skewed = BinaryTree()
+        skewed.add_root(0)
+        node = skewed.root
+        for x in range(1, n):
+            node.add_node(x, "r")
+            node = node.r
+        for name, tree in (("balanced", balanced), ("skewed", skewed)):
+            rows.append(
+                (
+                    name,
+                    n,
+                    *(
+                        f"{timed(list, traversal()) / n * 1e6:.3f}"
+                        for traversal in (tree.flatten, tree.preorder, tree.postorder)
+                    ),
+                    f"{timed(list, tree.flatten(mode='morris')) / n * 1e6:.3f}",
+                )
+            )
+        n *= 10
+    report("Microseconds per node for a full traversal", rows)
+
+    def peak_kib(traversal):
+        tracemalloc.start()
+        for _ in traversal:
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return f"{peak / 1024:.1f}"
+
+    skewed = BinaryTree()
+    skewed.add_root(0)
+    node = skewed.root
+    for x in range(1, largest):
+        node.add_node(x, "l")
+        node = node.l
+    rows = [("mode", "peak KiB")]
+    rows.append(("stack", peak_kib(skewed.flatten())))
+    rows.append(("morris", peak_kib(skewed.flatten(mode="morris"))))
+    report(f"In-order traversal of {largest} nodes skewed to the left", rows)
+
+
+def bench_analyze(largest: int = 1_000_000):
+    """
+    Tree analysis.
+
+    Times analyze, which finds every structural property of a tree in one pass, on
+    balanced trees of growing size, then calling it again, which reads its cache.
+    """
+    rows = [("nodes", "analyze s", "us/node", "cached us")]
+    n = 1000
+    while n <= largest:
+        tree = BinaryTree.from_level_order(range(n))
+        seconds = timed(tree.analyze)
+        cached = timed(tree.analyze)
+        rows.append(
+            (n, f"{seconds:.3f}", f"{seconds / n * 1e6:.2f}", f"{cached * 1e6:.1f}")
+        )
+        n *= 10
+    report("Analyzing a balanced BinaryTree, then analyzing it again", rows)
+
+
+def bench_tree_index(n: int = 10_000, lookups: int = 1000):
+    """
+    Indexed tree lookups.
+
+    Times get, in and delete on BinaryTrees of n nodes with and without an index. An
+    unindexed tree searches its nodes in preorder, while an indexed one looks each key
+    up in a dict. Each delete removes a leaf.
+    """
+    keys = random.sample(range(n), lookups)
+    rows = [("tree", "get s", "in s", "delete s")]
+    for name, indexed in (("unindexed", False), ("indexed", True)):
+        tree = BinaryTree(data=[x for x in range(n)], indexed=indexed)
+        leaves = [node.key for node in tree.breadth_first()][-lookups:]
+        rows.append(
+            (
+                name,
+                f"{timed(lambda: [tree.get(k) for k in keys]):.4f}",
+                f"{timed(lambda: [k in tree for k in keys]):.4f}",
+                f"{timed(lambda: [tree.delete(k) for k in leaves]):.4f}",
+            )
+        )
+    report(f"{lookups} lookups and deletes in a BinaryTree of {n} nodes", rows)
+
+
+def bench_tree_memory(n: int = 100_000):
+    """
+    Tree memory.
+
+    Measures the memory taken by trees of n nodes with tracemalloc: a BinaryTree whose
+    nodes have a __dict__, as they did before BTNode declared __slots__, a BinaryTree
+    and an AVLTree with slotted nodes, and an ArrayBinaryTree storing its nodes in
+    parallel arrays. Also times an in-order traversal of each.
+    """
+
+    class DictNode(BinaryTree.BTNode):
+        pass
+
+    class DictTree(BinaryTree):
+        def new_node(self, key: int) -> DictNode:
+            return DictNode(key)
+
+    def build_dict_tree():
+        return DictTree.from_level_order(range(n))
+
+    def build_tree():
+        return BinaryTree.from_level_order(range(n))
+
+    def build_avl():
+        return AVLTree(data=range(n))
+
+    def build_array_tree():
+        return ArrayBinaryTree(data=range(n))
+
+    rows = [("tree", "bytes/node", "MiB", "flatten s")]
+    for name, build in (
+        ("dict nodes", build_dict_tree),
+        ("slotted nodes", build_tree),
+        ("AVL slotted", build_avl),
+        ("array", build_array_tree),
+    ):
+        gc.collect()
+        tracemalloc.start()
+        tree = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        rows.append(
+            (
+                name,
+                f"{size / n:.1f}",
+                f"{size / 2**20:.2f}",
+                f"{timed(lambda: sum(1 for _ in tree.flatten())):.4f}",
+            )
+        )
+        del tree
+    report(f"Memory of a binary tree of {n} nodes", rows)
+
+
+benchmarks = {
+    "queue_latency": bench_queue_latency,
+    "fork_join": bench_fork_join,
+    "bt_build": bench_bt_build,
+    "traversal": bench_traversal,
+    "analyze": bench_analyze,
+    "tree_index": bench_tree_index,
+    "tree_memory": bench_tree_memory,
+    "heap": bench_heap,
+    "heap_arity": bench_heap_arity,
+    "meld": bench_meld,
+    "fused": bench_fused,
+    "numeric_heap": bench_numeric_heap,
+    "heap_extend": bench_heap_extend,
+    "partial_sort": bench_partial_sort,
+    "running_median": bench_running_median,
+    "radix_heap": bench_radix_heap,
+}
+
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or benchmarks:
+        benchmarks[name]()
@@ -0,0 +1,753 @@
+from __future__ import annotations
+from array import array
+from typing import Iterable, Iterator
+from .dcqueue import DynamicCircularQueue
+from .util import util
+
+
+class ArrayBinaryTree:
+    """
+    Array binary tree.
+
+    A binary tree stored as a struct of arrays rather than as linked node objects
+    (./bt.py). Each node is an integer id, and its key, left child, right child and
+    height are kept at that id in four parallel array("q") columns, with -1 for a
+    missing child. A node costs 32 bytes, against around 90 for a BTNode and its key
+    and more for a node with a __dict__, so very large trees fit in about a third of
+    the memory (see bench_tree_memory in ../benchmarks.py). Traversals are slower, as
+    a view is created for each node visited. Keys must be integers which fit in 64
+    bits.
+
+    Like BinaryTree, nodes are added in the first missing space breadth-first, and
+    deleted along with their subtree, with the same search for the key, so that the
+    two trees stay the same shape even with repeated keys. The ids of deleted nodes
+    are reused by the next nodes added. The traversals, get and display provide Node
+    views onto the arrays, which have the key, l and r attributes of a BTNode, so the
+    same code can walk either kind of tree. A view is only valid until its node is
+    deleted.
+
+    Example:
+
+    >>> tree = ArrayBinaryTree().preset(7)
+    >>> tree.display()
+           0
+       ┌───┴───┐
+       1       2
+     ┌─┴─┐   ┌─┴─┐
+     3   4   5   6
+    >>> tree.delete(2)
+    >>> [node.key for node in tree.flatten()]
+    [3, 1, 4, 0]
+    >>> tree.root.height
+    2
+
+    ...
+
+    Attributes
+    ---------
+    Node : class
+        A view of a node of the tree, with key, l, r and height read from the arrays.
+    keys : array
+        The key of each node.
+    left : array
+        The id of the left child of each node, or -1.
+    right : array
+        The id of the right child of each node, or -1.
+    height : array
+        The height of each node, the largest distance to a leaf below it.
+    root_id : int
+        The id of the root node, or -1 if the tree is empty.
+    free : list[int]
+        The ids of deleted nodes, to be reused.
+    node_count : int
+        The number of nodes in the tree.
+    packed : bool
+        True if the tree is complete, so the next missing space breadth-first is the
+        one after the last node.
+
+    Methods
+    -------
+    preset(n: int) -> ArrayBinaryTree
+        Add n nodes with keys 0 to n - 1 and return the tree.
+    node(i: int) -> Node
+        Returns a view of the node with id i, or None if i is -1.
+    new_node(key: int) -> int
+        Store a node with no children and return its id.
+    path(position: int) -> list[int]
+        Returns the ids of the nodes from the root down to a place in the tree.
+    add(key: int)
+        Insert a node in the first missing space breadth-first.
+    extend(data: Iterable[int])
+        Insert multiple nodes.
+    find(key: int) -> tuple[int, int]
+        Returns the id and place of the first node with key in preorder priority.
+    get(key: int) -> Node
+        Returns the first node with key in preorder priority.
+    delete(key: int)
+        Remove the nodes with key and their subtrees, as BinaryTree.delete_default.
+    breadth_ids() -> Iterator[int]
+        Returns an iterator over the node ids from top to bottom, left to right.
+    breadth_first() -> Iterator[Node]
+        Returns an iterator over the nodes from top to bottom, left to right.
+    flatten(reverse: bool = False, mode: str = "stack") -> Iterator[Node]
+        Returns an iterator over the nodes in in-order priority.
+    preorder(mode: str = "stack") -> Iterator[Node]
+        Returns an iterator over the nodes in preorder priority.
+    morris(preorder: bool = False, reverse: bool = False) -> Iterator[Node]
+        In-order or preorder traversal with O(1) extra memory, by temporarily
+        threading the tree.
+    postorder() -> Iterator[Node]
+        Returns an iterator over the nodes in postorder priority.
+    display()
+        Prints a visual representation of the tree to the console.
+    str() -> str
+        Returns a string representation of the tree.
+    inspect() -> str
+        For testing and internal use. Returns a formatted list of the contents of the
+        tree.
+    __contains__(key: int) -> bool
+        Returns True if a node in the tree has the key.
+    __len__() -> int
+        Returns the number of nodes in the tree.
+    """
+
+    def __init__(self, data: Iterable[int] = ()):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : Iterable[int] = ()
+            Keys to add to the tree breadth-first.
+        """
+        self.keys = array("q")
+        self.left = array("q")
+        self.right = array("q")
+        self.height = array("q")
+        self.root_id = -1
+        self.free = []
+        self.node_count = 0
+        self.packed = True
+        self.extend(data)
+
+    class Node:
+        """
+        Node.
+
+        A view of a node of an ArrayBinaryTree, holding only the tree and the node's
+        id. Two views of the same node are equal.
+
+        ...
+
+        Attributes
+        ---------
+        tree : ArrayBinaryTree
+            The tree the node belongs to.
+        id : int
+            The node's id.
+        key : int
+            Key, read from the tree.
+        l : Node
+            Left child, read from the tree.
+        r : Node
+            Right child, read from the tree.
+        height : int
+            Height, read from the tree.
+
+        Methods
+        -------
+        inspect() -> str
+            Returns a formatted string representing the node and its attributes. Used
+            for internal purposes and testing.
+        """
+
+        __slots__ = ("tree", "id")
+
+        def __init__(self, tree: ArrayBinaryTree, id: int):
+            """__init__.
+
+            Parameters
+            ----------
+            tree : ArrayBinaryTree
+                The tree the node belongs to.
+            id : int
+                The node's id.
+            """
+            self.tree = tree
+            self.id = id
+
+        @property
+        def key(self) -> int:
+            return self.tree.keys[self.id]
+
+        @property
+        def l(self) -> ArrayBinaryTree.Node:
+            return self.tree.node(self.tree.left[self.id])
+
+        @property
+        def r(self) -> ArrayBinaryTree.Node:
+            return self.tree.node(self.tree.right[self.id])
+
+        @property
+        def height(self) -> int:
+            return self.tree.height[self.id]
+
+        def __eq__(self, other) -> bool:
+            return (
+                isinstance(other, ArrayBinaryTree.Node)
+                and self.tree is other.tree
+                and self.id == other.id
+            )
+
+        def __hash__(self) -> int:
+            return hash((id(self.tree), self.id))
+
+        def inspect(self) -> str:
+            """
+            Inspect node attributes.
+
+            Code implementation available at ./util/util.py
+
+            Returns
+            -------
+            str
+                Returns a formatted string representing the node and its attributes.
+                Used for internal purposes and testing.
+            """
+            return util.inspect_node(self)
+
+    @property
+    def root(self) -> Node:
+        """
+        Root.
+
+        Returns
+        -------
+        Node
+            A view of the root node, or None if the tree is empty.
+        """
+        return self.node(self.root_id)
+
+    def preset(self, n: int) -> ArrayBinaryTree:
+        """
+        Preset.
+
+        Adds n elements of values 0 - n to the tree. Useful for examples and testing.
+
+        Parameters
+        ----------
+        n : int
+            Nodes to add
+
+        Returns
+        -------
+        ArrayBinaryTree
+            Self
+        """
+        self.extend(range(n))
+        return self
+
+    def node(self, i: int) -> Node:
+        """
+        Node.
+
+        Parameters
+        ----------
+        i : int
+            A node id, or -1.
+
+        Returns
+        -------
+        Node
+            A view of the node with id i, or None if i is -1.
+        """
+        return None if i < 0 else ArrayBinaryTree.Node(self, i)
+
+    def new_node(self, key: int) -> int:
+        """
+        New node.
+
+        Store a node with no children, reusing the id of a deleted node if there is
+        one.
+
+        Parameters
+        ----------
+        key : int
+            The node's key.
+
+        Returns
+        -------
+        int
+            The node's id.
+        """
+        if self.free:
+            i = self.free.pop()
+            self.keys[i] = key
+            self.left[i] = self.right[i] = -1
+            self.height[i] = 0
+            return i
+        self.keys.append(key)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.height.append(0)
+        return len(self.keys) - 1
+
+    def path(self, position: int) -> list[int]:
+        """
+        Path.
+
+        Numbering the places in the tree from 1 at the root, the children of place n
+        are at 2n and 2n + 1, so the binary digits of a place after the leading 1 give
+        the path to it from the root, 0 for left and 1 for right.
+
+        Parameters
+        ----------
+        position : int
+            A place in the tree whose parent exists.
+
+        Returns
+        -------
+        list[int]
+            The ids of the nodes from the root down to the parent of the place.
+        """
+        left, right = self.left, self.right
+        i = self.root_id
+        path = [i]
+        for shift in range(position.bit_length() - 2, 0, -1):
+            i = right[i] if (position >> shift) & 1 else left[i]
+            path.append(i)
+        return path
+
+    def add(self, key: int):
+        """
+        Add.
+
+        Insert a node in the first missing space breadth-first. If the tree is packed
+        this is the place after the last node, found in O(log n). Otherwise the tree
+        is traversed breadth-first until a node is missing a child, in O(n). The
+        heights of the nodes above are then raised where needed.
+
+        Parameters
+        ----------
+        key : int
+            Key of node to be inserted.
+        """
+        if self.root_id < 0:
+            self.root_id = self.new_node(key)
+            self.node_count = 1
+            self.packed = True
+            return
+        left, right, height = self.left, self.right, self.height
+        if self.packed:
+            position = self.node_count + 1
+        else:
+            # The first i - 1 nodes breadth-first all have two children, so the i-th
+            # is place i and its children are places 2i and 2i + 1
+            for i, node in enumerate(self.breadth_ids(), 1):
+                if left[node] < 0 or right[node] < 0:
+                    position = (2 * i) + (left[node] >= 0)
+                    break
+        path = self.path(position)
+        child = self.new_node(key)
+        if position & 1:
+            right[path[-1]] = child
+        else:
+            left[path[-1]] = child
+        self.node_count += 1
+        depth = len(path)
+        for i in range(depth - 1, -1, -1):
+            if height[path[i]] >= depth - i:
+                break
+            height[path[i]] = depth - i
+        if not self.packed:
+            # The tree is packed again if the next missing space is the one after
+            # the last node
+            for i, node in enumerate(self.breadth_ids(), 1):
+                if left[node] < 0 or right[node] < 0:
+                    next_position = (2 * i) + (left[node] >= 0)
+                    self.packed = next_position == self.node_count + 1
+                    break
+
+    def extend(self, data: Iterable[int]):
+        """
+        Extend.
+
+        Insert multiple nodes.
+
+        Parameters
+        ----------
+        data : Iterable[int]
+            Keys to be inserted.
+        """
+        for key in data:
+            self.add(key)
+
+    def find(self, key: int) -> tuple[int, int]:
+        """
+        Find.
+
+        Search the tree for key with preorder priority.
+
+        Parameters
+        ----------
+        key : int
+            Key to search for.
+
+        Returns
+        -------
+        tuple[int, int]
+            The id and place of the first node with the key, or (-1, 0) if there is
+            none.
+        """
+        keys, left, right = self.keys, self.left, self.right
+        stack = [(self.root_id, 1)] if self.root_id >= 0 else []
+        while stack:
+            i, position = stack.pop()
+            if keys[i] == key:
+                return i, position
+            if right[i] >= 0:
+                stack.append((right[i], (2 * position) + 1))
+            if left[i] >= 0:
+                stack.append((left[i], 2 * position))
+        return -1, 0
+
+    def get(self, key: int) -> Node:
+        """
+        Get a node by key.
+
+        Parameters
+        ----------
+        key : int
+            Key to search for
+
+        Returns
+        -------
+        Node
+            The first node with the key in preorder priority.
+
+        Raises
+        ------
+        KeyError
+            If there are no nodes with the key present in the tree.
+        """
+        i, _ = self.find(key)
+        if i < 0:
+            raise KeyError(f"{key} not in tree")
+        return ArrayBinaryTree.Node(self, i)
+
+    def delete(self, key: int):
+        """
+        Delete a node from the tree.
+
+        Deletes with the same search as BinaryTree.delete_default. If the root has the
+        key the tree is emptied. Otherwise the tree is searched with preorder priority,
+        and each child with the key is removed along with its subtree, so with repeated
+        keys several subtrees can go. As in BinaryTree, once a node's left child is
+        removed its right child is not checked. The ids of the nodes removed are freed
+        and the heights of the nodes above them recomputed. Does nothing if the key is
+        not in the tree.
+
+        Parameters
+        ----------
+        key : int
+            Key of node to be deleted.
+        """
+        if self.root_id < 0:
+            return
+        keys, left, right, height = self.keys, self.left, self.right, self.height
+        if keys[self.root_id] == key:
+            for column in (keys, left, right, height):
+                del column[:]
+            self.root_id = -1
+            self.free = []
+            self.node_count = 0
+            self.packed = True
+            return
+
+        def removed(node):
+            stack = [node]
+            while stack:
+                i = stack.pop()
+                self.free.append(i)
+                self.node_count -= 1
+                if left[i] >= 0:
+                    stack.append(left[i])
+                if right[i] >= 0:
+                    stack.append(right[i])
+
+        count = self.node_count
+        # The places, counting from 1 at the root, of the nodes removed
+        places = []
+        stack = [(self.root_id, 1)]
+        while stack:
+            i, position = stack.pop()
+            child = left[i]
+            if child >= 0:
+                if keys[child] == key:
+                    removed(child)
+                    left[i] = -1
+                    places.append(2 * position)
+                    continue
+                stack.append((child, 2 * position))
+            child = right[i]
+            if child >= 0:
+                if keys[child] == key:
+                    removed(child)
+                    right[i] = -1
+                    places.append((2 * position) + 1)
+                else:
+                    stack.append((child, (2 * position) + 1))
+        for position in places:
+            for i in reversed(self.path(position)):
+                lh = height[left[i]] if left[i] >= 0 else -1
+                rh = height[right[i]] if right[i] >= 0 else -1
+                if height[i] == max(lh, rh) + 1:
+                    break
+                height[i] = max(lh, rh) + 1
+        # The tree is only still complete if it was and the nodes removed were the
+        # last ones, which are leaves
+        self.packed = self.packed and sorted(places) == list(
+            range(self.node_count + 1, count + 1)
+        )
+
+    def breadth_ids(self) -> Iterator[int]:
+        """
+        Breadth-first ids.
+
+        Returns
+        -------
+        Iterator[int]
+            Yields the ids of all the nodes of the tree in breadth-first priority.
+        """
+        if self.root_id < 0:
+            return
+        left, right = self.left, self.right
+        queue = DynamicCircularQueue()
+        queue.enqueue(self.root_id)
+        while len(queue) > 0:
+            i = queue.dequeue()
+            yield i
+            if left[i] >= 0:
+                queue.enqueue(left[i])
+            if right[i] >= 0:
+                queue.enqueue(right[i])
+
+    def breadth_first(self) -> Iterator[Node]:
+        """
+        Breadth-first traversal.
+
+        Returns
+        -------
+        Iterator[Node]
+            Yields all the nodes of the tree in breadth-first priority.
+        """
+        for i in self.breadth_ids():
+            yield ArrayBinaryTree.Node(self, i)
+
+    def flatten(self, reverse: bool = False, mode: str = "stack") -> Iterator[Node]:
+        """
+        In-order traversal.
+
+        Parameters
+        ----------
+        reverse : bool = False
+            If True, nodes are provided in reverse in-order priority, right child ->
+            node -> left child.
+        mode : str = "stack"
+            "stack", or "morris" to use O(1) extra memory, as in BinaryTree.
+
+        Returns
+        -------
+        Iterator[Node]
+            Yields all nodes in tree in in-order priority.
+
+        Raises
+        ------
+        Exception
+            If mode is not "stack" or "morris".
+        """
+        if mode == "morris":
+            yield from self.morris(reverse=reverse)
+            return
+        if mode != "stack":
+            raise Exception("Unknown traversal mode", mode)
+        first, second = (self.right, self.left) if reverse else (self.left, self.right)
+        stack = []
+        i = self.root_id
+        while stack or i >= 0:
+            while i >= 0:
+                stack.append(i)
+                i = first[i]
+            i = stack.pop()
+            yield ArrayBinaryTree.Node(self, i)
+            i = second[i]
+
+    def preorder(self, mode: str = "stack") -> Iterator[Node]:
+        """
+        Pre-order traversal.
+
+        Parameters
+        ----------
+        mode : str = "stack"
+            "stack", or "morris" to use O(1) extra memory, as in BinaryTree.
+
+        Returns
+        -------
+        Iterator[Node]
+            Yields all nodes in tree in preorder priority.
+
+        Raises
+        ------
+        Exception
+            If mode is not "stack" or "morris".
+        """
+        if mode == "morris":
+            yield from self.morris(preorder=True)
+            return
+        if mode != "stack":
+            raise Exception("Unknown traversal mode", mode)
+        left, right = self.left, self.right
+        stack = [self.root_id] if self.root_id >= 0 else []
+        while stack:
+            i = stack.pop()
+            yield ArrayBinaryTree.Node(self, i)
+            if right[i] >= 0:
+                stack.append(right[i])
+            if left[i] >= 0:
+                stack.append(left[i])
+
+    def morris(self, preorder: bool = False, reverse: bool = False) -> Iterator[Node]:
+        """
+        Morris traversal.
+
+        In-order or preorder traversal with O(1) extra memory, as BinaryTree.morris,
+        threading the way back up through the child arrays. While it runs, the tree
+        must not be changed or traversed by anything else. The threads are all removed
+        once it finishes or is closed early.
+
+        Parameters
+        ----------
+        preorder : bool = False
+            If True, nodes are provided in preorder priority rather than in-order.
+        reverse : bool = False
+            If True, left and right are swapped, giving reverse in-order priority.
+
+        Returns
+        -------
+        Iterator[Node]
+            Yields all nodes in tree in the chosen priority.
+        """
+        first, second = (self.right, self.left) if reverse else (self.left, self.right)
+
+        def walk(i):
+            # Yields each id when it is provided, and -1 at every other step
+            while i >= 0:
+                child = first[i]
+                if child < 0:
+                    yield i
+                    i = second[i]
+                    continue
+                last = child
+                while second[last] >= 0 and second[last] != i:
+                    last = second[last]
+                if second[last] < 0:
+                    second[last] = i
+                    yield i if preorder else -1
+                    i = child
+                else:
+                    second[last] = -1
+                    yield -1 if preorder else i
+                    i = second[i]
+
+        steps = walk(self.root_id)
+        try:
+            for i in steps:
+                if i >= 0:
+                    yield ArrayBinaryTree.Node(self, i)
+        finally:
+            for _ in steps:
+                pass
+
+    def postorder(self) -> Iterator[Node]:
+        """
+        Post-order traversal.
+
+        Returns
+        -------
+        Iterator[Node]
+            Yields all nodes in tree in postorder priority.
+        """
+        left, right = self.left, self.right
+        stack = []
+        i = self.root_id
+        last = -1
+        while stack or i >= 0:
+            if i >= 0:
+                stack.append(i)
+                i = left[i]
+                continue
+            top = stack[-1]
+            if right[top] >= 0 and right[top] != last:
+                i = right[top]
+            else:
+                last = stack.pop()
+                yield ArrayBinaryTree.Node(self, last)
+
+    def display(self):
+        """
+        Render tree to console.
+
+        Prints a visual representation of the tree to the console, with the same
+        implementation as BinaryTree (./util/util.py).
+        """
+        print(util.display(self))
+
+    def __str__(self) -> str:
+        """
+        To string.
+
+        Returns
+        -------
+        str
+            Returns a string representation of the tree.
+        """
+        return util.display(self)
+
+    def inspect(self) -> str:
+        """
+        Inspect tree.
+
+        Returns
+        -------
+        str
+            For testing and internal use. Returns a formatted list of the contents of
+            the tree.
+        """
+        return util.inspect(self)
+
+    def __contains__(self, key: int) -> bool:
+        """
+        Contains.
+
+        Parameters
+        ----------
+        key : int
+            Key to search for.
+
+        Returns
+        -------
+        bool
+            True if a node in the tree has the key.
+        """
+        return self.find(key)[0] >= 0
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of nodes in the tree.
+        """
+        return self.node_count
@@ -49,8 +49,8 @@ class AVLTree(BinarySearchTree):
 
     Methods
     -------
-    add_root(key: int)
-        Create a new AVLNode with key and assign as root of tree
+    new_node(key: int) -> AVLNode
+        Create a new AVLNode with key, used by add_root
     add_avl(key: int)
         Insert a new AVLNode into the tree while preserving balance and binary search
         properties
@@ -125,6 +125,8 @@ class AVLTree(BinarySearchTree):
             Extends parent implementation to set the height of the node after deleting.
         """
 
+        __slots__ = ("height",)
+
         def __init__(self, key: int = None):
             """__init__.
 
@@ -322,18 +324,24 @@ class AVLTree(BinarySearchTree):
             super().del_node(side)
             self.set_height()
 
-    def add_root(self, key: int):
+    def new_node(self, key: int) -> AVLNode:
         """
-        Add root.
+        New node.
 
-        Create a new AVLNode with key and assign as root of tree.
+        Overrides parent implementation to create an AVLNode, for add_root and
+        build_level_order.
 
         Parameters
         ----------
         key : int
             key
+
+        Returns
+        -------
+        AVLNode
+            The new node, with no children and a height of 0.
         """
-        self.root = AVLTree.AVLNode(key)
+        return AVLTree.AVLNode(key)
 
     def add_avl(self, key: int):
         """
@@ -347,6 +355,7 @@ class AVLTree(BinarySearchTree):
         key : int
             key
         """
+        self.edits += 1
 
         def rec_add(node: AVLNode) -> AVLNode:
             if key == node.key:
@@ -391,6 +400,7 @@ class AVLTree(BinarySearchTree):
         key : int
             key
         """
+        self.edits += 1
 
         def rec_del(node: AVLNode) -> AVLNode:
             if key == node.key:
@@ -106,6 +106,7 @@ class BinarySearchTree(BinaryTree):
         key : int
             Key of node to be inserted
         """
+        self.edits += 1
 
         def rec_add(node, key):
             if key == node.key:
@@ -138,6 +139,7 @@ class BinarySearchTree(BinaryTree):
         data : list[int]
             A list of nodes to be added to the bst
         """
+        self.edits += 1
 
         old_nodes = [] if not (ar := self.flatten()) else ar
         nodes = sorted(data + [node.key for node in old_nodes])
@@ -209,6 +211,7 @@ class BinarySearchTree(BinaryTree):
         key : int
             Key of node to be deleted
         """
+        self.edits += 1
 
         def rec_del(node: BTNode) -> BTNode:
             if key == node.key:
@@ -262,12 +265,13 @@ class BinarySearchTree(BinaryTree):
         """is_bst.
 
         Returns true if all the keys of the nodes of the tree are sorted from smallest
-        to largest when traversed in in-order priority.
+        to largest when traversed in in-order priority. Found in O(n) with analyze,
+        run again rather than read from its cache so that nodes changed directly are
+        checked too.
 
         Returns
         -------
         bool
             True if the tree satisfies the definition of a binary search tree.
         """
-        nodes = list(self.flatten())
-        return all(nodes[i].key < nodes[i + 1].key for i in range(len(nodes) - 1))
+        return self.analyze(cached=False)["bst"]
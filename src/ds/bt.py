@@ -1,4 +1,5 @@
 from __future__ import annotations
+from typing import Iterable
 from .util import util
 from .dcqueue import DynamicCircularQueue
 
@@ -58,14 +59,44 @@ class BinaryTree:
         children.
     root : BTNode
         The root node of the tree.
+    node_count : int
+        The number of nodes in the tree, kept up to date by add_breadth_first and
+        delete_default.
+    packed : bool
+        True if the tree is known to be complete, with its node_count nodes in the
+        first node_count places in breadth-first order. add_breadth_first can then go
+        straight to the next free place.
+    index : dict[int, BTNode]
+        If the tree is indexed, the node with each key, otherwise None. Kept up to date
+        by add_breadth_first, add_root, build_level_order and delete_default.
+    parents : dict[int, BTNode]
+        If the tree is indexed, the parent of the node with each key, None for the
+        root, otherwise None.
+    edits : int
+        The number of changes made to the tree through add, delete, extend, add_root
+        and build_level_order. Changes made to its nodes directly are only counted by
+        calling recount afterwards.
+    analysis : dict
+        The last result of analyze, valid while edits is unchanged.
+    analysis_edits : int
+        The value of edits when analysis was found.
 
     Methods
     -------
+    from_level_order(data: Iterable[int]) -> BinaryTree
+        Class method returning a new tree of the class with the keys in data in level
+        order, with None for a missing node.
+    build_level_order(data: Iterable[int])
+        Replace the contents of the tree with the keys in data in level order, linking
+        the nodes in O(n).
     preset(n: int) -> BinaryTree
         Modify an empty tree to add n nodes in ascending order to the tree. Calling the
         method on the tree after it has been initialised ensures that if it is being
         called on a class extending BinaryTree, the correct methods and types are used
         to construct the tree.
+    new_node(key: int) -> BTNode
+        Create a node of the tree's kind with key, for add_root and
+        build_level_order.
     add_root(key: int)
         Add a node with key as the root of the tree.
     extend_default(data: list[int] = [])
@@ -73,7 +104,7 @@ class BinaryTree:
         for each key in the list.
     get_default(key: int) -> BTNode
         The default get behaviour searches the tree with preorder priority and returns
-        the node if present. Raises a KeyError if node absent.
+        the node if present, or looks it up in index. Raises a KeyError if node absent.
     delete_default(key: int)
         The default delete behavior searches the tree for key with preorder priority
         and removes it from it's parent. Note that this will delete the subtree
@@ -81,6 +112,17 @@ class BinaryTree:
     add_breadth_first(key: int)
         This is the default add method for the base class. It creates a new node in
         the place of the first missing space when traversed breadth-first.
+    reindex()
+        Rebuild index and parents, after an indexed tree has been changed other than
+        through its own methods.
+    __contains__(key: int) -> bool
+        Returns True if a node in the tree has the key.
+    recount()
+        Count the nodes of the tree and check if it is complete, after it has been
+        changed other than through add_breadth_first and delete_default.
+    analyze(cached: bool = True) -> dict
+        Find the height, size and every structural property of the tree in a single
+        O(n) pass, cached until the tree is changed.
     is_perfect() -> bool
         A binary tree is perfect if every internal node has two children and all the
         leaf nodes are on the same level.
@@ -95,12 +137,15 @@ class BinaryTree:
     breadth_first() -> Iterator[BTNode]
         Returns an iterator which provides all the nodes in the tree from top to
         bottom, left to right.
-    flatten() -> Iterator[BTNode]
+    flatten(reverse: bool = False, mode: str = "stack") -> Iterator[BTNode]
         Returns an iterator which provides all the nodes in the tree in in-order
-        priority.
-    preorder() -> Iterator[BTNode]
+        priority, or reverse in-order priority.
+    preorder(mode: str = "stack") -> Iterator[BTNode]
         Returns an iterator which provides all the nodes in the tree in preorder
         priority.
+    morris(preorder: bool = False, reverse: bool = False) -> Iterator[BTNode]
+        In-order or preorder traversal with O(1) extra memory, by temporarily
+        threading the tree.
     postorder() -> Iterator[BTNode]
         Returns an iterator which provides all the nodes in the tree in postorder
         priority.
@@ -114,7 +159,9 @@ class BinaryTree:
         tree.
     """
 
-    def __init__(self, root: BTNode = None, data: list[int] = []):
+    def __init__(
+        self, root: BTNode = None, data: list[int] = [], indexed: bool = False
+    ):
         """__init__.
 
         Parameters
@@ -122,20 +169,103 @@ class BinaryTree:
         root : BTNode
             Optional root node to initialise the tree with.
         data : list[int]
-            Initial data to input into the tree.
+            Initial data to input into the tree. Without a root, the keys are placed in
+            level order with build_level_order, so None leaves a node missing.
+            Otherwise they are added to the root's tree with extend.
+        indexed : bool = False
+            If True, keep index and parents, so that get, delete and in find a key in
+            O(1). Keys must then be unique.
         """
+        self.edits = 0
+        self.analysis = None
+        self.analysis_edits = -1
+        self.index = {} if indexed else None
+        self.parents = {} if indexed else None
         self.root = root
+        self.recount()
+        if indexed:
+            self.reindex()
         self.add = self.add_breadth_first
         self.extend = self.extend_default
         self.delete = self.delete_default
         self.get = self.get_default
-        self.extend(data)
+        if root is None:
+            self.build_level_order(data)
+        else:
+            self.extend(data)
+
+    @classmethod
+    def from_level_order(cls, data: Iterable[int]) -> BinaryTree:
+        """
+        From level order.
+
+        Create a tree of this class holding the keys in data in level order, as with
+        build_level_order. The nodes are the class's own, created by its new_node.
+
+        Parameters
+        ----------
+        data : Iterable[int]
+            Keys in level order, with None for a missing node.
+
+        Returns
+        -------
+        BinaryTree
+            The new tree.
+        """
+        tree = cls()
+        tree.build_level_order(data)
+        return tree
+
+    def build_level_order(self, data: Iterable[int]):
+        """
+        Build level order.
+
+        Replace the contents of the tree with the keys in data in level order, top to
+        bottom and left to right, as a heap stores them. The node at index i has its
+        children at (i * 2) + 1 and (i * 2) + 2, so every node is linked to its parent
+        directly, in O(n), rather than added one at a time.
+
+        Nodes are created with new_node and linked with attach_node, so subclasses get
+        their own nodes. They are linked from the last to the first, so that a node's
+        children are attached before it is, which lets nodes which track their height
+        keep it correct. data is checked for keys below missing nodes before the tree
+        is changed.
+
+        Parameters
+        ----------
+        data : Iterable[int]
+            Keys in level order, with None for a missing node. Any key below a missing
+            node must also be None.
+
+        Raises
+        ------
+        Exception
+            If a key is below a missing node.
+        """
+        keys = list(data)
+        while keys and keys[-1] is None:
+            keys.pop()
+        for i in range(len(keys) - 1, 0, -1):
+            if keys[i] is not None and keys[(i - 1) // 2] is None:
+                raise Exception("Key below a missing node", keys[i], i)
+        self.edits += 1
+        new_node = self.new_node
+        nodes = [None if key is None else new_node(key) for key in keys]
+        for i in range(len(nodes) - 1, 0, -1):
+            if nodes[i] is not None:
+                nodes[(i - 1) // 2].attach_node(nodes[i], "l" if i & 1 else "r")
+        self.root = nodes[0] if nodes else None
+        self.node_count = len(nodes) - nodes.count(None)
+        self.packed = self.node_count == len(nodes)
+        if self.index is not None:
+            self.reindex()
 
     def preset(self, n: int) -> BinaryTree:
         """
         Preset.
 
         Adds n elements of values 0 - n to the tree. Useful for examples and testing.
+        An empty tree which adds breadth-first is built with build_level_order.
 
         Parameters
         ----------
@@ -147,7 +277,14 @@ class BinaryTree:
         BinaryTree
             Self
         """
-        self.extend([x for x in range(n)])
+        if (
+            self.root is None
+            and self.add == self.add_breadth_first
+            and self.extend == self.extend_default
+        ):
+            self.build_level_order(range(n))
+        else:
+            self.extend([x for x in range(n)])
         return self
 
     class BTNode:
@@ -156,6 +293,10 @@ class BinaryTree:
 
         Represents a node in a binary tree.
 
+        Nodes use __slots__ rather than a __dict__, which makes each one several
+        times smaller. A subclass which declares no __slots__ of its own gets a
+        __dict__ back, so it can still add any attributes it needs.
+
         ...
 
         Attributes
@@ -186,6 +327,8 @@ class BinaryTree:
             for internal purposes and testing.
         """
 
+        __slots__ = ("key", "l", "r")
+
         def __init__(self, key: int = None):
             """__init__.
 
@@ -287,6 +430,25 @@ class BinaryTree:
             """
             return util.inspect_node(self)
 
+    def new_node(self, key: int) -> BTNode:
+        """
+        New node.
+
+        Create a node of the kind the tree is made of, without adding it to the tree.
+        Subclasses with their own nodes override it.
+
+        Parameters
+        ----------
+        key : int
+            Key of the node.
+
+        Returns
+        -------
+        BTNode
+            The new node, with no children.
+        """
+        return BinaryTree.BTNode(key)
+
     def add_root(self, key: int):
         """
         Add node at root of tree.
@@ -296,7 +458,11 @@ class BinaryTree:
         key : int
             Key of root node to be created.
         """
-        self.root = BinaryTree.BTNode(key)
+        self.edits += 1
+        self.root = self.new_node(key)
+        if self.index is not None:
+            self.index = {key: self.root}
+            self.parents = {key: None}
 
     def extend_default(self, data: list[int] = []):
         """
@@ -318,7 +484,8 @@ class BinaryTree:
         Get a node by key.
 
         The default get behaviour searches the tree with preorder priority and returns
-        the node if present. Raises a KeyError if node absent.
+        the first node found with the key. Raises a KeyError if node absent. If the tree
+        is indexed the node is looked up in index instead, in O(1).
 
         Parameters
         ----------
@@ -335,13 +502,58 @@ class BinaryTree:
         KeyError
             If there are no nodes with the key present in the tree.
         """
-        found = None
+        if self.index is not None:
+            if key not in self.index:
+                raise KeyError(f"{key} not in tree")
+            return self.index[key]
         for node in self.preorder():
             if node.key == key:
-                found = node
-        if found is None:
-            raise KeyError(f"{key} not in tree")
-        return found
+                return node
+        raise KeyError(f"{key} not in tree")
+
+    def __contains__(self, key: int) -> bool:
+        """
+        Contains.
+
+        Parameters
+        ----------
+        key : int
+            Key to search for.
+
+        Returns
+        -------
+        bool
+            True if a node in the tree has the key. Found in O(1) if the tree is
+            indexed, otherwise by searching it with preorder priority.
+        """
+        if self.index is not None:
+            return key in self.index
+        return any(node.key == key for node in self.preorder())
+
+    def reindex(self):
+        """
+        Reindex.
+
+        Rebuild index and parents from the nodes of the tree, in O(n). Needed after an
+        indexed tree is changed other than through add_breadth_first, add_root,
+        build_level_order and delete_default, such as through its nodes directly.
+
+        Raises
+        ------
+        Exception
+            If a key appears more than once.
+        """
+        self.index = {}
+        self.parents = {}
+        if self.root:
+            self.parents[self.root.key] = None
+        for node in self.breadth_first():
+            if node.key in self.index:
+                raise Exception("Duplicate keys not allowed in indexed tree", node.key)
+            self.index[node.key] = node
+            for child in (node.l, node.r):
+                if child:
+                    self.parents[child.key] = node
 
     def delete_default(self, key: int):
         """
@@ -350,29 +562,78 @@ class BinaryTree:
         The default delete behavior searches the tree for key with preorder priority
         and removes it from it's parent. Note that this will delete the whole subtree.
 
+        If the tree is indexed, the node and its parent are looked up in index and
+        parents instead of searched for, and the keys of the subtree are removed from
+        them, in time proportional to the size of the subtree.
+
         Parameters
         ----------
         key : int
             Key of node to be deleted.
         """
+        self.edits += 1
+
+        # The places, counting from 1 at the root, of the nodes removed
+        places = []
+
+        def removed(node, position):
+            # Count the nodes of the subtree being removed
+            places.append(position)
+            stack = [node]
+            while stack:
+                node = stack.pop()
+                self.node_count -= 1
+                if self.index is not None:
+                    del self.index[node.key]
+                    del self.parents[node.key]
+                if node.l:
+                    stack.append(node.l)
+                if node.r:
+                    stack.append(node.r)
 
-        def delete(node, key):
+        def delete(node, key, position):
             if node.l:
                 if node.l.key == key:
+                    removed(node.l, 2 * position)
                     node.del_node("l")
                     return
-                delete(node.l, key)
+                delete(node.l, key, 2 * position)
             if node.r:
                 if node.r.key == key:
+                    removed(node.r, (2 * position) + 1)
                     node.del_node("r")
                     return
-                delete(node.r, key)
+                delete(node.r, key, (2 * position) + 1)
 
         if self.root:
             if self.root.key == key:
                 self.root = None
+                self.node_count = 0
+                self.packed = True
+                if self.index is not None:
+                    self.index = {}
+                    self.parents = {}
                 return
-            delete(self.root, key)
+            count = self.node_count
+            if self.index is None:
+                delete(self.root, key, 1)
+            elif key in self.index:
+                node = self.index[key]
+                parent = self.parents[key]
+                # Find the node's place from the path up to the root, each step giving
+                # the next binary digit from the right
+                position, depth, child, above = 0, 0, node, parent
+                while above:
+                    position |= (above.r is child) << depth
+                    depth += 1
+                    child, above = above, self.parents[above.key]
+                removed(node, position | (1 << depth))
+                parent.del_node("l" if parent.l is node else "r")
+            # The tree is only still complete if it was and the nodes removed were the
+            # last ones, which are leaves
+            self.packed = self.packed and sorted(places) == list(
+                range(self.node_count + 1, count + 1)
+            )
 
     def add_breadth_first(self, key: int):
         """
@@ -381,87 +642,209 @@ class BinaryTree:
         This is the default add method for the base class. It creates a new node in
         the place of the first missing space when traversed breadth-first.
 
+        If the tree is packed, the first missing space is the one after the last node.
+        Numbering the places from 1 at the root, the children of place n are at 2n and
+        2n + 1, so the binary digits of node_count + 1 after the leading 1 give the
+        path to it from the root, 0 for left and 1 for right. It is found in O(log n).
+        Otherwise the tree is traversed breadth-first until a node is missing a child,
+        in O(n).
+
         Parameters
         ----------
         key : int
             Key of node to be inserted.
         """
-        if not self.root:
+        self.edits += 1
+        if self.index is not None and key in self.index:
+            raise Exception("Duplicate keys not allowed in indexed tree", key)
+        node = self.root
+        if not node:
             self.add_root(key)
+            self.node_count = 1
+            self.packed = True
             return
-        for node in self.breadth_first():
-            if not node.l:
-                node.add_node(key, "l")
-                return
-            if not node.r:
-                node.add_node(key, "r")
+        if self.packed and self.node_count:
+            position = self.node_count + 1
+            for shift in range(position.bit_length() - 2, 0, -1):
+                node = node.r if (position >> shift) & 1 else node.l
+                if not node:
+                    break
+            side = "r" if position & 1 else "l"
+            if node and not getattr(node, side):
+                node.add_node(key, side)
+                self.node_count = position
+                if self.index is not None:
+                    self.index[key] = getattr(node, side)
+                    self.parents[key] = node
                 return
+            # The path does not match node_count, so the tree has been changed
+            # through its nodes
+            self.recount()
+        # The first i - 1 nodes breadth-first all have two children, so the i-th is
+        # place i and its children are places 2i and 2i + 1
+        added = False
+        for i, node in enumerate(self.breadth_first(), 1):
+            if node.l and node.r:
+                continue
+            if not added:
+                side = "r" if node.l else "l"
+                node.add_node(key, side)
+                self.node_count += 1
+                if self.index is not None:
+                    self.index[key] = getattr(node, side)
+                    self.parents[key] = node
+                added = True
+                if node.r:
+                    continue
+            # The next missing space. The tree is packed again if it is the one after
+            # the last node
+            self.packed = (2 * i) + (1 if node.l else 0) == self.node_count + 1
+            return
+
+    def recount(self):
+        """
+        Recount.
+
+        Count the nodes of the tree and check if it is complete, in O(n). Needed after
+        the tree is changed other than through add_breadth_first and delete_default,
+        such as by adding or deleting children of its nodes directly, before it is
+        added to breadth-first again. add_breadth_first calls it itself when the change
+        is to the path to the next free place.
+        """
+        self.edits += 1
+        self.node_count = 0
+        for _ in self.breadth_first():
+            self.node_count += 1
+        self.packed = self.root is None or self.is_complete()
+
+    def analyze(self, cached: bool = True) -> dict:
+        """
+        Analyze.
+
+        Find the structural properties of the tree in a single post-order pass, in
+        O(n). The properties of each node's subtree follow from those of its
+        children's:
+
+        - height is one more than the larger height of its children, where a missing
+          child has height -1
+        - it is perfect if both children are perfect with the same height
+        - it is full if it has no children or both are full
+        - it is complete if the left child is perfect and the right complete with the
+          same height, or the left is complete and the right perfect and one shorter
+        - it is balanced if both children are and their heights differ by at most 1
+        - it is bst ordered if both children are, all keys on the left are smaller
+          than the node's and all on the right larger
+
+        The result is cached on the tree until it is changed through add, delete,
+        extend, add_root or build_level_order, which is tracked by edits. After
+        changing its nodes directly, call recount to count the change. A copy of the
+        cache is returned, so changing the result does not change the cache.
+
+        The is_ predicates do not read the cache and analyze the tree again on every
+        call. Nodes can be changed directly with add_node and del_node, which do not
+        know their tree and so cannot count an edit, and the predicates have always
+        seen such changes without a recount.
+
+        Parameters
+        ----------
+        cached : bool = True
+            If False, the tree is analyzed again even if it has not been changed.
+
+        Returns
+        -------
+        dict
+            The tree's "height" (-1 if empty), "size", and whether it is "perfect",
+            "full", "complete", "balanced" and "bst" ordered. An empty tree is all of
+            them.
+        """
+        if cached and self.analysis is not None and self.analysis_edits == self.edits:
+            return dict(self.analysis)
+        # height, size, perfect, full, complete, balanced, bst, smallest and largest key
+        missing = (-1, 0, True, True, True, True, True, None, None)
+        subtrees = {}
+        for node in self.postorder():
+            lh, ls, lp, lf, lc, lb, lo, lmin, lmax = (
+                subtrees.pop(node.l) if node.l else missing
+            )
+            rh, rs, rp, rf, rc, rb, ro, rmin, rmax = (
+                subtrees.pop(node.r) if node.r else missing
+            )
+            try:
+                ordered = (
+                    lo
+                    and ro
+                    and (not node.l or lmax < node.key)
+                    and (not node.r or node.key < rmin)
+                )
+            except TypeError:
+                # Keys which cannot be compared are not in order
+                ordered = False
+            subtrees[node] = (
+                max(lh, rh) + 1,
+                ls + rs + 1,
+                lp and rp and lh == rh,
+                lf and rf and (not node.l) == (not node.r),
+                (lp and rc and lh == rh) or (lc and rp and lh == rh + 1),
+                lb and rb and -1 <= lh - rh <= 1,
+                ordered,
+                lmin if node.l else node.key,
+                rmax if node.r else node.key,
+            )
+        height, size, perfect, full, complete, balanced, bst, _, _ = (
+            subtrees[self.root] if self.root else missing
+        )
+        self.analysis = {
+            "height": height,
+            "size": size,
+            "perfect": perfect,
+            "full": full,
+            "complete": complete,
+            "balanced": balanced,
+            "bst": bst,
+        }
+        self.analysis_edits = self.edits
+        return dict(self.analysis)
 
     def is_perfect(self) -> bool:
         """
         Check if tree is perfect.
 
         A binary tree is perfect if every internal node has two children and all the
-        leaf nodes are on the same level.
+        leaf nodes are on the same level. Found in O(n) with analyze, which is run
+        again on every call so that nodes changed directly are seen without a recount.
 
         Returns
         -------
         bool
             True if tree satisfies definion of perfect tree.
         """
-
-        def node_is_perfect(node: BTNode) -> bool:
-            # Height of 0
-            if not node.l and not node.r:
-                return True
-            # Only one child
-            if not node.l or not node.r:
-                return False
-            # Both children have same height
-            if (
-                node.l.get_height() == node.get_height() - 1
-                and node.r.get_height() == node.get_height() - 1
-            ):
-                return node_is_perfect(node.l) and node_is_perfect(node.r)
-            # Default case
-            return False
-
         if not self.root:
             return
-        return node_is_perfect(self.root)
+        return self.analyze(cached=False)["perfect"]
 
     def is_full(self) -> bool:
         """
         Check if tree is full.
 
-        A binary tree is full if every node has either 0 or 2 children.
+        A binary tree is full if every node has either 0 or 2 children. Found in O(n)
+        with a fresh analyze, as is_perfect.
 
         Returns
         -------
         bool
             True if tree satisfies definition of full tree.
         """
-
-        def rec_is_full(node: BTNode) -> bool:
-            # No children
-            if not node.l and not node.r:
-                return True
-            # 2 children
-            if node.l and node.r:
-                return rec_is_full(node.l) and rec_is_full(node.r)
-            # Default case: 1 child
-            return False
-
         if not self.root:
             return
-        return rec_is_full(self.root)
+        return self.analyze(cached=False)["full"]
 
     def is_complete(self) -> bool:
         """
         Check if tree is complete.
 
         A binary tree is complete if every space in every level of the tree is filled,
-        except possibly the lowest level which must be filled from the left.
+        except possibly the lowest level which must be filled from the left. Found in
+        O(n) with a fresh analyze, as is_perfect.
 
         Returns
         -------
@@ -470,49 +853,22 @@ class BinaryTree:
         """
         if not self.root:
             return
-        # Nodes in a perfect tree when iterated over breadth-first will all
-        # have 2 children (internal) until the last or second last level. After
-        # finding a node with one (left) or zero children, every following node
-        # will have no children.
-
-        # Track state
-        state = "internal"
-        # Iterate over nodes breadth-first
-        for node in self.breadth_first():
-            # Only right child
-            if node.r and not node.l:
-                return False
-            if state == "internal":
-                # One or zero children -> change state
-                if not node.r:
-                    state = "external"
-                    continue
-            if state == "external":
-                # Any child
-                if node.r or node.l:
-                    return False
-        return True
+        return self.analyze(cached=False)["complete"]
 
     def is_balanced(self) -> bool:
         """
         Check if tree is balanced.
 
         A binary tree is balanced if the difference between the height of the children
-        of each node is no greater than 1 and no less than -1.
+        of each node is no greater than 1 and no less than -1. Found in O(n) with a
+        fresh analyze, as is_perfect.
 
         Returns
         -------
         bool
             True if the tree satisfies the definition of a balanced tree.
         """
-        if not self.root:
-            return True
-        for node in self.flatten():
-            rh = node.r.get_height() if node.r else -1
-            lh = node.l.get_height() if node.l else -1
-            if (diff := rh - lh) < -1 or diff > 1:
-                return False
-        return True
+        return self.analyze(cached=False)["balanced"]
 
     def breadth_first(self) -> Iterator[BTNode]:
         """
@@ -541,57 +897,152 @@ class BinaryTree:
                 if node.r:
                     queue.enqueue(node.r)
 
-    def flatten(self) -> Iterator[BTNode]:
+    def flatten(self, reverse: bool = False, mode: str = "stack") -> Iterator[BTNode]:
         """
         In-order traversal.
 
         Returns an iterator which provides all the nodes in the tree in in-order
         priority. In-order priority is left child -> node -> right child.
 
+        By default the traversal keeps its own stack of the nodes whose left subtree
+        is being visited, rather than recursing, so each node is handled once however
+        deep the tree is. The stack grows with the height of the tree, which the
+        "morris" mode avoids (see morris).
+
+        Parameters
+        ----------
+        reverse : bool = False
+            If True, nodes are provided in reverse in-order priority, right child ->
+            node -> left child.
+        mode : str = "stack"
+            "stack", or "morris" to use O(1) extra memory.
+
         Returns
         -------
         Iterator[BTNode]
             Yields all nodes in tree in in-order priority.
-        """
-        if self.root:
-
-            def rec_flatten(node: BTNode) -> Iterator[BTNode]:
-                if node.l:
-                    for n in rec_flatten(node.l):
-                        yield n
-                yield node
-                if node.r:
-                    for n in rec_flatten(node.r):
-                        yield n
-
-            for n in rec_flatten(self.root):
-                yield n
 
-    def preorder(self) -> Iterator[BTNode]:
+        Raises
+        ------
+        Exception
+            If mode is not "stack" or "morris".
+        """
+        if mode == "morris":
+            yield from self.morris(reverse=reverse)
+            return
+        if mode != "stack":
+            raise Exception("Unknown traversal mode", mode)
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.r if reverse else node.l
+            node = stack.pop()
+            yield node
+            node = node.l if reverse else node.r
+
+    def preorder(self, mode: str = "stack") -> Iterator[BTNode]:
         """
         Pre-order traversal.
 
         Returns an iterator which provides all the nodes in the tree in preorder
         priority. Preorder priority is node -> left child -> right child.
 
+        By default the traversal keeps its own stack of the subtrees still to visit,
+        pushing the right child before the left so that the left is visited first. The
+        "morris" mode uses O(1) extra memory instead (see morris).
+
+        Parameters
+        ----------
+        mode : str = "stack"
+            "stack", or "morris" to use O(1) extra memory.
+
         Returns
         -------
         Iterator[BTNode]
             Yields all nodes in tree in preorder priority.
+
+        Raises
+        ------
+        Exception
+            If mode is not "stack" or "morris".
         """
+        if mode == "morris":
+            yield from self.morris(preorder=True)
+            return
+        if mode != "stack":
+            raise Exception("Unknown traversal mode", mode)
         if self.root:
-
-            def rec_preorder(node: BTNode) -> Iterator[BTNode]:
+            stack = [self.root]
+            while stack:
+                node = stack.pop()
                 yield node
-                if node.l:
-                    for n in rec_preorder(node.l):
-                        yield n
                 if node.r:
-                    for n in rec_preorder(node.r):
-                        yield n
+                    stack.append(node.r)
+                if node.l:
+                    stack.append(node.l)
 
-            for n in rec_preorder(self.root):
-                yield n
+    def morris(self, preorder: bool = False, reverse: bool = False) -> Iterator[BTNode]:
+        """
+        Morris traversal.
+
+        In-order or preorder traversal in O(n) time with O(1) extra memory, after
+        Morris. Rather than keeping a stack of the nodes to come back to, the way back
+        up is threaded through the tree itself. Before the left subtree of a node is
+        visited, the right child of the last node in that subtree in in-order, which is
+        always None, is pointed back at the node. Following it after the subtree is
+        done returns to the node, and the thread is removed.
+
+        While it runs, the tree must not be changed or traversed by anything else. The
+        threads are set directly, without attach_node, so node attributes such as AVL
+        heights are untouched. All the threads are removed once the traversal finishes.
+        If it is closed early, by breaking out of a loop over it or calling close(),
+        the rest of the tree is walked without providing nodes to remove the threads
+        still in place.
+
+        Parameters
+        ----------
+        preorder : bool = False
+            If True, nodes are provided in preorder priority rather than in-order.
+        reverse : bool = False
+            If True, left and right are swapped, giving reverse in-order priority.
+
+        Returns
+        -------
+        Iterator[BTNode]
+            Yields all nodes in tree in the chosen priority.
+        """
+        first, second = ("r", "l") if reverse else ("l", "r")
+
+        def walk(node):
+            # Yields each node when it is provided, and None at every other step
+            while node:
+                child = getattr(node, first)
+                if not child:
+                    yield node
+                    node = getattr(node, second)
+                    continue
+                last = child
+                while getattr(last, second) and getattr(last, second) is not node:
+                    last = getattr(last, second)
+                if getattr(last, second) is None:
+                    setattr(last, second, node)
+                    yield node if preorder else None
+                    node = child
+                else:
+                    setattr(last, second, None)
+                    yield None if preorder else node
+                    node = getattr(node, second)
+
+        steps = walk(self.root)
+        try:
+            for node in steps:
+                if node:
+                    yield node
+        finally:
+            for _ in steps:
+                pass
 
     def postorder(self) -> Iterator[BTNode]:
         """
@@ -600,24 +1051,29 @@ class BinaryTree:
         Returns an iterator which provides all the nodes in the tree in postorder
         priority. Postorder priority is left child -> right child -> node.
 
+        The traversal keeps its own stack of the nodes on the path from the root. A
+        node is provided once its right subtree is finished, which is when the last
+        node provided is its right child, or it has none.
+
         Returns
         -------
         Iterator[BTNode]
             Yields all nodes in tree in postorder priority.
         """
-        if self.root:
-
-            def rec_postorder(node: BTNode) -> Iterator[BTNode]:
-                if node.l:
-                    for n in rec_postorder(node.l):
-                        yield n
-                if node.r:
-                    for n in rec_postorder(node.r):
-                        yield n
-                yield node
-
-            for n in rec_postorder(self.root):
-                yield n
+        stack = []
+        node = self.root
+        last = None
+        while stack or node:
+            if node:
+                stack.append(node)
+                node = node.l
+                continue
+            top = stack[-1]
+            if top.r and top.r is not last:
+                node = top.r
+            else:
+                last = stack.pop()
+                yield last
 
     def display(self):
         """
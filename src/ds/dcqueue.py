@@ -8,10 +8,27 @@ class DynamicCircularQueue(CircularQueue):
     Dynamic circular queue.
 
     A dynamic implementation of the circular queue. This implementation overrides the
-    handle_overflow and handle_full methods to resize the queue to fit changing needs.
+    handle_overflow method to resize the queue to fit changing needs.
 
-    The resizing of the queue upon overflow is not a very efficient algorithm (O = n)
-    but happens infrequently enough that the benefits far outweight the downsides.
+    Resizing copies the contents of the queue into a new array with at most two slice
+    copies (head to the end of the array, then the start of the array to tail), so the
+    work is done in C rather than one dequeue and enqueue per item. The queue grows by
+    growth_factor when full. It only shrinks when the occupancy falls below
+    shrink_threshold of the array, and never below the initial capacity, so a queue
+    which repeatedly fills and drains does not reallocate on every cycle.
+
+    Copying on resize makes enqueue O(1) amortized, but the enqueue which triggers a
+    resize still does O(n) work. With resize_mode="incremental" the queue instead
+    allocates the new array and leaves the existing items in the old one. Every
+    following enqueue and dequeue migrates a constant number of items (migrate_step)
+    from the end of the old array into the new one, and items are read from the old
+    array first until it is empty. No single operation copies more than migrate_step
+    items, at the cost of a little extra work on every operation during a migration.
+    Allocating the new array is still proportional to its size, but it is a single
+    allocation done in C rather than a copy of every item.
+
+    The queue is also double ended: items can be inserted and removed at both ends in
+    O(1), and rotate(k) moves k items from one end to the other with slice copies.
 
     Example:
 
@@ -33,17 +50,88 @@ class DynamicCircularQueue(CircularQueue):
 
     ...
 
+    Attributes
+    ---------
+    initial_capacity : int = 8
+        The size of the array the queue starts with. The queue never shrinks below it.
+    growth_factor : float = 2
+        The factor the size of the array is multiplied by when the queue overflows.
+    shrink_threshold : float = 0.25
+        The queue shrinks by growth_factor when the number of items falls below this
+        fraction of the size of the array.
+    resize_mode : str = "copy"
+        Either "copy" to copy every item when resizing or "incremental" to migrate
+        items a few at a time.
+    old_data : list[Any]
+        The array being migrated from during an incremental resize, otherwise None.
+        Its items come before the items in data.
+    old_head : int
+        The index of the first item in old_data.
+    old_count : int
+        The number of items left in old_data.
+    migrate_step : int
+        The number of items migrated by each operation during an incremental resize.
+        It is chosen so that the migration is finished before the new array fills.
+
     Methods
     -------
+    resize(size: int)
+        Copy the contents of the queue into a new array of the given size.
+    start_migration(size: int)
+        Begin an incremental resize into a new array of the given size.
+    migrate(count: int)
+        Move up to count items from the old array into the new one.
+    finish_migration()
+        Migrate all the items left in the old array.
     handle_overflow(x: Any)
-        Dequeues all items from the queue into a temporary buffer, doubles the size of
-        the queue and adds all items in the buffer back into the queue before
-        enqueueing the item x passed in.
-    handle_empty()
-        Dynamically resizes the queue to a size of 8 upon empty.
+        Grows the array by growth_factor before the item x passed in is enqueued.
+    is_empty() -> bool
+        Extends parent implementation to count items left in the old array.
+    enqueue(x: Any)
+        Extends parent implementation to migrate items during an incremental resize.
+    dequeue() -> Any
+        Extends parent implementation to read from the old array during an
+        incremental resize and to shrink the array when occupancy is low.
+    peek() -> Any
+        Extends parent implementation to read from the old array during an
+        incremental resize.
+    shrink_if_sparse()
+        Shrink the array by growth_factor if occupancy is below shrink_threshold.
+    enqueue_front(x: Any)
+        Insert an item at the start of the queue.
+    dequeue_back() -> Any
+        Remove and return the item at the end of the queue.
+    peek_back() -> Any
+        Return the item at the end of the queue.
+    read_block(start: int, count: int) -> list[Any]
+        Return count items of the array starting at index start, wrapping around.
+    write_block(start: int, items: list[Any])
+        Write items into the array starting at index start, wrapping around.
+    rotate(k: int)
+        Move the last k items to the start of the queue, or the first -k items to the
+        end if k is negative.
+    extend_front(data: list[Any])
+        Insert multiple items at the start of the queue, one after another.
+    extend(data: list[Any])
+        Extends parent implementation to reserve space for all the items at once.
+    reserve(n: int)
+        Ensure that the queue can hold n items without resizing.
+    shrink_to_fit()
+        Resize the array to the number of items in the queue.
+    __len__() -> int
+        Extends parent implementation to count items left in the old array.
+    __iter__() -> Iterator[Any]
+        Extends parent implementation to yield the items in the old array first.
     """
 
-    def __init__(self, data=[]):
+    def __init__(
+        self,
+        data: list[Any] = [],
+        initial_capacity: int = 8,
+        growth_factor: float = 2,
+        shrink_threshold: float = 0.25,
+        resize_mode: str = "copy",
+    ):
         """
         __init__.
 
@@ -51,38 +139,570 @@ class DynamicCircularQueue(CircularQueue):
         ----------
         data : list[Any]
             List of items to initialise the queue with.
+        initial_capacity : int = 8
+            Size of the array the queue starts with.
+        growth_factor : float = 2
+            Factor the array grows by on overflow. Must be greater than 1.
+        shrink_threshold : float = 0.25
+            Fraction of the array below which the queue shrinks. Must be less than
+            1 / growth_factor so that a shrink is never immediately followed by a grow.
+        resize_mode : str = "copy"
+            Either "copy" to copy every item when resizing or "incremental" to migrate
+            items a few at a time.
+
+        Raises
+        ------
+        Exception
+            If the growth factor, shrink threshold or resize mode is invalid.
+        """
+        if initial_capacity < 1:
+            raise Exception("Initial capacity must be at least 1", initial_capacity)
+        if growth_factor <= 1:
+            raise Exception("Growth factor must be greater than 1", growth_factor)
+        if not 0 <= shrink_threshold * growth_factor < 1:
+            raise Exception(
+                "Shrink threshold must be less than 1 / growth factor",
+                shrink_threshold,
+            )
+        if resize_mode not in ("copy", "incremental"):
+            raise Exception("Resize mode must be copy or incremental", resize_mode)
+        self.initial_capacity = initial_capacity
+        self.growth_factor = growth_factor
+        self.shrink_threshold = shrink_threshold
+        self.resize_mode = resize_mode
+        self.old_data = None
+        self.old_head = self.old_count = self.migrate_step = 0
+        super().__init__(data=data, max_size=initial_capacity)
+
+    def resize(self, size: int):
+        """
+        Resize.
+
+        Copy the contents of the queue into a new array of the given size. The first
+        item of the queue is moved to the start of the new array. Any incremental
+        resize in progress is finished first.
+
+        Parameters
+        ----------
+        size : int
+            Size of the new array.
+
+        Raises
+        ------
+        Exception
+            If the queue holds more items than size.
+        """
+        self.finish_migration()
+        length = len(self)
+        if size < max(length, 1):
+            raise Exception("Cannot resize queue below its length", size)
+        if length == 0:
+            items = []
+        elif self.head <= self.tail:
+            items = self.data[self.head : self.tail + 1]
+        else:
+            items = self.data[self.head :] + self.data[: self.tail + 1]
+        items.extend([None] * (size - length))
+        self.data = items
+        self.max_size = size
+        if length == 0:
+            self.head = self.tail = -1
+        else:
+            self.head = 0
+            self.tail = length - 1
+
+    def start_migration(self, size: int):
+        """
+        Start migration.
+
+        Begin an incremental resize into a new array of the given size. The current
+        array becomes old_data and the new array starts empty. Migrated items are
+        written backwards from the end of the new array and new items forwards from
+        the start, so the two meet in a contiguous ring.
+
+        Parameters
+        ----------
+        size : int
+            Size of the new array. It must be larger than the length of the queue.
+
+        Raises
+        ------
+        Exception
+            If size leaves no free slot for the items in the queue.
+        """
+        length = len(self)
+        if size <= length:
+            raise Exception("Size must be larger than the length of the queue", size)
+        self.old_data = self.data
+        self.old_head = self.head
+        self.old_count = length
+        # Each operation adds at most one item to the new array, so migrating one more
+        # than length / free items per operation finishes before the new array fills
+        self.migrate_step = -(-length // (size - length)) + 1
+        self.data = [None] * size
+        self.max_size = size
+        self.head = self.tail = -1
+        if length == 0:
+            self.old_data = None
+
+    def migrate(self, count: int):
+        """
+        Migrate.
+
+        Move up to count items from the end of the old array to the front of the new
+        array. The old array is released once it is empty.
+
+        Parameters
+        ----------
+        count : int
+            Maximum number of items to move.
+        """
+        old = self.old_data
+        old_size = len(old)
+        for _ in range(min(count, self.old_count)):
+            self.old_count -= 1
+            i = (self.old_head + self.old_count) % old_size
+            if self.head == -1:
+                self.head = self.tail = self.max_size - 1
+            else:
+                self.head = (self.head - 1) % self.max_size
+            self.data[self.head] = old[i]
+            old[i] = None
+        if self.old_count == 0:
+            self.old_data = None
+
+    def finish_migration(self):
+        """
+        Finish migration.
+
+        Migrate all the items left in the old array, if an incremental resize is in
+        progress.
         """
-        super().__init__(data=data, max_size=8)
+        if self.old_data is not None:
+            self.migrate(self.old_count)
+
+    def grown_size(self, n: int) -> int:
+        """
+        Grown size.
+
+        Parameters
+        ----------
+        n : int
+            Number of items the array must be able to hold.
+
+        Returns
+        -------
+        int
+            The smallest size reached by repeatedly growing the array by growth_factor
+            which can hold n items.
+        """
+        size = self.max_size
+        while size < n:
+            size = max(int(size * self.growth_factor), size + 1)
+        return size
 
     def handle_overflow(self, x: Any):
         """
         Handle overflow.
 
-        Dequeues all items from the queue into a temporary buffer, doubles the size of
-        the queue and adds all items in the buffer back into the queue before
-        enqueueing the item x passed in.
+        Grows the array by growth_factor before the item x passed in is enqueued. In
+        incremental mode the first migrate_step items are migrated straight away.
 
         Parameters
         ----------
         x : Any
             The item attempted to be enqueued.
         """
-        old_data = []
-        old_max = self.max_size
-        while len(self) > 0:
-            old_data.append(self.dequeue())
-        self.max_size = old_max * 2
-        self.data = [None] * self.max_size
-        self.head = self.tail = -1
-        for d in old_data:
-            self.enqueue(d)
+        size = self.grown_size(self.max_size + 1)
+        if self.resize_mode == "incremental":
+            self.start_migration(size)
+            self.migrate(self.migrate_step)
+        else:
+            self.resize(size)
 
-    def handle_empty(self):
+    def is_empty(self) -> bool:
         """
-        Handle empty.
+        Is empty.
+
+        Extends parent implementation to count items left in the old array.
 
-        Dynamically resizes the queue to a size of 8 upon empty.
+        Returns
+        -------
+        bool
+            Returns True if the queue is empty.
         """
-        self.max_size = 8
-        self.data = [None] * self.max_size
-        self.head = self.tail = -1
+        return self.old_data is None and super().is_empty()
+
+    def enqueue(self, x: Any):
+        """
+        Enqueue.
+
+        Extends parent implementation to migrate migrate_step items first during an
+        incremental resize.
+
+        Parameters
+        ----------
+        x : Any
+            Item to be inserted.
+        """
+        if self.old_data is not None:
+            self.migrate(self.migrate_step)
+        super().enqueue(x)
+
+    def dequeue(self) -> Any:
+        """
+        Dequeue.
+
+        Extends parent implementation to read from the old array during an
+        incremental resize, migrating migrate_step items afterwards. Otherwise, the
+        array is shrunk by growth_factor when the number of items falls below
+        shrink_threshold of its size.
+
+        Returns
+        -------
+        Any
+            Item at start of queue.
+        """
+        if self.old_data is not None:
+            old = self.old_data
+            output = old[self.old_head]
+            old[self.old_head] = None
+            self.old_head = (self.old_head + 1) % len(old)
+            self.old_count -= 1
+            self.migrate(self.migrate_step)
+            return output
+        output = super().dequeue()
+        self.shrink_if_sparse()
+        return output
+
+    def peek(self) -> Any:
+        """
+        Peek.
+
+        Extends parent implementation to read from the old array during an
+        incremental resize.
+
+        Returns
+        -------
+        Any
+            Item at the start of the queue.
+        """
+        if self.old_data is not None:
+            return self.old_data[self.old_head]
+        return super().peek()
+
+    def shrink_if_sparse(self):
+        """
+        Shrink if sparse.
+
+        Shrink the array by growth_factor, but not below initial_capacity, if the
+        number of items is below shrink_threshold of its size. In incremental mode
+        this starts a migration rather than copying the items. The new size is rounded
+        up and always leaves at least one free slot, so the next enqueue does not grow
+        the array straight back. If no smaller size would, the array is kept.
+        """
+        length = len(self)
+        if (
+            self.max_size > self.initial_capacity
+            and length < self.max_size * self.shrink_threshold
+        ):
+            size = max(
+                int(-(-self.max_size // self.growth_factor)),
+                self.initial_capacity,
+                length + 1,
+            )
+            if size >= self.max_size:
+                return
+            if self.resize_mode == "incremental":
+                self.start_migration(size)
+            else:
+                self.resize(size)
+
+    def enqueue_front(self, x: Any):
+        """
+        Enqueue front.
+
+        Insert an item at the start of the queue. During an incremental resize the
+        item is inserted in front of the items in the old array.
+
+        Parameters
+        ----------
+        x : Any
+            Item to be inserted.
+        """
+        if self.old_data is not None:
+            self.migrate(self.migrate_step)
+        if self.old_data is None and self.is_full():
+            self.handle_overflow(x)
+        if self.old_data is not None:
+            # Migrating always leaves space in front of the old items
+            self.old_head = (self.old_head - 1) % len(self.old_data)
+            self.old_data[self.old_head] = x
+            self.old_count += 1
+            return
+        if self.head == -1:
+            self.head = self.tail = 0
+        else:
+            self.head = (self.head - 1) % self.max_size
+        self.data[self.head] = x
+
+    def dequeue_back(self) -> Any:
+        """
+        Dequeue back.
+
+        Remove and return the item at the end of the queue.
+
+        Returns
+        -------
+        Any
+            Item at end of queue.
+
+        Raises
+        ------
+        Exception
+            If queue is empty.
+        """
+        if self.is_empty():
+            raise Exception("Queue empty, cannot dequeue")
+        if self.head == -1:
+            # Only the old array has items left
+            old = self.old_data
+            self.old_count -= 1
+            i = (self.old_head + self.old_count) % len(old)
+            output = old[i]
+            old[i] = None
+            self.migrate(self.migrate_step)
+            return output
+        output = self.data[self.tail]
+        self.data[self.tail] = None
+        if self.head == self.tail:
+            self.head = self.tail = -1
+        else:
+            self.tail = (self.tail - 1) % self.max_size
+        if self.old_data is not None:
+            self.migrate(self.migrate_step)
+        else:
+            self.shrink_if_sparse()
+        return output
+
+    def peek_back(self) -> Any:
+        """
+        Peek back.
+
+        Returns
+        -------
+        Any
+            Item at the end of the queue.
+
+        Raises
+        ------
+        Exception
+            If queue is empty.
+        """
+        if self.is_empty():
+            raise Exception("Queue empty, cannot peek")
+        if self.head == -1:
+            old = self.old_data
+            return old[(self.old_head + self.old_count - 1) % len(old)]
+        return self.data[self.tail]
+
+    def read_block(self, start: int, count: int) -> list[Any]:
+        """
+        Read block.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first slot of the array to read.
+        count : int
+            Number of slots to read.
+
+        Returns
+        -------
+        list[Any]
+            The contents of count slots of the array starting at start, wrapping
+            around the end of the array. At most two slice copies are made.
+        """
+        end = start + count
+        if end <= self.max_size:
+            return self.data[start:end]
+        return self.data[start:] + self.data[: end - self.max_size]
+
+    def write_block(self, start: int, items: list[Any]):
+        """
+        Write block.
+
+        Write items into the slots of the array starting at start, wrapping around
+        the end of the array. At most two slice assignments are made.
+
+        Parameters
+        ----------
+        start : int
+            Index of the first slot of the array to write.
+        items : list[Any]
+            Items to be written.
+        """
+        split = self.max_size - start
+        if len(items) <= split:
+            self.data[start : start + len(items)] = items
+        else:
+            self.data[start:] = items[:split]
+            self.data[: len(items) - split] = items[split:]
+
+    def rotate(self, k: int = 1):
+        """
+        Rotate.
+
+        Move the last k items to the start of the queue, or the first -k items to the
+        end if k is negative. Whichever end needs fewer items moved is used, and the
+        items are moved with slice copies, so the cost is O(min(k, n - k)). If the
+        array is full only head and tail need to move. During an incremental resize
+        the items are moved one at a time instead.
+
+        Parameters
+        ----------
+        k : int = 1
+            Number of steps to rotate the queue by.
+        """
+        length = len(self)
+        if length <= 1:
+            return
+        k %= length
+        if k == 0:
+            return
+        if self.old_data is not None:
+            if k <= length - k:
+                for _ in range(k):
+                    self.enqueue_front(self.dequeue_back())
+            else:
+                for _ in range(length - k):
+                    self.enqueue(self.dequeue())
+            return
+        if length == self.max_size:
+            self.head = (self.head - k) % self.max_size
+            self.tail = (self.tail - k) % self.max_size
+        elif k <= length - k:
+            # Lift the last k items off the end, then write them in front of head.
+            # Removing them leaves at least k empty slots in front of head.
+            start = (self.tail - k + 1) % self.max_size
+            items = self.read_block(start, k)
+            self.write_block(start, [None] * k)
+            self.tail = (self.tail - k) % self.max_size
+            self.head = (self.head - k) % self.max_size
+            self.write_block(self.head, items)
+        else:
+            k = length - k
+            items = self.read_block(self.head, k)
+            self.write_block(self.head, [None] * k)
+            self.head = (self.head + k) % self.max_size
+            self.write_block((self.tail + 1) % self.max_size, items)
+            self.tail = (self.tail + k) % self.max_size
+
+    def extend_front(self, data: list[Any]):
+        """
+        Extend front.
+
+        Insert multiple items at the start of the queue, one after another, so they
+        end up in reverse order at the start of the queue. Space is reserved for all
+        the items at once and they are written with slice copies. In incremental mode
+        the items are inserted one at a time so that no copy is made.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be inserted at the start of the queue.
+        """
+        if self.resize_mode == "incremental":
+            for x in data:
+                self.enqueue_front(x)
+            return
+        items = list(data)
+        if not items:
+            return
+        items.reverse()
+        self.reserve(len(self) + len(items))
+        if self.head == -1:
+            self.write_block(0, items)
+            self.head = 0
+            self.tail = len(items) - 1
+        else:
+            self.head = (self.head - len(items)) % self.max_size
+            self.write_block(self.head, items)
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Extends parent implementation to reserve space for all the items at once when
+        the number of items is known, so the queue is resized at most once. In
+        incremental mode the items are enqueued one at a time so that no copy is made.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be inserted at the end of the queue in order.
+        """
+        if self.resize_mode == "copy":
+            try:
+                self.reserve(len(self) + len(data))
+            except TypeError:
+                pass
+        super().extend(data)
+
+    def reserve(self, n: int):
+        """
+        Reserve.
+
+        Ensure that the queue can hold n items without resizing. The array is grown by
+        growth_factor until it is large enough, so reserving does not defeat the
+        growth policy.
+
+        Parameters
+        ----------
+        n : int
+            Number of items the queue must be able to hold.
+        """
+        if n > self.max_size:
+            self.resize(self.grown_size(n))
+
+    def shrink_to_fit(self):
+        """
+        Shrink to fit.
+
+        Resize the array to the number of items in the queue, or to a single slot if
+        the queue is empty.
+        """
+        self.resize(max(len(self), 1))
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Extends parent implementation to count items left in the old array.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the queue.
+        """
+        if self.old_data is not None:
+            return self.old_count + super().__len__()
+        return super().__len__()
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        __iter__.
+
+        Extends parent implementation to yield the items in the old array before the
+        items in the new array during an incremental resize.
+
+        Returns
+        -------
+        Iterator[Any]
+            Yields all the items in the queue from the start to the end.
+        """
+        if self.old_data is not None:
+            old = self.old_data
+            for i in range(self.old_count):
+                yield old[(self.old_head + i) % len(old)]
+        yield from super().__iter__()
@@ -1,5 +1,7 @@
 from __future__ import annotations
+from typing import Any, Callable, Iterable, Iterator
 from .bt import BinaryTree
+from .util import util
 
 
 class Heap:
@@ -46,6 +48,33 @@ class Heap:
      ┌─┴─┐   ┌─┘
     16   0  50
 
+    The heap can also order items which are not keys themselves. Given a key function,
+    each item's key is computed once when it is added and stored in a parallel array,
+    keys. In entries mode each item is added with a separate priority, which is stored
+    in keys in the same way. Either way, every item also gets a sequence number in a
+    third parallel array, seqs, which is only compared when two keys are equal, so
+    that items with equal keys are popped in the order they were added. The items
+    themselves are never compared, and no wrapper is allocated per item.
+
+    >>> heap = Heap(max_or_min="min", entries=True)
+    >>> heap.add("write tests", 2)
+    >>> heap.add("fix bug", 1)
+    >>> heap.add("review", 2)
+    >>> [heap.pop() for _ in range(3)]
+    ['fix bug', 'write tests', 'review']
+
+    Each node can have more than two children. A heap with arity d has depth log_d(n)
+    rather than log_2(n), so add, which only compares a node with its parents, gets
+    cheaper as d grows. pop has to find the best of d children at each level, so it
+    makes more comparisons in total and gets more expensive once d is large. An arity
+    of 4 is usually a good trade-off for heaps which are added to more than popped.
+
+    >>> heap = Heap(data=[x for x in range(10)], arity=4)
+    >>> heap.display()
+    9
+    8 2 3 4
+    [5 6 7 1] [0]
+
     ...
 
     Attributes
@@ -53,26 +82,63 @@ class Heap:
     data : list[int]
         The contents of the heap. It is treated as a complete binary tree where the
         location of the left child of a node at index n is (n * 2) + 1 and the
-        right child is (n * 2) + 2.
+        right child is (n * 2) + 2. With an arity of d, the children of the node at
+        index n are at (n * d) + 1 to (n * d) + d.
+    max_or_min : str = "max"
+        Whether the heap is a max heap or a min heap.
+    arity : int = 2
+        The maximum number of children of each node.
+    key : Callable = None
+        Function computing the key of an item when it is added.
+    entries : bool = False
+        Whether items are added with a separate priority.
+    keys : list[Any]
+        In key or entries mode, the key of the item at the same index of data. None
+        otherwise.
+    seqs : list[int]
+        In key or entries mode, the sequence number of the item at the same index of
+        data. Of two items with equal keys, the one with the smaller sequence number
+        comes first in either kind of heap. None otherwise.
+    count : int
+        The number of items which have been given a sequence number.
 
     Methods
     -------
-    compare(a: int, b: int) -> bool
-        Returns True if a > b if initialised as a max heap and a < b for a min heap.
-        Used for internal methods.
-    heapify_node(i: int, size: int, recursive: str)
-        Ensures that the node at data[i] is greater than the nodes at data[(i * 2) + 1]
-        and data[(i * 2) + 2] for a max heap, or less than for a min heap. Can be run
-        recursively to check nodes above or below in the tree structure.
+    sift_up(i: int)
+        Move the node at data[i] up the tree until its parent is no smaller for a max
+        heap, or no larger for a min heap. Set to sift_up_max or sift_up_min, or to
+        sift_up_keyed_max or sift_up_keyed_min in key or entries mode.
+    sift_down(i: int, size: int)
+        Move the node at data[i] down the first size nodes of the tree until its
+        children are no larger for a max heap, or no smaller for a min heap. Set to
+        sift_down_max or sift_down_min, or to sift_down_keyed_max or
+        sift_down_keyed_min in key or entries mode.
+    sift_up_dary(i: int)
+        sift_up for any kind of heap with an arity other than 2.
+    sift_down_dary(i: int, size: int)
+        sift_down for any kind of heap with an arity other than 2.
+    make_key(item: Any, priority: Any) -> Any
+        Returns the entry in keys for a new item.
+    beats(i: int, j: int) -> bool
+        Returns True if the node at data[i] belongs above the node at data[j].
     heapify()
         Guarantees that the first element of the heap will be the largest for a max
-        heap or the smallest for a min heap by running heapify_node on each node, not
+        heap or the smallest for a min heap by running sift_down on each node, not
         including leaf nodes.
-    add(key: int)
+    add(key: int, priority: Any)
         Insert a node into the heap and maintain heap ordering properties.
+    extend(data: Iterable[Any])
+        Insert multiple nodes, sifting each one up or rebuilding the heap, whichever
+        is expected to be faster.
     pop() -> int
         Remove and return the first element of the heap and reorder the heap to
         maintain heap ordering properties.
+    pop_entry() -> tuple
+        Remove and return the first element of the heap along with its priority.
+    pushpop(key: Any, priority: Any) -> Any
+        Add a node then pop the first element, with a single sift.
+    replace(key: Any, priority: Any) -> Any
+        Pop the first element then add a node, with a single sift.
     peek() -> int
         Return the first element without altering the heap.
     is_heap() -> bool
@@ -80,87 +146,502 @@ class Heap:
     display()
         Render the heap to the console in a readable format. The heap's data is used
         to initialise a BinaryTree (./bt.py) and use it's display implementation (found
-        at ./util/util.py).
+        at ./util/util.py). Heaps with an arity other than 2 are displayed one level
+        per line.
     """
 
-    def __init__(self, data: list[int] = [], max_or_min: str = "max"):
+    def __init__(
+        self,
+        data: Iterable[Any] = (),
+        max_or_min: str = "max",
+        key: Callable = None,
+        entries: bool = False,
+        arity: int = 2,
+        copy: bool = True,
+    ):
         """
         __init__.
 
         Parameters
         ----------
-        data : list[int] = []
-            List of ints to initialise the heap with.
+        data : Iterable[Any] = ()
+            Ints to initialise the heap with. In key mode, items. In entries mode,
+            (priority, item) pairs. Any iterable, including a generator.
         max_or_min : str = "max"
             Initialise the heap as either a max heap or a min heap.
+        key : Callable = None
+            Function computing the key of each item. Called once per item.
+        entries : bool = False
+            Add items with a separate priority.
+        arity : int = 2
+            Maximum number of children of each node.
+        copy : bool = True
+            Copy data into a new list. If False and data is a list, the heap adopts it
+            as its data and reorders it in place, without copying. In entries mode the
+            items are always copied out of their pairs.
+
+        Raises
+        ------
+        Exception
+            If max_or_min is neither "max" nor "min", if both key and entries are
+            given, or if arity is less than 2.
         """
-        if max_or_min == "max":
-            self.compare = lambda a, b: a > b
-        if max_or_min == "min":
-            self.compare = lambda a, b: a < b
-        self.data = data
+        if max_or_min not in ("max", "min"):
+            raise Exception("Heap must be max or min", max_or_min)
+        if key is not None and entries:
+            raise Exception("Heap cannot use both a key function and entries")
+        if arity < 2:
+            raise Exception("Heap arity must be at least 2", arity)
+        self.max_or_min = max_or_min
+        self.arity = arity
+        self.key = key
+        self.entries = entries
+        self.count = 0
+        if copy or not isinstance(data, list):
+            data = list(data)
+        if key is None and not entries:
+            self.keys = self.seqs = None
+            self.data = data
+        else:
+            if entries:
+                self.keys = [p for p, _ in data]
+                self.data = [x for _, x in data]
+            else:
+                self.keys = [key(x) for x in data]
+                self.data = data
+            self.count = len(self.data)
+            self.seqs = list(range(1, self.count + 1))
+        # The binary sift methods are specialised for each kind of heap so that
+        # comparisons are made inline rather than through a function call
+        if arity != 2:
+            self.sift_up = self.sift_up_dary
+            self.sift_down = self.sift_down_dary
+        elif self.keys is None and max_or_min == "max":
+            self.sift_up = self.sift_up_max
+            self.sift_down = self.sift_down_max
+        elif self.keys is None:
+            self.sift_up = self.sift_up_min
+            self.sift_down = self.sift_down_min
+        elif max_or_min == "max":
+            self.sift_up = self.sift_up_keyed_max
+            self.sift_down = self.sift_down_keyed_max
+        else:
+            self.sift_up = self.sift_up_keyed_min
+            self.sift_down = self.sift_down_keyed_min
         self.heapify()
 
-    def heapify_node(self, i: int, size: int, recursive: str = None):
+    def make_key(self, item: Any, priority: Any) -> Any:
+        """
+        Make key.
+
+        Parameters
+        ----------
+        item : Any
+            The item being added.
+        priority : Any
+            The priority of the item in entries mode.
+
+        Returns
+        -------
+        Any
+            The key of the item, from the key function or the priority given.
+        """
+        if self.key is not None:
+            return self.key(item)
+        return priority
+
+    def beats(self, i: int, j: int) -> bool:
+        """
+        Beats.
+
+        Parameters
+        ----------
+        i : int
+            The index of a node.
+        j : int
+            The index of another node.
+
+        Returns
+        -------
+        bool
+            True if the node at data[i] has a larger key than the node at data[j] for
+            a max heap, or a smaller one for a min heap. In key or entries mode, equal
+            keys are decided by the smaller sequence number.
+        """
+        keys = self.data if self.keys is None else self.keys
+        a, b = keys[i], keys[j]
+        if a == b:
+            return self.seqs is not None and self.seqs[i] < self.seqs[j]
+        return a > b if self.max_or_min == "max" else a < b
+
+    def sift_up_max(self, i: int):
+        """
+        Sift up (max heap).
+
+        Move the node at data[i] up the tree until its parent is no smaller. Rather
+        than swapping at every level, the node is held aside while each smaller parent
+        is moved down into the hole below it, and written once at the end.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        data = self.data
+        x = data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = data[parent]
+            if not x > p:
+                break
+            data[i] = p
+            i = parent
+        data[i] = x
+
+    def sift_up_min(self, i: int):
+        """
+        Sift up (min heap).
+
+        Move the node at data[i] up the tree until its parent is no larger. See
+        sift_up_max.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        data = self.data
+        x = data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = data[parent]
+            if not x < p:
+                break
+            data[i] = p
+            i = parent
+        data[i] = x
+
+    def sift_down_max(self, i: int, size: int):
+        """
+        Sift down (max heap).
+
+        Move the node at data[i] down the first size nodes of the tree until its
+        children are no larger. The node is held aside and the hole it leaves is moved
+        down to a leaf by always promoting the larger child, then the node is moved
+        back up from there. The node usually belongs near the bottom, so this takes
+        about half the comparisons of checking it against both children at each level.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        data = self.data
+        start = i
+        x = data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size and data[right] > data[child]:
+                child = right
+            data[i] = data[child]
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = data[parent]
+            if not x > p:
+                break
+            data[i] = p
+            i = parent
+        data[i] = x
+
+    def sift_down_min(self, i: int, size: int):
+        """
+        Sift down (min heap).
+
+        Move the node at data[i] down the first size nodes of the tree until its
+        children are no smaller. See sift_down_max.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        data = self.data
+        start = i
+        x = data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size and data[right] < data[child]:
+                child = right
+            data[i] = data[child]
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = data[parent]
+            if not x < p:
+                break
+            data[i] = p
+            i = parent
+        data[i] = x
+
+    def sift_up_keyed_max(self, i: int):
+        """
+        Sift up (keyed max heap).
+
+        As sift_up_max, but comparing the entries in keys and moving the items in data
+        along with them. seqs is only read when two keys are equal.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, seqs, data = self.keys, self.seqs, self.data
+        k, q, x = keys[i], seqs[i], data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k > p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            data[i] = data[parent]
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+
+    def sift_up_keyed_min(self, i: int):
+        """
+        Sift up (keyed min heap).
+
+        As sift_up_min, but comparing the entries in keys and moving the items in data
+        along with them. seqs is only read when two keys are equal.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, seqs, data = self.keys, self.seqs, self.data
+        k, q, x = keys[i], seqs[i], data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k < p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            data[i] = data[parent]
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+
+    def sift_down_keyed_max(self, i: int, size: int):
+        """
+        Sift down (keyed max heap).
+
+        As sift_down_max, but comparing the entries in keys and moving the items in
+        data along with them. seqs is only read when two keys are equal.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        keys, seqs, data = self.keys, self.seqs, self.data
+        start = i
+        k, q, x = keys[i], seqs[i], data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size:
+                a, b = keys[right], keys[child]
+                if a > b or (a == b and seqs[right] < seqs[child]):
+                    child = right
+            keys[i] = keys[child]
+            seqs[i] = seqs[child]
+            data[i] = data[child]
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k > p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            data[i] = data[parent]
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+
+    def sift_down_keyed_min(self, i: int, size: int):
+        """
+        Sift down (keyed min heap).
+
+        As sift_down_min, but comparing the entries in keys and moving the items in
+        data along with them. seqs is only read when two keys are equal.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        keys, seqs, data = self.keys, self.seqs, self.data
+        start = i
+        k, q, x = keys[i], seqs[i], data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size:
+                a, b = keys[right], keys[child]
+                if a < b or (a == b and seqs[right] < seqs[child]):
+                    child = right
+            keys[i] = keys[child]
+            seqs[i] = seqs[child]
+            data[i] = data[child]
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k < p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            data[i] = data[parent]
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+
+    def sift_up_dary(self, i: int):
+        """
+        Sift up (d-ary heap).
+
+        Move the node at data[i] up the tree until its parent is no smaller for a max
+        heap, or no larger for a min heap, where the parent of the node at index n is
+        at (n - 1) // arity. Works in any mode, comparing the entries in keys and
+        seqs if there are any.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        d = self.arity
+        data = self.data
+        keys = data if self.keys is None else self.keys
+        seqs = self.seqs
+        k, x = keys[i], data[i]
+        q = None if seqs is None else seqs[i]
+        is_max = self.max_or_min == "max"
+        while i > 0:
+            parent = (i - 1) // d
+            p = keys[parent]
+            if k == p:
+                if seqs is None or not q < seqs[parent]:
+                    break
+            elif not (k > p if is_max else k < p):
+                break
+            keys[i] = p
+            data[i] = data[parent]
+            if seqs is not None:
+                seqs[i] = seqs[parent]
+            i = parent
+        keys[i] = k
+        data[i] = x
+        if seqs is not None:
+            seqs[i] = q
+
+    def sift_down_dary(self, i: int, size: int):
         """
-        Heapify a node.
+        Sift down (d-ary heap).
 
-        Ensures that the node at data[i] is greater than the nodes at data[(i * 2) + 1]
-        and data[(i * 2) + 2] for a max heap, or less than for a min heap. Can be run
-        recursively to check nodes above or below in the tree structure.
+        Move the node at data[i] down the first size nodes of the tree until its
+        children are no larger for a max heap, or no smaller for a min heap. The hole
+        is moved down to a leaf by promoting the best of up to arity children at each
+        level, then the node is moved back up. Works in any mode, comparing the entries
+        in keys and seqs if there are any.
 
         Parameters
         ----------
         i : int
-            The index of the node to check.
+            The index of the node to move.
         size : int
-            The size of the heap
-        recursive : str = None
-            If the heap was altered during the heapify process, the method can be run
-            recursively on the parent of the node changed (recursive == \"up\") or the
-            child which was changed (recursive == \"down\") to guarantee that the whole
-            heap maintains heap ordering properties.
-        """
-        top = i
-        l = (2 * i) + 1
-        r = (2 * i) + 2
-        kids = []
-        if l < size and not self.compare(self.data[i], self.data[l]):
-            kids.append(l)
-        if r < size and not self.compare(self.data[i], self.data[r]):
-            kids.append(r)
-        if len(kids) == 2:
-            top = (
-                kids[0]
-                if self.compare(self.data[kids[0]], self.data[kids[1]])
-                else kids[1]
-            )
-        if len(kids) == 1:
-            top = kids[0]
-        if top != i:
-            self.data[i], self.data[top] = self.data[top], self.data[i]
-            if recursive == "down":
-                self.heapify_node(top, size, "down")
-            if recursive == "up":
-                self.heapify_node(abs(i - 1) // 2, size, "up")
+            The number of nodes at the start of data which make up the heap.
+        """
+        d = self.arity
+        data = self.data
+        keys = data if self.keys is None else self.keys
+        seqs = self.seqs
+        is_max = self.max_or_min == "max"
+        start = i
+        k, x = keys[i], data[i]
+        q = None if seqs is None else seqs[i]
+        child = (d * i) + 1
+        while child < size:
+            best = keys[child]
+            for j in range(child + 1, min(child + d, size)):
+                kj = keys[j]
+                if kj == best:
+                    if seqs is not None and seqs[j] < seqs[child]:
+                        child = j
+                elif (kj > best) if is_max else (kj < best):
+                    child, best = j, kj
+            keys[i] = best
+            data[i] = data[child]
+            if seqs is not None:
+                seqs[i] = seqs[child]
+            i = child
+            child = (d * i) + 1
+        while i > start:
+            parent = (i - 1) // d
+            p = keys[parent]
+            if k == p:
+                if seqs is None or not q < seqs[parent]:
+                    break
+            elif not (k > p if is_max else k < p):
+                break
+            keys[i] = p
+            data[i] = data[parent]
+            if seqs is not None:
+                seqs[i] = seqs[parent]
+            i = parent
+        keys[i] = k
+        data[i] = x
+        if seqs is not None:
+            seqs[i] = q
 
     def heapify(self):
         """
         Heapify.
 
         Guarantees that the first element of the heap will be the largest for a max
-        heap or the smallest for a min heap by running heapify_node on each node, not
+        heap or the smallest for a min heap by running sift_down on each node, not
         including leaf nodes.
         """
-
         size = len(self.data)
-        if size < 1:
-            return
-        last_non_leaf = (size // 2) - 1
-        for i in range(last_non_leaf, -1, -1):
-            self.heapify_node(i, size, recursive="down")
+        sift_down = self.sift_down
+        for i in range((size - 2) // self.arity, -1, -1):
+            sift_down(i, size)
 
-    def add(self, key: int):
+    def add(self, key: int, priority: Any = None):
         """
         Add a node.
 
@@ -169,11 +650,53 @@ class Heap:
         Parameters
         ----------
         key : int
-            The key of the node to be inserted.
+            The key of the node to be inserted. In key or entries mode, the item.
+        priority : Any = None
+            The priority of the item in entries mode.
         """
+        if self.keys is not None:
+            self.keys.append(self.make_key(key, priority))
+            self.count += 1
+            self.seqs.append(self.count)
         self.data.append(key)
+        self.sift_up(len(self.data) - 1)
+
+    def extend(self, data: Iterable[Any]):
+        """
+        Extend.
+
+        Add multiple nodes. The m new nodes are appended to the n already in the heap,
+        then either each one is sifted up, which takes O(m log(n + m)) in the worst
+        case but often much less, or the whole heap is rebuilt by heapify in O(n + m).
+        The heap is rebuilt when m * log2(n + m) is more than 4 * (n + m), where a
+        worst case sift up of every new node would be slower than a rebuild.
+
+        Parameters
+        ----------
+        data : Iterable[Any]
+            Ints to be inserted. In key mode, items. In entries mode, (priority, item)
+            pairs as taken by __init__.
+        """
+        start = len(self.data)
+        if self.entries:
+            for priority, x in data:
+                self.keys.append(priority)
+                self.data.append(x)
+        else:
+            self.data.extend(data)
+            if self.keys is not None:
+                self.keys.extend(map(self.key, self.data[start:]))
         size = len(self.data)
-        self.heapify_node(abs(size - 2) // 2, size, recursive="up")
+        if self.seqs is not None:
+            self.seqs.extend(range(self.count + 1, self.count + 1 + size - start))
+            self.count += size - start
+        m = size - start
+        if m * size.bit_length() > 4 * size:
+            self.heapify()
+        else:
+            sift_up = self.sift_up
+            for i in range(start, size):
+                sift_up(i)
 
     def pop(self) -> int:
         """
@@ -188,14 +711,118 @@ class Heap:
             The first element of the heap.
 
         """
-        size = len(self.data)
-        if size == 0:
+        data = self.data
+        if not data:
+            raise Exception("Heap empty, cannot pop")
+        last = data.pop()
+        if self.keys is not None:
+            last_key, last_seq = self.keys.pop(), self.seqs.pop()
+            if data:
+                self.keys[0] = last_key
+                self.seqs[0] = last_seq
+        if not data:
+            return last
+        output = data[0]
+        data[0] = last
+        self.sift_down(0, len(data))
+        return output
+
+    def pop_entry(self) -> tuple:
+        """
+        Pop entry.
+
+        Remove and return the first element of the heap along with its priority.
+
+        Returns
+        -------
+        tuple
+            The priority, or the key computed by the key function, and the first
+            element of the heap. Without a key function or entries, an element is its
+            own priority.
+        """
+        if not self.data:
             raise Exception("Heap empty, cannot pop")
-        if size == 1:
-            return self.data.pop(0)
-        output = self.data[0]
-        self.data[0] = self.data.pop(size - 1)
-        self.heapify_node(0, size - 1, recursive="down")
+        priority = self.data[0] if self.keys is None else self.keys[0]
+        return (priority, self.pop())
+
+    def pushpop(self, key: Any, priority: Any = None) -> Any:
+        """
+        Pushpop.
+
+        Add a node then pop the first element. If the new node would be the first
+        element it is returned straight away, otherwise it takes the place of the first
+        element and is sifted down once, rather than sifted up by add and the last node
+        sifted down by pop.
+
+        Parameters
+        ----------
+        key : Any
+            The key of the node to be inserted. In key or entries mode, the item.
+        priority : Any = None
+            The priority of the item in entries mode.
+
+        Returns
+        -------
+        Any
+            The first element of the heap after the node was added.
+        """
+        data, keys = self.data, self.keys
+        if not data:
+            return key
+        is_max = self.max_or_min == "max"
+        if keys is None:
+            first = data[0]
+            if key >= first if is_max else key <= first:
+                return key
+        else:
+            # The new item is the latest, so it loses a tie with the first
+            k = self.make_key(key, priority)
+            first = keys[0]
+            if k > first if is_max else k < first:
+                return key
+            keys[0] = k
+            self.count += 1
+            self.seqs[0] = self.count
+        output = data[0]
+        data[0] = key
+        self.sift_down(0, len(data))
+        return output
+
+    def replace(self, key: Any, priority: Any = None) -> Any:
+        """
+        Replace.
+
+        Pop the first element then add a node. The new node takes the place of the
+        first element and is sifted down once. Unlike pushpop, the element returned
+        can be a worse one than the node added.
+
+        Parameters
+        ----------
+        key : Any
+            The key of the node to be inserted. In key or entries mode, the item.
+        priority : Any = None
+            The priority of the item in entries mode.
+
+        Returns
+        -------
+        Any
+            The first element of the heap before the node was added.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        data = self.data
+        if not data:
+            raise Exception("Heap empty, cannot replace")
+        output = data[0]
+        data[0] = key
+        if self.keys is not None:
+            self.keys[0] = self.make_key(key, priority)
+            self.count += 1
+            self.seqs[0] = self.count
+        self.sift_down(0, len(data))
         return output
 
     def peek(self) -> int:
@@ -218,15 +845,14 @@ class Heap:
         bool
             Returns True if the heap satisfies heap ordering properties.
         """
-        size = len(self.data)
-        for i in range(size // 2):
-            l = (2 * i) + 1
-            r = (2 * i) + 2
-            if l < size and not self.compare(self.data[i], self.data[l]):
-                return False
-            if r < size and not self.compare(self.data[i], self.data[r]):
-                return False
-        return True
+        d = self.arity
+        if self.keys is not None:
+            beats = self.beats
+            return not any(beats(i, (i - 1) // d) for i in range(1, len(self.data)))
+        data = self.data
+        if self.max_or_min == "max":
+            return all(data[(i - 1) // d] >= data[i] for i in range(1, len(data)))
+        return all(data[(i - 1) // d] <= data[i] for i in range(1, len(data)))
 
     def display(self):
         """
@@ -234,7 +860,260 @@ class Heap:
 
         Render the heap to the console in a readable format. The heap's data is used
         to initialise a BinaryTree (./bt.py) and use it's display implementation (found
-        at ./util/util.py).
+        at ./util/util.py). In key or entries mode the keys are displayed. Heaps with an
+        arity other than 2 are displayed one level per line, with the children of each
+        node grouped in brackets.
         """
-        tree = BinaryTree(data=self.data)
-        tree.display()
+        data = self.data if self.keys is None else self.keys
+        if self.arity != 2:
+            print(util.display_levels(data, self.arity))
+            return
+        BinaryTree.from_level_order(data).display()
+
+
+def nlargest(k: int, iterable: Iterable[Any], key: Callable = None) -> list[Any]:
+    """
+    N largest.
+
+    Find the k largest items of an iterable, holding at most k items at a time. A min
+    heap of the best k items so far is kept, and each new item which beats the
+    smallest of them replaces it with a single sift.
+
+    Parameters
+    ----------
+    k : int
+        The number of items to find.
+    iterable : Iterable[Any]
+        The items to search, which are only read once.
+    key : Callable = None
+        A function computing the value to compare each item by.
+
+    Returns
+    -------
+    list[Any]
+        The k largest items from largest to smallest. Equal items are in the order they
+        appeared, as with sorted(iterable, key=key, reverse=True)[:k].
+    """
+    if k <= 0:
+        return []
+    if key is None:
+        heap = Heap(max_or_min="min")
+        for x in iterable:
+            if len(heap.data) < k:
+                heap.add(x)
+            elif x > heap.data[0]:
+                heap.replace(x)
+        return sorted(heap.data, reverse=True)
+    # A later item has a smaller negated index, so it never displaces an equal one
+    heap = Heap(max_or_min="min", entries=True)
+    for i, x in enumerate(iterable):
+        priority = (key(x), -i)
+        if len(heap.data) < k:
+            heap.add(x, priority)
+        elif priority > heap.keys[0]:
+            heap.replace(x, priority)
+    order = sorted(range(len(heap.data)), key=heap.keys.__getitem__, reverse=True)
+    return [heap.data[i] for i in order]
+
+
+def nsmallest(k: int, iterable: Iterable[Any], key: Callable = None) -> list[Any]:
+    """
+    N smallest.
+
+    Find the k smallest items of an iterable, holding at most k items at a time, with
+    a max heap of the best k items so far.
+
+    Parameters
+    ----------
+    k : int
+        The number of items to find.
+    iterable : Iterable[Any]
+        The items to search, which are only read once.
+    key : Callable = None
+        A function computing the value to compare each item by.
+
+    Returns
+    -------
+    list[Any]
+        The k smallest items from smallest to largest. Equal items are in the order
+        they appeared, as with sorted(iterable, key=key)[:k].
+    """
+    if k <= 0:
+        return []
+    if key is None:
+        heap = Heap(max_or_min="max")
+        for x in iterable:
+            if len(heap.data) < k:
+                heap.add(x)
+            elif x < heap.data[0]:
+                heap.replace(x)
+        return sorted(heap.data)
+    heap = Heap(max_or_min="max", entries=True)
+    for i, x in enumerate(iterable):
+        priority = (key(x), i)
+        if len(heap.data) < k:
+            heap.add(x, priority)
+        elif priority < heap.keys[0]:
+            heap.replace(x, priority)
+    order = sorted(range(len(heap.data)), key=heap.keys.__getitem__)
+    return [heap.data[i] for i in order]
+
+
+def merge(
+    *iterables: Iterable[Any], key: Callable = None, reverse: bool = False
+) -> Iterator[Any]:
+    """
+    Merge.
+
+    Lazily merge sorted iterables into one sorted iterator. A heap holds the next item
+    of each iterable. After the first item is yielded it is replaced by the next item
+    from the same iterable with a single sift, or popped if that iterable is finished.
+
+    Parameters
+    ----------
+    *iterables : Iterable[Any]
+        Iterables which are each already sorted.
+    key : Callable = None
+        A function computing the value to compare each item by.
+    reverse : bool = False
+        Whether the iterables are sorted from largest to smallest.
+
+    Returns
+    -------
+    Iterator[Any]
+        Yields every item of every iterable in sorted order. Equal items come from the
+        earlier iterable first.
+    """
+    heap = Heap(max_or_min="max" if reverse else "min", entries=True)
+    sign = -1 if reverse else 1
+    for n, iterable in enumerate(iterables):
+        it = iter(iterable)
+        for x in it:
+            heap.add((x, it, sign * n), (x if key is None else key(x), sign * n))
+            break
+    while heap.data:
+        x, it, order = heap.data[0]
+        yield x
+        for x in it:
+            heap.replace((x, it, order), (x if key is None else key(x), order))
+            break
+        else:
+            heap.pop()
+
+
+def heapsort(data: list[Any], reverse: bool = False, key: Callable = None):
+    """
+    Heapsort.
+
+    Sort a list in place in O(n log n) without copying it. The list is adopted as the
+    data of a Heap and heapified, then the first node is repeatedly swapped to the end
+    of the shrinking heap and the node which replaces it sifted down. A max heap sorts
+    from smallest to largest and a min heap from largest to smallest.
+
+    Parameters
+    ----------
+    data : list[Any]
+        The list to sort.
+    reverse : bool = False
+        Sort from largest to smallest.
+    key : Callable = None
+        A function computing the value to compare each item by. It is called once per
+        item, and the results are kept in a separate list alongside each item's
+        index in another, so that equal items keep their order as with sorted().
+    """
+    heap = partial_heap(data, len(data), reverse, key)
+    keys, seqs = heap.keys, heap.seqs
+    sift_down = heap.sift_down
+    for end in range(len(data) - 1, 0, -1):
+        data[0], data[end] = data[end], data[0]
+        if keys is not None:
+            keys[0], keys[end] = keys[end], keys[0]
+            seqs[0], seqs[end] = seqs[end], seqs[0]
+        sift_down(0, end)
+
+
+def partial_sort(data: list[Any], k: int, reverse: bool = False, key: Callable = None):
+    """
+    Partial sort.
+
+    Rearrange a list in place so that its first k items are the k smallest in order,
+    in O(n log k) without copying it. The rest of the list is left in no particular
+    order. The first k items are made into a max heap, then each later item which is
+    smaller than the first node is swapped with it and sifted down. Finally the heap
+    is sorted as by heapsort.
+
+    Parameters
+    ----------
+    data : list[Any]
+        The list to rearrange.
+    k : int
+        The number of items to sort.
+    reverse : bool = False
+        Find the k largest items, from largest to smallest.
+    key : Callable = None
+        A function computing the value to compare each item by. Equal items keep their
+        order as with sorted().
+    """
+    k = max(0, min(k, len(data)))
+    if k == 0:
+        return
+    heap = partial_heap(data, k, reverse, key)
+    keys, seqs = heap.keys, heap.seqs
+    sift_down = heap.sift_down
+    for i in range(k, len(data)):
+        x = data[i]
+        if keys is None:
+            first = data[0]
+            if (x < first) if not reverse else (x > first):
+                data[0], data[i] = x, first
+                sift_down(0, k)
+        else:
+            # Later items always lose ties, so only a strictly better key gets in
+            kx = key(x)
+            first = keys[0]
+            if (kx < first) if not reverse else (kx > first):
+                data[0], data[i] = x, data[0]
+                keys[0] = kx
+                seqs[0] = -i
+                sift_down(0, k)
+    for end in range(k - 1, 0, -1):
+        data[0], data[end] = data[end], data[0]
+        if keys is not None:
+            keys[0], keys[end] = keys[end], keys[0]
+            seqs[0], seqs[end] = seqs[end], seqs[0]
+        sift_down(0, end)
+
+
+def partial_heap(data: list[Any], size: int, reverse: bool, key: Callable) -> Heap:
+    """
+    Partial heap.
+
+    Make the first size items of a list into a heap, in place, for heapsort and
+    partial_sort.
+
+    Parameters
+    ----------
+    data : list[Any]
+        The list, which is adopted as the heap's data.
+    size : int
+        The number of items at the start of the list to heapify.
+    reverse : bool
+        Build a min heap rather than a max heap.
+    key : Callable
+        The key function, or None.
+
+    Returns
+    -------
+    Heap
+        The heap. With a key function its seqs are the negated indices of the items,
+        so that the item which came first in the list is popped last of a set of
+        equal items and ends up in front of them.
+    """
+    heap = Heap(max_or_min="min" if reverse else "max", key=key)
+    heap.data = data
+    if key is not None:
+        heap.keys = [key(data[i]) for i in range(size)]
+        heap.seqs = [-i for i in range(size)]
+    for i in range((size - 2) // 2, -1, -1):
+        heap.sift_down(i, size)
+    return heap
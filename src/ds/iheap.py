@@ -0,0 +1,552 @@
+from __future__ import annotations
+from typing import Any, Iterable
+from .heap import Heap
+
+
+class IndexedHeap(Heap):
+    """
+    Indexed heap.
+
+    A priority queue whose items can have their priority changed or be removed while
+    they are in the queue. It extends the entries mode of Heap (./heap.py): items are
+    added with a priority, and priorities and sequence numbers are stored in keys and
+    seqs, parallel to the items in data. A dictionary, index, maps every item to its
+    position in data and is updated whenever an item moves.
+
+    Without the index, changing the priority of an item means adding it again and
+    skipping the stale copy when it is popped, so the heap fills up with stale copies.
+    With it, update and remove find the item in O(1) and restore heap order from its
+    position in O(log n). Items must be hashable and unique. An item keeps its
+    sequence number when its priority changes, so ties are still broken by the order
+    in which items were first added.
+
+    Example:
+
+    >>> heap = IndexedHeap(data=[(5, "a"), (3, "b"), (8, "c")])
+    >>> heap.peek()
+    'b'
+    >>> heap.update("c", 1)
+    >>> heap.priority_of("c")
+    1
+    >>> heap.remove("b")
+    >>> "b" in heap
+    False
+    >>> [heap.pop() for _ in range(len(heap))]
+    ['c', 'a']
+
+    ...
+
+    Attributes
+    ---------
+    index : dict[Any, int]
+        The position in data of every item in the heap.
+
+    Methods
+    -------
+    heapify()
+        Extends parent implementation to rebuild the index.
+    sift_up(i: int)
+        Overrides parent implementation with sift_up_indexed_max or
+        sift_up_indexed_min, which keep the index up to date.
+    sift_down(i: int, size: int)
+        Overrides parent implementation with sift_down_indexed_max or
+        sift_down_indexed_min, which keep the index up to date.
+    add(item: Any, priority: Any)
+        Insert an item with a priority. The item must not already be in the heap.
+    extend(data: Iterable[tuple])
+        Extends parent implementation to check that the items are new and unique.
+    pop() -> Any
+        Remove and return the first item of the heap.
+    pushpop(item: Any, priority: Any) -> Any
+        Extends parent implementation to keep the index up to date.
+    replace(item: Any, priority: Any) -> Any
+        Extends parent implementation to keep the index up to date.
+    remove_at(i: int) -> Any
+        Remove and return the item at data[i].
+    restore(i: int)
+        Sift the item at data[i] up or down after its key has changed.
+    update(item: Any, priority: Any)
+        Change the priority of an item in the heap.
+    decrease_key(item: Any, priority: Any)
+        Move an item towards the front of the heap by changing its priority.
+    remove(item: Any)
+        Remove an item from the heap.
+    priority_of(item: Any) -> Any
+        Return the priority of an item in the heap.
+    __contains__(item: Any) -> bool
+        Returns True if the item is in the heap.
+    __len__() -> int
+        Returns the number of items in the heap.
+    """
+
+    def __init__(self, data: list[tuple] = [], max_or_min: str = "min"):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : list[tuple] = []
+            List of (priority, item) pairs to initialise the heap with.
+        max_or_min : str = "min"
+            Initialise the heap as either a max heap or a min heap.
+
+        Raises
+        ------
+        Exception
+            If an item appears more than once.
+        """
+        super().__init__(data=data, max_or_min=max_or_min, entries=True)
+        if max_or_min == "max":
+            self.sift_up = self.sift_up_indexed_max
+            self.sift_down = self.sift_down_indexed_max
+        else:
+            self.sift_up = self.sift_up_indexed_min
+            self.sift_down = self.sift_down_indexed_min
+
+    def heapify(self):
+        """
+        Heapify.
+
+        Extends parent implementation to rebuild the index once the heap is in order,
+        rather than updating it on every move.
+
+        Raises
+        ------
+        Exception
+            If an item appears more than once.
+        """
+        super().heapify()
+        self.index = {x: i for i, x in enumerate(self.data)}
+        if len(self.index) != len(self.data):
+            raise Exception("Duplicate items not allowed in indexed heap")
+
+    def sift_up_indexed_max(self, i: int):
+        """
+        Sift up (indexed max heap).
+
+        As Heap.sift_up_keyed_max, also recording the new position of every item moved.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, seqs, data, index = self.keys, self.seqs, self.data, self.index
+        k, q, x = keys[i], seqs[i], data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k > p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            y = data[i] = data[parent]
+            index[y] = i
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+        index[x] = i
+
+    def sift_up_indexed_min(self, i: int):
+        """
+        Sift up (indexed min heap).
+
+        As Heap.sift_up_keyed_min, also recording the new position of every item moved.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, seqs, data, index = self.keys, self.seqs, self.data, self.index
+        k, q, x = keys[i], seqs[i], data[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k < p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            y = data[i] = data[parent]
+            index[y] = i
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+        index[x] = i
+
+    def sift_down_indexed_max(self, i: int, size: int):
+        """
+        Sift down (indexed max heap).
+
+        As Heap.sift_down_keyed_max, also recording the new position of every item
+        moved.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        keys, seqs, data, index = self.keys, self.seqs, self.data, self.index
+        start = i
+        k, q, x = keys[i], seqs[i], data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size:
+                a, b = keys[right], keys[child]
+                if a > b or (a == b and seqs[right] < seqs[child]):
+                    child = right
+            keys[i] = keys[child]
+            seqs[i] = seqs[child]
+            y = data[i] = data[child]
+            index[y] = i
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k > p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            y = data[i] = data[parent]
+            index[y] = i
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+        index[x] = i
+
+    def sift_down_indexed_min(self, i: int, size: int):
+        """
+        Sift down (indexed min heap).
+
+        As Heap.sift_down_keyed_min, also recording the new position of every item
+        moved.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        size : int
+            The number of nodes at the start of data which make up the heap.
+        """
+        keys, seqs, data, index = self.keys, self.seqs, self.data, self.index
+        start = i
+        k, q, x = keys[i], seqs[i], data[i]
+        child = (2 * i) + 1
+        while child < size:
+            right = child + 1
+            if right < size:
+                a, b = keys[right], keys[child]
+                if a < b or (a == b and seqs[right] < seqs[child]):
+                    child = right
+            keys[i] = keys[child]
+            seqs[i] = seqs[child]
+            y = data[i] = data[child]
+            index[y] = i
+            i = child
+            child = (2 * i) + 1
+        while i > start:
+            parent = (i - 1) >> 1
+            p = keys[parent]
+            if not (k < p or (k == p and q < seqs[parent])):
+                break
+            keys[i] = p
+            seqs[i] = seqs[parent]
+            y = data[i] = data[parent]
+            index[y] = i
+            i = parent
+        keys[i] = k
+        seqs[i] = q
+        data[i] = x
+        index[x] = i
+
+    def add(self, item: Any, priority: Any):
+        """
+        Add an item.
+
+        Insert an item with a priority and maintain heap ordering properties.
+
+        Parameters
+        ----------
+        item : Any
+            The item to be inserted. It must be hashable.
+        priority : Any
+            The priority of the item.
+
+        Raises
+        ------
+        Exception
+            If the item is already in the heap.
+        """
+        if item in self.index:
+            raise Exception("Item already in heap, use update instead", item)
+        super().add(item, priority)
+
+    def extend(self, data: Iterable[tuple]):
+        """
+        Extend.
+
+        Extends parent implementation to check that none of the items are already in
+        the heap or appear more than once, before any are inserted.
+
+        Parameters
+        ----------
+        data : Iterable[tuple]
+            (priority, item) pairs to be inserted.
+
+        Raises
+        ------
+        Exception
+            If an item is already in the heap or appears more than once.
+        """
+        data = list(data)
+        items = {x for _, x in data}
+        if len(items) != len(data) or not self.index.keys().isdisjoint(items):
+            raise Exception("Duplicate items not allowed in indexed heap")
+        super().extend(data)
+
+    def pop(self) -> Any:
+        """
+        Pop.
+
+        Remove and return the first item of the heap.
+
+        Returns
+        -------
+        Any
+            The item with the highest priority for a max heap or the lowest for a min
+            heap.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if not self.data:
+            raise Exception("Heap empty, cannot pop")
+        return self.remove_at(0)
+
+    def pushpop(self, item: Any, priority: Any) -> Any:
+        """
+        Pushpop.
+
+        Extends parent implementation to check the item is not already in the heap and
+        to remove the item popped from the index. The sift records the position of the
+        new item if it is kept.
+
+        Parameters
+        ----------
+        item : Any
+            The item to be inserted. It must be hashable.
+        priority : Any
+            The priority of the item.
+
+        Returns
+        -------
+        Any
+            The first item of the heap after the item was added.
+
+        Raises
+        ------
+        Exception
+            If the item is already in the heap.
+        """
+        if item in self.index:
+            raise Exception("Item already in heap, use update instead", item)
+        output = super().pushpop(item, priority)
+        # Not in the index if the new item was returned straight away
+        self.index.pop(output, None)
+        return output
+
+    def replace(self, item: Any, priority: Any) -> Any:
+        """
+        Replace.
+
+        Extends parent implementation to check the item is not already in the heap and
+        to remove the item popped from the index.
+
+        Parameters
+        ----------
+        item : Any
+            The item to be inserted. It must be hashable.
+        priority : Any
+            The priority of the item.
+
+        Returns
+        -------
+        Any
+            The first item of the heap before the item was added.
+
+        Raises
+        ------
+        Exception
+            If the item is already in the heap, or the heap is empty.
+        """
+        if item in self.index:
+            raise Exception("Item already in heap, use update instead", item)
+        if self.data:
+            del self.index[self.data[0]]
+        return super().replace(item, priority)
+
+    def remove_at(self, i: int) -> Any:
+        """
+        Remove at.
+
+        Remove and return the item at data[i]. The last item of the heap is moved
+        into its place and sifted up or down as needed.
+
+        Parameters
+        ----------
+        i : int
+            The position of the item to remove.
+
+        Returns
+        -------
+        Any
+            The item removed.
+        """
+        keys, seqs, data = self.keys, self.seqs, self.data
+        output = data[i]
+        del self.index[output]
+        last_key, last_seq, last = keys.pop(), seqs.pop(), data.pop()
+        if i < len(data):
+            keys[i] = last_key
+            seqs[i] = last_seq
+            data[i] = last
+            self.index[last] = i
+            self.restore(i)
+        return output
+
+    def restore(self, i: int):
+        """
+        Restore.
+
+        Sift the item at data[i] up if it now beats its parent, otherwise down.
+
+        Parameters
+        ----------
+        i : int
+            The position of the item whose key has changed.
+        """
+        if i > 0 and self.beats(i, (i - 1) >> 1):
+            self.sift_up(i)
+            return
+        self.sift_down(i, len(self.data))
+
+    def update(self, item: Any, priority: Any):
+        """
+        Update.
+
+        Change the priority of an item in the heap in O(log n).
+
+        Parameters
+        ----------
+        item : Any
+            An item in the heap.
+        priority : Any
+            The new priority of the item.
+
+        Raises
+        ------
+        KeyError
+            If the item is not in the heap.
+        """
+        i = self.index[item]
+        self.keys[i] = priority
+        self.restore(i)
+
+    def decrease_key(self, item: Any, priority: Any):
+        """
+        Decrease key.
+
+        Move an item towards the front of the heap by changing its priority: lower for
+        a min heap or higher for a max heap. This is the operation needed by
+        shortest path algorithms when a shorter path to a node is found.
+
+        Parameters
+        ----------
+        item : Any
+            An item in the heap.
+        priority : Any
+            The new priority of the item.
+
+        Raises
+        ------
+        KeyError
+            If the item is not in the heap.
+        Exception
+            If the new priority would move the item away from the front.
+        """
+        i = self.index[item]
+        old = self.keys[i]
+        if (priority < old) if self.max_or_min == "max" else (priority > old):
+            raise Exception("New priority would move item away from front", priority)
+        self.keys[i] = priority
+        self.sift_up(i)
+
+    def remove(self, item: Any):
+        """
+        Remove.
+
+        Remove an item from the heap in O(log n).
+
+        Parameters
+        ----------
+        item : Any
+            An item in the heap.
+
+        Raises
+        ------
+        KeyError
+            If the item is not in the heap.
+        """
+        self.remove_at(self.index[item])
+
+    def priority_of(self, item: Any) -> Any:
+        """
+        Priority of.
+
+        Parameters
+        ----------
+        item : Any
+            An item in the heap.
+
+        Returns
+        -------
+        Any
+            The priority of the item.
+
+        Raises
+        ------
+        KeyError
+            If the item is not in the heap.
+        """
+        return self.keys[self.index[item]]
+
+    def __contains__(self, item: Any) -> bool:
+        """
+        __contains__.
+
+        Returns
+        -------
+        bool
+            Returns True if the item is in the heap.
+        """
+        return item in self.index
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the heap.
+        """
+        return len(self.data)
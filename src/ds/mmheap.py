@@ -0,0 +1,400 @@
+from __future__ import annotations
+from typing import Any
+from .bt import BinaryTree
+
+
+class MinMaxHeap:
+    """
+    Min-max heap.
+
+    A double ended priority queue, after Atkinson et al. It uses the same implicit
+    array layout as the binary heap (./heap.py), where the children of the node at
+    index n are at (n * 2) + 1 and (n * 2) + 2, but the levels of the tree alternate
+    between min levels and max levels. The root is on a min level, its children on a
+    max level, and so on. Every node on a min level is no larger than any node below
+    it, and every node on a max level is no smaller than any node below it.
+
+    The smallest item is therefore the root, and the largest is one of its two
+    children, so both can be read in O(1). Adding or removing either one takes
+    O(log n). A pair of heaps, one max and one min, can do the same job but every item
+    is stored twice and each pop has to be cancelled out in the other heap.
+
+    Example:
+
+    >>> heap = MinMaxHeap(data=[x for x in range(10)])
+    >>> heap.peek_min(), heap.peek_max()
+    (0, 9)
+    >>> heap.pop_max()
+    9
+    >>> heap.pop_min()
+    0
+    >>> heap.display()
+                   1
+           ┌───────┴───────┐
+           8               6
+       ┌───┴───┐       ┌───┴───┐
+       3       4       5       2
+     ┌─┘
+     7
+
+    ...
+
+    Attributes
+    ---------
+    data : list[Any]
+        The contents of the heap, as a complete binary tree stored level by level.
+
+    Methods
+    -------
+    is_min_level(i: int) -> bool
+        Returns True if the node at data[i] is on a min level.
+    heapify()
+        Reorder data into a min-max heap in O(n).
+    push_up(i: int)
+        Move the node at data[i] up the tree until it is in order.
+    push_down(i: int)
+        Move the node at data[i] down the tree until it is in order.
+    add(x: Any)
+        Insert an item.
+    extend(data: list[Any])
+        Insert multiple items.
+    peek_min() -> Any
+        Return the smallest item.
+    max_index() -> int
+        Returns the index of the largest item.
+    peek_max() -> Any
+        Return the largest item.
+    pop_min() -> Any
+        Remove and return the smallest item.
+    pop_max() -> Any
+        Remove and return the largest item.
+    remove_at(i: int) -> Any
+        Remove and return the item at data[i].
+    is_heap() -> bool
+        Returns True if data is a valid min-max heap.
+    is_empty() -> bool
+        Returns True if the heap is empty.
+    display()
+        Render the heap to the console using BinaryTree's display.
+    __len__() -> int
+        Returns the number of items in the heap.
+    """
+
+    def __init__(self, data: list[Any] = []):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : list[Any] = []
+            List of items to initialise the heap with. It is copied, not modified.
+        """
+        self.data = list(data)
+        self.heapify()
+
+    def is_min_level(self, i: int) -> bool:
+        """
+        Is min level.
+
+        Parameters
+        ----------
+        i : int
+            The index of a node.
+
+        Returns
+        -------
+        bool
+            Returns True if the node at data[i] is on a min level, which are the levels
+            at an even depth.
+        """
+        return (i + 1).bit_length() & 1 == 1
+
+    def heapify(self):
+        """
+        Heapify.
+
+        Reorder data into a min-max heap by pushing down every node which has a child,
+        from the last to the root, in O(n).
+        """
+        for i in range((len(self.data) // 2) - 1, -1, -1):
+            self.push_down(i)
+
+    def push_up(self, i: int):
+        """
+        Push up.
+
+        Move the node at data[i] up the tree. If it is out of order with its parent it
+        is swapped with it first. It is then moved up through its grandparents, which
+        are all on the same kind of level.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        data = self.data
+        if i == 0:
+            return
+        parent = (i - 1) >> 1
+        is_min = self.is_min_level(i)
+        if (data[i] > data[parent]) if is_min else (data[i] < data[parent]):
+            data[i], data[parent] = data[parent], data[i]
+            i = parent
+            is_min = not is_min
+        x = data[i]
+        while i > 2:
+            grandparent = (((i - 1) >> 1) - 1) >> 1
+            g = data[grandparent]
+            if not ((x < g) if is_min else (x > g)):
+                break
+            data[i] = g
+            i = grandparent
+        data[i] = x
+
+    def push_down(self, i: int):
+        """
+        Push down.
+
+        Move the node at data[i] down the tree. At each step the best of its children
+        and grandchildren, the smallest on a min level or the largest on a max level,
+        is found. If it is a grandchild and beats the node they are swapped, and the
+        node is then swapped with the grandchild's parent if they are out of order.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        data = self.data
+        size = len(data)
+        is_min = self.is_min_level(i)
+        while True:
+            child = (2 * i) + 1
+            if child >= size:
+                return
+            # The grandchildren of i are the four nodes from (2 * child) + 1
+            best = child
+            if child + 1 < size and (
+                (data[child + 1] < data[best])
+                if is_min
+                else (data[child + 1] > data[best])
+            ):
+                best = child + 1
+            for j in range((2 * child) + 1, min((2 * child) + 5, size)):
+                if (data[j] < data[best]) if is_min else (data[j] > data[best]):
+                    best = j
+            if not ((data[best] < data[i]) if is_min else (data[best] > data[i])):
+                return
+            data[i], data[best] = data[best], data[i]
+            if best <= child + 1:
+                return
+            parent = (best - 1) >> 1
+            if (data[best] > data[parent]) if is_min else (data[best] < data[parent]):
+                data[best], data[parent] = data[parent], data[best]
+            i = best
+
+    def add(self, x: Any):
+        """
+        Add.
+
+        Insert an item in O(log n).
+
+        Parameters
+        ----------
+        x : Any
+            The item to be inserted.
+        """
+        self.data.append(x)
+        self.push_up(len(self.data) - 1)
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Insert multiple items.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be inserted.
+        """
+        for x in data:
+            self.add(x)
+
+    def peek_min(self) -> Any:
+        """
+        Peek min.
+
+        Returns
+        -------
+        Any
+            The smallest item, which is the root.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if not self.data:
+            raise Exception("Heap empty, cannot peek")
+        return self.data[0]
+
+    def max_index(self) -> int:
+        """
+        Max index.
+
+        Returns
+        -------
+        int
+            The index of the largest item: the root if it has no children, otherwise
+            the larger of its children.
+        """
+        data = self.data
+        if len(data) < 3:
+            return len(data) - 1
+        return 1 if data[1] >= data[2] else 2
+
+    def peek_max(self) -> Any:
+        """
+        Peek max.
+
+        Returns
+        -------
+        Any
+            The largest item.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if not self.data:
+            raise Exception("Heap empty, cannot peek")
+        return self.data[self.max_index()]
+
+    def remove_at(self, i: int) -> Any:
+        """
+        Remove at.
+
+        Remove and return the item at data[i], which must be the root or one of its
+        children. The last item is moved into its place and pushed down.
+
+        Parameters
+        ----------
+        i : int
+            The index of the item to remove.
+
+        Returns
+        -------
+        Any
+            The item removed.
+        """
+        data = self.data
+        last = data.pop()
+        if i == len(data):
+            return last
+        output = data[i]
+        data[i] = last
+        self.push_down(i)
+        return output
+
+    def pop_min(self) -> Any:
+        """
+        Pop min.
+
+        Remove and return the smallest item in O(log n).
+
+        Returns
+        -------
+        Any
+            The smallest item.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if not self.data:
+            raise Exception("Heap empty, cannot pop")
+        return self.remove_at(0)
+
+    def pop_max(self) -> Any:
+        """
+        Pop max.
+
+        Remove and return the largest item in O(log n).
+
+        Returns
+        -------
+        Any
+            The largest item.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if not self.data:
+            raise Exception("Heap empty, cannot pop")
+        return self.remove_at(self.max_index())
+
+    def is_heap(self) -> bool:
+        """
+        Is heap.
+
+        Returns
+        -------
+        bool
+            Returns True if every node is no larger than the nodes below it on a min
+            level, and no smaller on a max level. It is enough to compare each node
+            with its parent and grandparent.
+        """
+        data = self.data
+        for i in range(1, len(data)):
+            parent = (i - 1) >> 1
+            if self.is_min_level(parent):
+                if data[i] < data[parent]:
+                    return False
+            elif data[i] > data[parent]:
+                return False
+            if parent > 0:
+                grandparent = (parent - 1) >> 1
+                if self.is_min_level(grandparent):
+                    if data[i] < data[grandparent]:
+                        return False
+                elif data[i] > data[grandparent]:
+                    return False
+        return True
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the heap is empty.
+        """
+        return not self.data
+
+    def display(self):
+        """
+        Display.
+
+        Render the heap to the console in a readable format. The heap's data is used
+        to initialise a BinaryTree (./bt.py) and use it's display implementation (found
+        at ./util/util.py).
+        """
+        tree = BinaryTree(data=self.data)
+        tree.display()
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the heap.
+        """
+        return len(self.data)
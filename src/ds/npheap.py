@@ -0,0 +1,503 @@
+from __future__ import annotations
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class NumericHeap:
+    """
+    Numeric heap.
+
+    A binary heap of float64 keys stored in a NumPy array, with an optional int64
+    payload stored in a second array alongside them. It uses the same implicit layout
+    as the binary heap (./heap.py), where the children of the node at index n are at
+    (n * 2) + 1 and (n * 2) + 2.
+
+    Heap keeps its items as Python objects in a list and handles one item per call,
+    so every comparison goes through the interpreter. Here the keys are unboxed, and
+    building the heap, adding a batch of items and removing a large batch of items are
+    done with array operations:
+
+    - All the nodes on one level of the tree are roots of separate subtrees, so they
+      can be sifted down together. Heapify works up the tree a level at a time.
+    - push_many appends the new keys and then sifts down only the new nodes and their
+      ancestors, again a level at a time.
+    - pop_many of a large number of items finds them with a partial sort
+      (numpy.argpartition), removes them and heapifies what is left.
+
+    A max heap stores its keys negated, so that both kinds of heap share one
+    implementation.
+
+    NumPy is an optional dependency. It is only needed to create a NumericHeap.
+
+    Example:
+
+    >>> heap = NumericHeap(keys=[5.0, 1.0, 4.0], payload=[50, 10, 40])
+    >>> heap.push_many([3.0, 2.0], [30, 20])
+    >>> heap.pop()
+    (1.0, 10)
+    >>> heap.pop_many(3)
+    (array([2., 3., 4.]), array([20, 30, 40]))
+    >>> len(heap)
+    1
+
+    ...
+
+    Attributes
+    ---------
+    keys : numpy.ndarray
+        The keys of the heap, as float64. Only the first size are in use. Negated in
+        a max heap.
+    payload : numpy.ndarray
+        The int64 payload of each key at the same index of keys. None if the heap was
+        created without one.
+    size : int
+        The number of items in the heap.
+    max_or_min : str = "min"
+        Whether the heap is a max heap or a min heap.
+    sign : float
+        1.0 for a min heap and -1.0 for a max heap. Keys are multiplied by sign as
+        they go in and come out.
+
+    Methods
+    -------
+    reserve(capacity: int)
+        Grow the arrays to hold at least capacity items.
+    sift_up(i: int)
+        Move the node at keys[i] up the tree until it is in order.
+    sift_down(i: int)
+        Move the node at keys[i] down the tree until it is in order.
+    sift_down_many(nodes: numpy.ndarray)
+        Sift down a number of nodes, none of which is an ancestor of another, at once.
+    heapify_from(start: int)
+        Restore heap order after the nodes from keys[start] onwards were added.
+    heapify()
+        Reorder the keys into a heap in O(n).
+    push(key: float, value: int)
+        Insert a key, with a payload value if the heap has a payload.
+    push_many(keys: array_like, payload: array_like)
+        Insert many keys at once.
+    pop() -> Any
+        Remove and return the first key, with its payload value if there is one.
+    pop_many(k: int) -> Any
+        Remove and return the first k keys in order, with their payload values if
+        there are any.
+    peek() -> float
+        Return the first key.
+    is_heap() -> bool
+        Returns True if the keys satisfy heap ordering properties.
+    is_empty() -> bool
+        Returns True if the heap is empty.
+    __len__() -> int
+        Returns the number of items in the heap.
+    """
+
+    def __init__(
+        self,
+        keys: Any = (),
+        payload: Any = None,
+        max_or_min: str = "min",
+        initial_capacity: int = 16,
+    ):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        keys : array_like = ()
+            Keys to initialise the heap with. They are copied.
+        payload : array_like = None
+            Payload values for the keys, which are copied. If given, even if empty,
+            every item in the heap has a payload value.
+        max_or_min : str = "min"
+            Initialise the heap as either a max heap or a min heap.
+        initial_capacity : int = 16
+            Minimum size of the arrays.
+
+        Raises
+        ------
+        Exception
+            If NumPy is not installed, if max_or_min is neither "max" nor "min", or if
+            keys and payload are different lengths.
+        """
+        if np is None:
+            raise Exception("NumericHeap requires numpy")
+        if max_or_min not in ("max", "min"):
+            raise Exception("Heap must be either max or min", max_or_min)
+        self.max_or_min = max_or_min
+        self.sign = 1.0 if max_or_min == "min" else -1.0
+        keys = np.asarray(keys, dtype=np.float64).ravel()
+        self.size = len(keys)
+        capacity = max(initial_capacity, self.size, 1)
+        self.keys = np.empty(capacity, dtype=np.float64)
+        self.keys[: self.size] = keys * self.sign
+        if payload is None:
+            self.payload = None
+        else:
+            payload = np.asarray(payload, dtype=np.int64).ravel()
+            if len(payload) != self.size:
+                raise Exception("Keys and payload must be the same length")
+            self.payload = np.empty(capacity, dtype=np.int64)
+            self.payload[: self.size] = payload
+        self.heapify()
+
+    def reserve(self, capacity: int):
+        """
+        Reserve.
+
+        Grow the arrays to hold at least capacity items, at least doubling their size
+        so that repeated pushes take amortized O(1) to grow.
+
+        Parameters
+        ----------
+        capacity : int
+            The number of items the arrays must be able to hold.
+        """
+        if capacity <= len(self.keys):
+            return
+        capacity = max(capacity, 2 * len(self.keys))
+        keys = np.empty(capacity, dtype=np.float64)
+        keys[: self.size] = self.keys[: self.size]
+        self.keys = keys
+        if self.payload is not None:
+            payload = np.empty(capacity, dtype=np.int64)
+            payload[: self.size] = self.payload[: self.size]
+            self.payload = payload
+
+    def sift_up(self, i: int):
+        """
+        Sift up.
+
+        Move the node at keys[i] up the tree until its parent is no larger. Used for
+        single pushes, where a loop over a few scalars is cheaper than array
+        operations.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, payload = self.keys, self.payload
+        get = keys.item
+        k = get(i)
+        v = None if payload is None else payload[i]
+        while i > 0:
+            parent = (i - 1) >> 1
+            p = get(parent)
+            if not k < p:
+                break
+            keys[i] = p
+            if payload is not None:
+                payload[i] = payload[parent]
+            i = parent
+        keys[i] = k
+        if payload is not None:
+            payload[i] = v
+
+    def sift_down(self, i: int):
+        """
+        Sift down.
+
+        Move the node at keys[i] down the tree until its children are no smaller. Used
+        for single pops.
+
+        Parameters
+        ----------
+        i : int
+            The index of the node to move.
+        """
+        keys, payload, size = self.keys, self.payload, self.size
+        # Comparing Python floats is much faster than comparing NumPy scalars
+        get = keys.item
+        k = get(i)
+        v = None if payload is None else payload[i]
+        child = (2 * i) + 1
+        while child < size:
+            c = get(child)
+            right = child + 1
+            if right < size:
+                r = get(right)
+                if r < c:
+                    child, c = right, r
+            if not c < k:
+                break
+            keys[i] = c
+            if payload is not None:
+                payload[i] = payload[child]
+            i = child
+            child = (2 * i) + 1
+        keys[i] = k
+        if payload is not None:
+            payload[i] = v
+
+    def sift_down_many(self, nodes: np.ndarray):
+        """
+        Sift down many.
+
+        Sift down a number of nodes at once. No node may be an ancestor of another, so
+        the nodes move through separate subtrees and every step can be done with array
+        operations for all of them together.
+
+        Parameters
+        ----------
+        nodes : numpy.ndarray
+            The indices of the nodes to move.
+        """
+        keys, payload, size = self.keys, self.payload, self.size
+        while len(nodes):
+            left = (2 * nodes) + 1
+            has_child = left < size
+            nodes, left = nodes[has_child], left[has_child]
+            # Without a right child, compare the left child with itself
+            right = np.minimum(left + 1, size - 1)
+            child = np.where(keys[right] < keys[left], right, left)
+            move = keys[child] < keys[nodes]
+            nodes, child = nodes[move], child[move]
+            keys[nodes], keys[child] = keys[child], keys[nodes]
+            if payload is not None:
+                payload[nodes], payload[child] = payload[child], payload[nodes]
+            nodes = child
+
+    def heapify_from(self, start: int):
+        """
+        Heapify from.
+
+        Restore heap order when the nodes before keys[start] are already a heap and
+        the nodes from keys[start] onwards have just been added. Working up one level
+        of the tree at a time from the deepest, the new nodes on the level and the
+        ancestors of the new nodes below it are sifted down together. With start as 0
+        this is a bottom-up heapify of the whole heap in O(n).
+
+        The new nodes on each level are a contiguous range, so the nodes to sift on
+        each level are at most two ranges: the ancestors of the deeper new nodes and
+        the new nodes on the level itself.
+
+        Parameters
+        ----------
+        start : int
+            The index of the first new node.
+        """
+        size = self.size
+        if start >= size:
+            return
+        # The last node with a child
+        last_parent = (size - 2) >> 1
+        ranges = []
+        for d in range(size.bit_length() - 1, -1, -1):
+            level_start = (1 << d) - 1
+            parents = [((lo - 1) >> 1, ((hi - 2) >> 1) + 1) for lo, hi in ranges]
+            first, last = max(start, level_start), min(size, (2 * level_start) + 1)
+            if first < last:
+                parents.append((first, last))
+            # Merge ranges which overlap, so that no node is sifted twice at once
+            parents.sort()
+            ranges = []
+            for lo, hi in parents:
+                if ranges and ranges[-1][1] >= lo:
+                    ranges[-1] = (ranges[-1][0], max(ranges[-1][1], hi))
+                else:
+                    ranges.append((lo, hi))
+            nodes = [
+                np.arange(lo, min(hi, last_parent + 1), dtype=np.int64)
+                for lo, hi in ranges
+                if lo <= last_parent
+            ]
+            if nodes:
+                self.sift_down_many(
+                    nodes[0] if len(nodes) == 1 else np.concatenate(nodes)
+                )
+
+    def heapify(self):
+        """
+        Heapify.
+
+        Reorder the keys into a heap in O(n), sifting down the nodes of each level
+        together from the deepest level up.
+        """
+        self.heapify_from(0)
+
+    def push(self, key: float, value: int = 0):
+        """
+        Push.
+
+        Insert a key in O(log n).
+
+        Parameters
+        ----------
+        key : float
+            The key to be inserted.
+        value : int = 0
+            The payload value of the key, if the heap has a payload.
+        """
+        self.reserve(self.size + 1)
+        self.keys[self.size] = key * self.sign
+        if self.payload is not None:
+            self.payload[self.size] = value
+        self.size += 1
+        self.sift_up(self.size - 1)
+
+    def push_many(self, keys: Any, payload: Any = None):
+        """
+        Push many.
+
+        Insert many keys at once. They are appended to the arrays, then the new nodes
+        and their ancestors are sifted down a level at a time.
+
+        Parameters
+        ----------
+        keys : array_like
+            The keys to be inserted.
+        payload : array_like = None
+            The payload values of the keys. Required if the heap has a payload.
+
+        Raises
+        ------
+        Exception
+            If the heap has a payload and no payload, or a payload of a different
+            length, is given.
+        """
+        keys = np.asarray(keys, dtype=np.float64).ravel()
+        if self.payload is not None:
+            if payload is None or len(payload) != len(keys):
+                raise Exception("Keys and payload must be the same length")
+        start = self.size
+        self.reserve(start + len(keys))
+        self.size += len(keys)
+        self.keys[start : self.size] = keys * self.sign
+        if self.payload is not None:
+            self.payload[start : self.size] = payload
+        self.heapify_from(start)
+
+    def pop(self) -> Any:
+        """
+        Pop.
+
+        Remove and return the first key in O(log n).
+
+        Returns
+        -------
+        Any
+            The first key, as a float. If the heap has a payload, a tuple of the key
+            and its payload value.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if self.size == 0:
+            raise Exception("Heap empty, cannot pop")
+        keys, payload = self.keys, self.payload
+        key = keys[0].item() * self.sign
+        value = None if payload is None else payload[0].item()
+        self.size -= 1
+        if self.size:
+            keys[0] = keys[self.size]
+            if payload is not None:
+                payload[0] = payload[self.size]
+            self.sift_down(0)
+        return key if payload is None else (key, value)
+
+    def pop_many(self, k: int) -> Any:
+        """
+        Pop many.
+
+        Remove and return the first k keys in order. For a small k they are popped one
+        at a time in O(k log n). Otherwise numpy.argpartition finds the k keys in
+        O(n), they are sorted, and the remaining keys are packed together and
+        heapified in O(n). A single pop costs about as much as partitioning and
+        heapifying a few hundred keys, so the second way is used from k = n / 512.
+
+        Parameters
+        ----------
+        k : int
+            The number of keys to remove. If there are fewer, all of them are removed.
+
+        Returns
+        -------
+        Any
+            An array of the first k keys in order. If the heap has a payload, a tuple
+            of that and an array of their payload values.
+        """
+        size = self.size
+        k = max(0, min(k, size))
+        payload = self.payload
+        if k * 512 < size:
+            popped = [self.pop() for _ in range(k)]
+            if payload is None:
+                return np.array(popped, dtype=np.float64)
+            return (
+                np.array([key for key, _ in popped], dtype=np.float64),
+                np.array([value for _, value in popped], dtype=np.int64),
+            )
+        keys = self.keys[:size]
+        if k == size:
+            chosen = np.argsort(keys, kind="stable")
+            rest = chosen[:0]
+        else:
+            split = np.argpartition(keys, k - 1)
+            chosen, rest = split[:k], split[k:]
+            chosen = chosen[np.argsort(keys[chosen], kind="stable")]
+        out_keys = keys[chosen] * self.sign
+        out_payload = None if payload is None else payload[chosen]
+        self.size = len(rest)
+        self.keys[: self.size] = keys[rest]
+        if payload is not None:
+            payload[: self.size] = payload[rest]
+        self.heapify()
+        return out_keys if payload is None else (out_keys, out_payload)
+
+    def peek(self) -> float:
+        """
+        Peek.
+
+        Returns
+        -------
+        float
+            Return the first key without altering the heap.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if self.size == 0:
+            raise Exception("Heap empty, cannot peek")
+        return self.keys[0].item() * self.sign
+
+    def is_heap(self) -> bool:
+        """
+        Is heap.
+
+        Returns
+        -------
+        bool
+            Returns True if no node is smaller than its parent.
+        """
+        keys = self.keys[: self.size]
+        return bool(np.all(keys[(np.arange(1, self.size) - 1) >> 1] <= keys[1:]))
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the heap is empty.
+        """
+        return self.size == 0
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the heap.
+        """
+        return self.size
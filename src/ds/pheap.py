@@ -0,0 +1,323 @@
+from __future__ import annotations
+from typing import Any, Callable
+
+
+class PairingHeap:
+    """
+    Pairing heap.
+
+    A heap stored as a tree of linked nodes, where each node can have any number of
+    children. Like the array heap (./heap.py) the first item is the largest for a max
+    heap or the smallest for a min heap.
+
+    Two pairing heaps are melded by comparing their roots and making the loser the
+    first child of the winner, which takes O(1) no matter how large the heaps are.
+    Adding an item is a meld with a heap of one node. Merging two array heaps instead
+    means concatenating their arrays and heapifying again in O(n). All the work is
+    deferred to pop, which removes the root and melds its children back together in
+    two passes: first in pairs from left to right, then the pairs from right to left.
+    This takes O(log n) amortized time. Both passes are loops, so a root with a very
+    long list of children cannot exceed the recursion limit.
+
+    Example:
+
+    >>> a = PairingHeap(data=[5, 1, 9], max_or_min="min")
+    >>> b = PairingHeap(data=[4, 7], max_or_min="min")
+    >>> a.meld(b)
+    >>> len(a), len(b)
+    (5, 0)
+    >>> [a.pop() for _ in range(5)]
+    [1, 4, 5, 7, 9]
+
+    ...
+
+    Attributes
+    ---------
+    Node : class
+        A nested class representing a node of the heap.
+    max_or_min : str = "max"
+        Whether the heap is a max heap or a min heap.
+    key : Callable = None
+        A function computing the priority of each item. Without one, or a priority
+        passed to add, an item is its own priority.
+    root : Node
+        The node holding the first item of the heap.
+    size : int
+        The number of items in the heap.
+
+    Methods
+    -------
+    link(a: Node, b: Node) -> Node
+        Make the node which loses the comparison the first child of the other, and
+        return the winner.
+    add(item: Any, priority: Any = None)
+        Insert an item in O(1).
+    extend(data: list[Any])
+        Insert multiple items.
+    meld(other: PairingHeap)
+        Move all the items of another pairing heap into this one in O(1).
+    pop() -> Any
+        Remove and return the first item of the heap.
+    pop_entry() -> tuple
+        Remove and return the first item of the heap along with its priority.
+    peek() -> Any
+        Return the first item of the heap.
+    is_empty() -> bool
+        Returns True if the heap is empty.
+    __len__() -> int
+        Returns the number of items in the heap.
+    """
+
+    class Node:
+        """
+        Node.
+
+        A node of the pairing heap. The children of a node are a singly linked list,
+        starting from child and continuing through the next attribute of each child.
+        Slots are used as a heap can hold a very large number of nodes.
+
+        ...
+
+        Attributes
+        ---------
+        key : Any
+            The priority of the item.
+        item : Any
+            The item.
+        child : Node
+            The first child of the node.
+        next : Node
+            The next sibling of the node.
+        """
+
+        __slots__ = ("key", "item", "child", "next")
+
+        def __init__(self, key: Any, item: Any):
+            """
+            __init__.
+
+            Parameters
+            ----------
+            key : Any
+                The priority of the item.
+            item : Any
+                The item.
+            """
+            self.key = key
+            self.item = item
+            self.child = None
+            self.next = None
+
+    def __init__(
+        self, data: list[Any] = [], max_or_min: str = "max", key: Callable = None
+    ):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : list[Any] = []
+            List of items to initialise the heap with.
+        max_or_min : str = "max"
+            Initialise the heap as either a max heap or a min heap.
+        key : Callable = None
+            Function computing the priority of each item.
+
+        Raises
+        ------
+        Exception
+            If max_or_min is neither "max" nor "min".
+        """
+        if max_or_min not in ("max", "min"):
+            raise Exception("Heap must be either max or min", max_or_min)
+        self.max_or_min = max_or_min
+        self.key = key
+        self.root = None
+        self.size = 0
+        self.extend(data)
+
+    def link(self, a: Node, b: Node) -> Node:
+        """
+        Link.
+
+        Make the node which loses the comparison the first child of the other. Ties
+        go to a.
+
+        Parameters
+        ----------
+        a : Node
+            The root of a heap.
+        b : Node
+            The root of another heap.
+
+        Returns
+        -------
+        Node
+            The root of the combined heap.
+        """
+        if (b.key > a.key) if self.max_or_min == "max" else (b.key < a.key):
+            a, b = b, a
+        b.next = a.child
+        a.child = b
+        return a
+
+    def add(self, item: Any, priority: Any = None):
+        """
+        Add.
+
+        Insert an item in O(1) by linking it with the root.
+
+        Parameters
+        ----------
+        item : Any
+            The item to be inserted.
+        priority : Any = None
+            The priority of the item. If not given, it is computed by the key function
+            or is the item itself.
+        """
+        if priority is None:
+            priority = item if self.key is None else self.key(item)
+        node = PairingHeap.Node(priority, item)
+        self.root = node if self.root is None else self.link(self.root, node)
+        self.size += 1
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Insert multiple items.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be inserted.
+        """
+        for x in data:
+            self.add(x)
+
+    def meld(self, other: PairingHeap):
+        """
+        Meld.
+
+        Move all the items of another pairing heap into this one in O(1). The other
+        heap is left empty.
+
+        Parameters
+        ----------
+        other : PairingHeap
+            A heap of the same kind, max or min.
+
+        Raises
+        ------
+        Exception
+            If one heap is a max heap and the other a min heap.
+        """
+        if other.max_or_min != self.max_or_min:
+            raise Exception("Cannot meld a max heap with a min heap")
+        if other is self or other.root is None:
+            return
+        self.root = (
+            other.root if self.root is None else self.link(self.root, other.root)
+        )
+        self.size += other.size
+        other.root = None
+        other.size = 0
+
+    def pop_entry(self) -> tuple:
+        """
+        Pop entry.
+
+        Remove the root and meld its children in two passes: link them in pairs from
+        left to right, then link the pairs into one heap from right to left.
+
+        Returns
+        -------
+        tuple
+            The priority and the first item of the heap.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        root = self.root
+        if root is None:
+            raise Exception("Heap empty, cannot pop")
+        link = self.link
+        pairs = []
+        node = root.child
+        while node is not None:
+            a = node
+            b = a.next
+            if b is None:
+                a.next = None
+                pairs.append(a)
+                break
+            node = b.next
+            a.next = b.next = None
+            pairs.append(link(a, b))
+        new_root = pairs.pop() if pairs else None
+        while pairs:
+            new_root = link(pairs.pop(), new_root)
+        self.root = new_root
+        self.size -= 1
+        root.child = None
+        return (root.key, root.item)
+
+    def pop(self) -> Any:
+        """
+        Pop.
+
+        Remove and return the first item of the heap in O(log n) amortized time.
+
+        Returns
+        -------
+        Any
+            The first item of the heap.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        return self.pop_entry()[1]
+
+    def peek(self) -> Any:
+        """
+        Peek.
+
+        Returns
+        -------
+        Any
+            Return the first item without altering the heap.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        if self.root is None:
+            raise Exception("Heap empty, cannot peek")
+        return self.root.item
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the heap is empty.
+        """
+        return self.root is None
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the heap.
+        """
+        return self.size
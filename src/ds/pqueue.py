@@ -0,0 +1,468 @@
+from __future__ import annotations
+import asyncio
+from threading import Condition
+from typing import Any, Callable
+from .dcqueue import DynamicCircularQueue
+from .heap import Heap
+
+
+class PriorityQueue:
+    """
+    Priority queue.
+
+    A thread safe priority queue which uses a heap (./heap.py) for ordering. Any
+    number of threads can put items and get them, and a thread which gets from an
+    empty queue sleeps on a condition variable until an item is put, rather than
+    polling.
+
+    Items are added as in the heap's entries mode, with a separate priority, or as in
+    its key mode if a key function is given. Items with equal priorities come out in
+    the order they were put.
+
+    Example:
+
+    >>> from threading import Thread
+    >>> queue = PriorityQueue()
+    >>> consumer = Thread(target=lambda: print(queue.get_many(3)))
+    >>> consumer.start()
+    >>> queue.extend([("low", 5), ("high", 1), ("mid", 3)])
+    >>> consumer.join()
+    ['high', 'mid', 'low']
+
+    ...
+
+    Attributes
+    ---------
+    heap : Heap
+        The heap holding the items of the queue, guarded by condition.
+    condition : Condition
+        Guards heap and lets threads sleep until an item is put.
+
+    Methods
+    -------
+    put(item: Any, priority: Any = None)
+        Insert an item and wake one waiting thread.
+    extend(data: list[tuple])
+        Insert multiple (item, priority) pairs and wake as many waiting threads.
+    get(timeout: float = None) -> Any
+        Remove and return the first item, waiting for one if the queue is empty.
+    get_many(k: int, timeout: float = None) -> list[Any]
+        Remove and return up to k items in order, waiting for at least one.
+    is_empty() -> bool
+        Returns True if the queue is empty.
+    __len__() -> int
+        Returns the number of items in the queue.
+    """
+
+    def __init__(self, max_or_min: str = "min", key: Callable = None):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        max_or_min : str = "min"
+            Whether the item with the largest or the smallest priority comes first.
+        key : Callable = None
+            Function computing the priority of each item. If not given, a priority
+            must be given with each item.
+        """
+        self.heap = Heap(max_or_min=max_or_min, key=key, entries=key is None)
+        self.condition = Condition()
+
+    def put(self, item: Any, priority: Any = None):
+        """
+        Put.
+
+        Insert an item and wake one thread waiting to get.
+
+        Parameters
+        ----------
+        item : Any
+            Item to be inserted.
+        priority : Any = None
+            The priority of the item. Required unless the queue has a key function, in
+            which case it must not be given.
+
+        Raises
+        ------
+        Exception
+            If a priority is missing without a key function, or given with one.
+        """
+        if self.heap.key is None:
+            if priority is None:
+                raise Exception("Priority required without a key function", item)
+        elif priority is not None:
+            raise Exception("Priority given to a queue with a key function", priority)
+        with self.condition:
+            self.heap.add(item, priority)
+            self.condition.notify()
+
+    def extend(self, data: list[tuple]):
+        """
+        Extend.
+
+        Insert multiple items with Heap.extend, taking the lock once, and wake one
+        waiting thread for each.
+
+        Parameters
+        ----------
+        data : list[tuple]
+            List of (item, priority) pairs, or of items if the queue has a key
+            function.
+        """
+        with self.condition:
+            start = len(self.heap.data)
+            if self.heap.key is None:
+                self.heap.extend((priority, item) for item, priority in data)
+            else:
+                self.heap.extend(data)
+            self.condition.notify(len(self.heap.data) - start)
+
+    def get(self, timeout: float = None) -> Any:
+        """
+        Get.
+
+        Remove and return the first item, sleeping until one is put if the queue is
+        empty.
+
+        Parameters
+        ----------
+        timeout : float = None
+            The longest time to wait in seconds. Waits forever if None, and does not
+            wait at all if 0.
+
+        Returns
+        -------
+        Any
+            The item with the smallest priority, or the largest for a max queue.
+
+        Raises
+        ------
+        Exception
+            If the queue is still empty after timeout.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.heap.data, timeout):
+                raise Exception("Queue empty, timed out waiting to get", timeout)
+            return self.heap.pop()
+
+    def get_many(self, k: int, timeout: float = None) -> list[Any]:
+        """
+        Get many.
+
+        Remove and return up to k items in order, taking the lock once. Sleeps until
+        an item is put if the queue is empty, but does not wait for k items.
+
+        Parameters
+        ----------
+        k : int
+            The most items to return.
+        timeout : float = None
+            The longest time to wait for the first item in seconds. Waits forever if
+            None, and does not wait at all if 0.
+
+        Returns
+        -------
+        list[Any]
+            Between one and k items, first item first.
+
+        Raises
+        ------
+        Exception
+            If the queue is still empty after timeout.
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.heap.data, timeout):
+                raise Exception("Queue empty, timed out waiting to get", timeout)
+            pop = self.heap.pop
+            return [pop() for _ in range(min(k, len(self.heap.data)))]
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the queue was empty at the time of the call.
+        """
+        return not self.heap.data
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the queue at the time of the call.
+        """
+        return len(self.heap.data)
+
+
+class AsyncPriorityQueue:
+    """
+    Async priority queue.
+
+    The asyncio counterpart of PriorityQueue, for tasks on a single event loop. A task
+    which gets from an empty queue awaits a future, which is resolved by the next put.
+    Like asyncio.Queue it is not thread safe; put must be called from the event loop's
+    thread.
+
+    Example:
+
+    >>> async def main():
+    ...     queue = AsyncPriorityQueue()
+    ...     consumer = asyncio.create_task(queue.get_many(3))
+    ...     await asyncio.sleep(0)
+    ...     queue.extend([("low", 5), ("high", 1), ("mid", 3)])
+    ...     print(await consumer)
+    ...
+    >>> asyncio.run(main())
+    ['high', 'mid', 'low']
+
+    ...
+
+    Attributes
+    ---------
+    heap : Heap
+        The heap holding the items of the queue.
+    getters : DynamicCircularQueue
+        Futures of the tasks waiting to get, in the order they started waiting. A task
+        which times out or is cancelled removes its future with discard.
+
+    Methods
+    -------
+    put(item: Any, priority: Any = None)
+        Insert an item and wake one waiting task.
+    extend(data: list[tuple])
+        Insert multiple (item, priority) pairs and wake as many waiting tasks.
+    wake()
+        Resolve the future of the first task still waiting.
+    discard(waiter: asyncio.Future)
+        Remove the future of a task which stopped waiting from getters.
+    wait(timeout: float)
+        Wait until the queue is not empty.
+    get(timeout: float = None) -> Any
+        Remove and return the first item, waiting for one if the queue is empty.
+    get_many(k: int, timeout: float = None) -> list[Any]
+        Remove and return up to k items in order, waiting for at least one.
+    is_empty() -> bool
+        Returns True if the queue is empty.
+    __len__() -> int
+        Returns the number of items in the queue.
+    """
+
+    def __init__(self, max_or_min: str = "min", key: Callable = None):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        max_or_min : str = "min"
+            Whether the item with the largest or the smallest priority comes first.
+        key : Callable = None
+            Function computing the priority of each item. If not given, a priority
+            must be given with each item.
+        """
+        self.heap = Heap(max_or_min=max_or_min, key=key, entries=key is None)
+        self.getters = DynamicCircularQueue()
+
+    def wake(self):
+        """
+        Wake.
+
+        Resolve the future of the first task still waiting to get, discarding any
+        futures which were cancelled.
+        """
+        getters = self.getters
+        while len(getters):
+            waiter = getters.dequeue()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+    def discard(self, waiter: asyncio.Future):
+        """
+        Discard.
+
+        Remove the future of a task which timed out or was cancelled from getters,
+        along with any other futures which are done, keeping the order of the rest.
+        Like deque.remove in asyncio.Queue this is O(n) in the number of waiting
+        tasks, but without it a consumer which keeps timing out on an idle queue
+        would leave a future behind on every get.
+
+        Parameters
+        ----------
+        waiter : asyncio.Future
+            The future to remove.
+        """
+        getters = self.getters
+        for _ in range(len(getters)):
+            other = getters.dequeue()
+            if other is not waiter and not other.done():
+                getters.enqueue(other)
+
+    def put(self, item: Any, priority: Any = None):
+        """
+        Put.
+
+        Insert an item and wake one task waiting to get.
+
+        Parameters
+        ----------
+        item : Any
+            Item to be inserted.
+        priority : Any = None
+            The priority of the item. Required unless the queue has a key function, in
+            which case it must not be given.
+
+        Raises
+        ------
+        Exception
+            If a priority is missing without a key function, or given with one.
+        """
+        if self.heap.key is None:
+            if priority is None:
+                raise Exception("Priority required without a key function", item)
+        elif priority is not None:
+            raise Exception("Priority given to a queue with a key function", priority)
+        self.heap.add(item, priority)
+        self.wake()
+
+    def extend(self, data: list[tuple]):
+        """
+        Extend.
+
+        Insert multiple items with Heap.extend and wake one waiting task for each.
+
+        Parameters
+        ----------
+        data : list[tuple]
+            List of (item, priority) pairs, or of items if the queue has a key
+            function.
+        """
+        start = len(self.heap.data)
+        if self.heap.key is None:
+            self.heap.extend((priority, item) for item, priority in data)
+        else:
+            self.heap.extend(data)
+        for _ in range(len(self.heap.data) - start):
+            self.wake()
+
+    async def wait(self, timeout: float):
+        """
+        Wait.
+
+        Wait until the queue is not empty. A task woken by a put can find the item
+        already taken by a task which did not have to wait, in which case it waits
+        again.
+
+        Parameters
+        ----------
+        timeout : float
+            The longest time to wait in seconds, or None to wait forever.
+
+        Raises
+        ------
+        Exception
+            If the queue is still empty after timeout.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not self.heap.data:
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                raise Exception("Queue empty, timed out waiting to get", timeout)
+            waiter = loop.create_future()
+            self.getters.enqueue(waiter)
+            try:
+                await asyncio.wait_for(waiter, remaining)
+            except BaseException as error:
+                if not waiter.done() or waiter.cancelled():
+                    self.discard(waiter)
+                elif self.heap.data:
+                    # Stopped waiting after being woken, so pass the wake up on
+                    self.wake()
+                if isinstance(error, asyncio.TimeoutError):
+                    raise Exception(
+                        "Queue empty, timed out waiting to get", timeout
+                    ) from None
+                raise
+
+    async def get(self, timeout: float = None) -> Any:
+        """
+        Get.
+
+        Remove and return the first item, waiting until one is put if the queue is
+        empty.
+
+        Parameters
+        ----------
+        timeout : float = None
+            The longest time to wait in seconds. Waits forever if None, and does not
+            wait at all if 0.
+
+        Returns
+        -------
+        Any
+            The item with the smallest priority, or the largest for a max queue.
+
+        Raises
+        ------
+        Exception
+            If the queue is still empty after timeout.
+        """
+        await self.wait(timeout)
+        return self.heap.pop()
+
+    async def get_many(self, k: int, timeout: float = None) -> list[Any]:
+        """
+        Get many.
+
+        Remove and return up to k items in order. Waits until an item is put if the
+        queue is empty, but does not wait for k items.
+
+        Parameters
+        ----------
+        k : int
+            The most items to return.
+        timeout : float = None
+            The longest time to wait for the first item in seconds. Waits forever if
+            None, and does not wait at all if 0.
+
+        Returns
+        -------
+        list[Any]
+            Between one and k items, first item first.
+
+        Raises
+        ------
+        Exception
+            If the queue is still empty after timeout.
+        """
+        await self.wait(timeout)
+        pop = self.heap.pop
+        return [pop() for _ in range(min(k, len(self.heap.data)))]
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the queue is empty.
+        """
+        return not self.heap.data
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the queue.
+        """
+        return len(self.heap.data)
@@ -0,0 +1,256 @@
+from __future__ import annotations
+from typing import Any, Callable, Iterable
+
+
+class RadixHeap:
+    """
+    Radix heap.
+
+    A min heap for non-negative integer priorities which is only used monotonically:
+    no item is ever added with a smaller priority than the last one popped. This is the
+    case in Dijkstra's shortest path algorithm with non-negative integer edge weights,
+    where the distance of every node added is at least the distance of the node just
+    popped.
+
+    Rather than comparing priorities, items are kept in buckets by how much their
+    priority differs from last, the last priority popped. Bucket 0 holds items with a
+    priority equal to last, and bucket i holds those whose priority first differs from
+    last in bit i - 1, counting from the least significant bit, which is the bit length
+    of priority XOR last. Adding an item is O(1). To pop when bucket 0 is empty, the
+    first bucket which is not empty is emptied: last becomes the smallest priority in
+    it, and each of its items goes back into a lower bucket. An item can only move down
+    as many times as there are buckets, so a pop takes O(log C) amortized time, where C
+    is the largest priority.
+
+    Items with equal priorities are popped in no particular order.
+
+    Example:
+
+    >>> heap = RadixHeap(data=[5, 1, 9])
+    >>> heap.pop()
+    1
+    >>> heap.add("six", 6)
+    >>> heap.pop_entry()
+    (5, 5)
+    >>> heap.pop_entry()
+    (6, 'six')
+    >>> heap.add(4)
+    Traceback (most recent call last):
+    ...
+    Exception: ('Priority smaller than last popped, radix heap must be monotone', 4, 6)
+
+    ...
+
+    Attributes
+    ---------
+    key : Callable = None
+        A function computing the priority of each item. Without one, or a priority
+        passed to add, an item is its own priority.
+    buckets : list[list[tuple]]
+        The (priority, item) pairs in each bucket.
+    last : int
+        The last priority popped, or 0 if nothing has been popped yet.
+    size : int
+        The number of items in the heap.
+
+    Methods
+    -------
+    add(item: Any, priority: int = None)
+        Insert an item in O(1).
+    extend(data: Iterable[Any])
+        Insert multiple items.
+    refill()
+        Move the items with the smallest priority into bucket 0.
+    pop() -> Any
+        Remove and return an item with the smallest priority.
+    pop_entry() -> tuple
+        Remove and return an item with the smallest priority along with its priority.
+    peek() -> Any
+        Return an item with the smallest priority.
+    is_empty() -> bool
+        Returns True if the heap is empty.
+    __len__() -> int
+        Returns the number of items in the heap.
+    """
+
+    def __init__(self, data: Iterable[Any] = (), key: Callable = None):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : Iterable[Any] = ()
+            Items to initialise the heap with.
+        key : Callable = None
+            Function computing the priority of each item.
+        """
+        self.key = key
+        self.buckets = [[]]
+        self.last = 0
+        self.size = 0
+        self.extend(data)
+
+    def add(self, item: Any, priority: int = None):
+        """
+        Add.
+
+        Insert an item in O(1).
+
+        Parameters
+        ----------
+        item : Any
+            The item to be inserted.
+        priority : int = None
+            The priority of the item. If not given, it is computed by the key function
+            or is the item itself.
+
+        Raises
+        ------
+        Exception
+            If the priority is smaller than the last priority popped.
+        """
+        if priority is None:
+            priority = item if self.key is None else self.key(item)
+        if priority < self.last:
+            raise Exception(
+                "Priority smaller than last popped, radix heap must be monotone",
+                priority,
+                self.last,
+            )
+        i = (priority ^ self.last).bit_length()
+        buckets = self.buckets
+        while len(buckets) <= i:
+            buckets.append([])
+        buckets[i].append((priority, item))
+        self.size += 1
+
+    def extend(self, data: Iterable[Any]):
+        """
+        Extend.
+
+        Insert multiple items.
+
+        Parameters
+        ----------
+        data : Iterable[Any]
+            Items to be inserted.
+        """
+        for x in data:
+            self.add(x)
+
+    def refill(self):
+        """
+        Refill.
+
+        If bucket 0 is empty, empty the first bucket which is not. last becomes the
+        smallest priority in it and each of its items is put back in the bucket for
+        its priority relative to the new last, which is always a lower one.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        buckets = self.buckets
+        if buckets[0]:
+            return
+        if self.size == 0:
+            raise Exception("Heap empty, cannot pop")
+        i = 1
+        while not buckets[i]:
+            i += 1
+        bucket = buckets[i]
+        buckets[i] = []
+        last = self.last = min(entry[0] for entry in bucket)
+        for entry in bucket:
+            buckets[(entry[0] ^ last).bit_length()].append(entry)
+
+    def pop_entry(self) -> tuple:
+        """
+        Pop entry.
+
+        Remove an item with the smallest priority in O(log C) amortized time.
+
+        Returns
+        -------
+        tuple
+            The priority and the item.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        self.refill()
+        self.size -= 1
+        return self.buckets[0].pop()
+
+    def pop(self) -> Any:
+        """
+        Pop.
+
+        Remove and return an item with the smallest priority.
+
+        Returns
+        -------
+        Any
+            The item.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        return self.pop_entry()[1]
+
+    def peek(self) -> Any:
+        """
+        Peek.
+
+        If bucket 0 is empty, the smallest priority is found by searching the first
+        bucket which is not, without changing last, so that items can still be added
+        with any priority at least as large as the last one popped. refill appends the
+        items to bucket 0 in order and pop takes the last, so of the items with the
+        smallest priority the last one in the bucket is returned, the one pop removes.
+
+        Returns
+        -------
+        Any
+            An item with the smallest priority.
+
+        Raises
+        ------
+        Exception
+            If the heap is empty.
+        """
+        buckets = self.buckets
+        if buckets[0]:
+            return buckets[0][-1][1]
+        if self.size == 0:
+            raise Exception("Heap empty, cannot peek")
+        i = 1
+        while not buckets[i]:
+            i += 1
+        return min(reversed(buckets[i]), key=lambda entry: entry[0])[1]
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the heap is empty.
+        """
+        return self.size == 0
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the heap.
+        """
+        return self.size
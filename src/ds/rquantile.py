@@ -0,0 +1,336 @@
+from __future__ import annotations
+from math import floor
+from typing import Any
+from .heap import Heap
+
+
+class RunningQuantile:
+    """
+    Running quantile.
+
+    Tracks a quantile of a changing collection of numbers, such as the median of the
+    last few thousand response times, without sorting them. It uses two heaps
+    (./heap.py): a max heap, low, holding the smallest numbers up to the quantile and a
+    min heap, high, holding the rest. The quantile is read from the first item of each
+    heap in O(1), and adding a number takes O(log n) to put it in the right heap and
+    move at most one number across to keep the heaps the right size.
+
+    Removing a number, for example when it falls out of a sliding window, would mean
+    searching a heap for it. Instead it is recorded as removed and left in its heap
+    until it reaches the top, where it is popped and discarded. So that heaps full of
+    removed numbers do not slow everything down, a heap is rebuilt without them once
+    they make up more than half of it. Numbers must be hashable.
+
+    The quantile is interpolated linearly between the two nearest numbers, the same as
+    numpy.quantile's default method. For a median of an even count of numbers this is
+    the mean of the middle two.
+
+    Example:
+
+    >>> window = RunningQuantile(q=0.9)
+    >>> window.extend([x for x in range(1, 11)])
+    >>> window.quantile()
+    9.1
+    >>> for x in range(1, 6):
+    ...     window.remove(x)
+    ...
+    >>> window.quantile()
+    9.6
+
+    ...
+
+    Attributes
+    ---------
+    q : float
+        The quantile being tracked, between 0 and 1.
+    low : Heap
+        Max heap of the numbers up to and including the quantile.
+    high : Heap
+        Min heap of the numbers after the quantile.
+    low_size : int
+        The number of items in low which have not been removed.
+    high_size : int
+        The number of items in high which have not been removed.
+    low_removed : dict[Any, int]
+        The number of copies of each number which have been removed but are still in
+        low.
+    high_removed : dict[Any, int]
+        The number of copies of each number which have been removed but are still in
+        high.
+    counts : dict[Any, int]
+        The number of copies of each number in the collection.
+
+    Methods
+    -------
+    add(x: Any)
+        Add a number.
+    extend(data: list[Any])
+        Add multiple numbers.
+    remove(x: Any)
+        Remove a number which was added earlier.
+    prune(heap: Heap, removed: dict)
+        Pop numbers which have been removed from the top of a heap.
+    compact(heap: Heap, removed: dict) -> Heap
+        Returns a heap rebuilt without the numbers which have been removed.
+    rebalance()
+        Move numbers between the heaps until low holds the right count.
+    quantile() -> Any
+        Returns the quantile of the numbers.
+    __len__() -> int
+        Returns the count of numbers.
+    """
+
+    def __init__(self, q: float = 0.5):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        q : float = 0.5
+            The quantile to track, between 0 and 1.
+
+        Raises
+        ------
+        Exception
+            If q is not between 0 and 1.
+        """
+        if not 0 <= q <= 1:
+            raise Exception("Quantile must be between 0 and 1", q)
+        self.q = q
+        self.low = Heap(max_or_min="max")
+        self.high = Heap(max_or_min="min")
+        self.low_size = self.high_size = 0
+        self.low_removed = {}
+        self.high_removed = {}
+        self.counts = {}
+
+    def add(self, x: Any):
+        """
+        Add.
+
+        Add a number in O(log n).
+
+        Parameters
+        ----------
+        x : Any
+            The number to add.
+        """
+        if self.low_size and x <= self.low.peek():
+            self.low.add(x)
+            self.low_size += 1
+        else:
+            self.high.add(x)
+            self.high_size += 1
+        self.counts[x] = self.counts.get(x, 0) + 1
+        self.rebalance()
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Add multiple numbers.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of numbers to add.
+        """
+        for x in data:
+            self.add(x)
+
+    def remove(self, x: Any):
+        """
+        Remove.
+
+        Remove a number which was added earlier. It is only marked as removed in the
+        heap which holds it, and popped once it reaches the top.
+
+        Parameters
+        ----------
+        x : Any
+            The number to remove.
+
+        Raises
+        ------
+        KeyError
+            If the number is not in the collection.
+        """
+        count = self.counts[x]
+        if count == 1:
+            del self.counts[x]
+        else:
+            self.counts[x] = count - 1
+        # The top of each heap is never a removed number, so if x is no larger than
+        # the top of low a copy of it is in low
+        if self.low_size and x <= self.low.peek():
+            self.low_removed[x] = self.low_removed.get(x, 0) + 1
+            self.low_size -= 1
+            if len(self.low.data) > (2 * self.low_size) + 16:
+                self.low = self.compact(self.low, self.low_removed)
+            else:
+                self.prune(self.low, self.low_removed)
+        else:
+            self.high_removed[x] = self.high_removed.get(x, 0) + 1
+            self.high_size -= 1
+            if len(self.high.data) > (2 * self.high_size) + 16:
+                self.high = self.compact(self.high, self.high_removed)
+            else:
+                self.prune(self.high, self.high_removed)
+        self.rebalance()
+
+    def prune(self, heap: Heap, removed: dict):
+        """
+        Prune.
+
+        Pop numbers which have been removed from the top of a heap, until the top is
+        one which has not.
+
+        Parameters
+        ----------
+        heap : Heap
+            low or high.
+        removed : dict
+            The numbers removed from heap, low_removed or high_removed.
+        """
+        while heap.data and heap.data[0] in removed:
+            x = heap.pop()
+            if removed[x] == 1:
+                del removed[x]
+            else:
+                removed[x] -= 1
+
+    def compact(self, heap: Heap, removed: dict) -> Heap:
+        """
+        Compact.
+
+        Rebuild a heap without the numbers which have been removed from it, in O(n).
+
+        Parameters
+        ----------
+        heap : Heap
+            low or high.
+        removed : dict
+            The numbers removed from heap, low_removed or high_removed. It is emptied.
+
+        Returns
+        -------
+        Heap
+            A heap of the same kind holding only the numbers not removed.
+        """
+        data = []
+        for x in heap.data:
+            if x in removed:
+                if removed[x] == 1:
+                    del removed[x]
+                else:
+                    removed[x] -= 1
+            else:
+                data.append(x)
+        return Heap(data=data, max_or_min=heap.max_or_min, copy=False)
+
+    def rebalance(self):
+        """
+        Rebalance.
+
+        Move numbers between the heaps until low holds the first floor(q * (n - 1)) + 1
+        of the n numbers, so that the number at the quantile, or the one before it if
+        it falls between two, is the top of low.
+        """
+        n = self.low_size + self.high_size
+        target = floor(self.q * (n - 1)) + 1 if n else 0
+        while self.low_size > target:
+            self.high.add(self.low.pop())
+            self.low_size -= 1
+            self.high_size += 1
+            self.prune(self.low, self.low_removed)
+        while self.low_size < target:
+            self.low.add(self.high.pop())
+            self.low_size += 1
+            self.high_size -= 1
+            self.prune(self.high, self.high_removed)
+        self.prune(self.high, self.high_removed)
+
+    def quantile(self) -> Any:
+        """
+        Quantile.
+
+        Returns
+        -------
+        Any
+            The quantile of the numbers, interpolated between the top of low and the
+            top of high when it falls between them. If it does not, the top of low is
+            returned as it is, so numbers need only be comparable.
+
+        Raises
+        ------
+        Exception
+            If there are no numbers.
+        """
+        n = self.low_size + self.high_size
+        if n == 0:
+            raise Exception("No numbers, cannot find quantile")
+        position = self.q * (n - 1)
+        fraction = position - floor(position)
+        below = self.low.peek()
+        if fraction == 0 or not self.high_size:
+            return below
+        return below + (self.high.peek() - below) * fraction
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the count of numbers.
+        """
+        return self.low_size + self.high_size
+
+
+class RunningMedian(RunningQuantile):
+    """
+    Running median.
+
+    A running quantile (see RunningQuantile above) which tracks the median.
+
+    Example:
+
+    >>> window = RunningMedian()
+    >>> window.extend([5, 1, 4, 2])
+    >>> window.median()
+    3.0
+    >>> window.remove(5)
+    >>> window.median()
+    2
+
+    ...
+
+    Methods
+    -------
+    median() -> Any
+        Returns the median, the quantile for q=0.5.
+    """
+
+    def __init__(self):
+        """
+        __init__.
+        """
+        super().__init__(q=0.5)
+
+    def median(self) -> Any:
+        """
+        Median.
+
+        Returns
+        -------
+        Any
+            The median of the numbers, the mean of the two middle numbers if there is
+            an even count of them.
+
+        Raises
+        ------
+        Exception
+            If there are no numbers.
+        """
+        return self.quantile()
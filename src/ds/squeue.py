@@ -0,0 +1,270 @@
+from __future__ import annotations
+from typing import Any
+
+
+class SegmentedQueue:
+    """
+    Segmented queue.
+
+    A first in first out (FIFO) queue made of fixed size blocks linked together, in the
+    style of CPython's collections.deque.
+
+    The dynamic circular queue (./dcqueue.py) has to copy every item into a new array
+    when it grows. Although this is rare, a single enqueue on a very long queue can
+    take a long time. This implementation never copies existing items: when the last
+    block is full a new block is linked onto the end, and when the first block has
+    been emptied it is unlinked. The most recently emptied block is kept as a spare so
+    a queue which hovers around a block boundary does not allocate on every crossing.
+
+    Example:
+
+    >>> queue = SegmentedQueue(data=[x for x in range(6)], block_size=4)
+    >>> print(queue)
+    [0, 1, 2, 3, 4, 5]
+    >>> for x in range(4):
+    ...     print(queue.dequeue())
+    ...
+    0
+    1
+    2
+    3
+    >>> print(queue)
+    [4, 5]
+    >>> queue.extend([x for x in range(6, 20)])
+    >>> print(queue)
+    [4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19]
+
+    ...
+
+    Attributes
+    ---------
+    Block : class
+        A nested class representing a fixed size block of the queue.
+    block_size : int = 64
+        The number of items held by each block.
+    head_block : Block
+        The block holding the first item in the queue.
+    head : int
+        The index of the first item in the queue within head_block.
+    tail_block : Block
+        The block holding the last item in the queue.
+    tail : int
+        The index of the last item in the queue within tail_block.
+    size : int
+        The number of items in the queue.
+    spare : Block
+        The most recently unlinked block, kept to be reused by the next enqueue which
+        needs a new block.
+
+    Methods
+    -------
+    is_empty() -> bool
+        Returns True if the queue is empty.
+    enqueue(x: Any)
+        Insert an item at the end of the queue.
+    dequeue() -> Any
+        Remove and return the item at the start of the queue.
+    peek() -> Any
+        Return the item at the start of the queue.
+    extend(data: list[Any])
+        Insert multiple items at the end of the queue in order.
+    __str__() -> str
+        Returns a string representation of the queue.
+    __len__() -> int
+        Returns the number of items in the queue.
+    __iter__() -> Iterator[Any]
+        Yields all the items in the queue from the start to the end.
+    """
+
+    class Block:
+        """
+        Block.
+
+        A fixed size block of the segmented queue.
+
+        ...
+
+        Attributes
+        ---------
+        data : list[Any]
+            The items held by the block.
+        next : Block
+            The next block in the queue.
+        """
+
+        def __init__(self, size: int):
+            """
+            __init__.
+
+            Parameters
+            ----------
+            size : int
+                Number of items the block can hold.
+            """
+            self.data = [None] * size
+            self.next = None
+
+    def __init__(self, data: list[Any] = [], block_size: int = 64):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to initialise the queue with.
+        block_size : int = 64
+            Number of items held by each block.
+        """
+        if block_size < 1:
+            raise Exception("Block size must be at least 1", block_size)
+        self.block_size = block_size
+        self.head_block = self.tail_block = SegmentedQueue.Block(block_size)
+        self.head = 0
+        self.tail = -1
+        self.size = 0
+        self.spare = None
+        self.extend(data)
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the queue is empty.
+        """
+        return self.size == 0
+
+    def enqueue(self, x: Any):
+        """
+        Enqueue.
+
+        Insert an item at the end of the queue, linking a new block onto the end if
+        the last block is full.
+
+        Parameters
+        ----------
+        x : Any
+            Item to be inserted.
+        """
+        if self.tail == self.block_size - 1:
+            block = self.spare
+            if block is None:
+                block = SegmentedQueue.Block(self.block_size)
+            else:
+                self.spare = None
+            self.tail_block.next = block
+            self.tail_block = block
+            self.tail = -1
+        self.tail += 1
+        self.tail_block.data[self.tail] = x
+        self.size += 1
+
+    def dequeue(self) -> Any:
+        """
+        Dequeue.
+
+        Remove and return the item at the start of the queue, unlinking the first
+        block once it has been emptied.
+
+        Returns
+        -------
+        Any
+            Item at start of queue.
+
+        Raises
+        ------
+        Exception
+            If queue is empty.
+        """
+        if self.size == 0:
+            raise Exception("Queue empty, cannot dequeue")
+        block = self.head_block
+        output = block.data[self.head]
+        block.data[self.head] = None
+        self.head += 1
+        self.size -= 1
+        if self.size == 0:
+            # The head has caught up with the tail so the block can be reused from
+            # the start
+            self.head = 0
+            self.tail = -1
+        elif self.head == self.block_size:
+            self.head_block = block.next
+            self.head = 0
+            block.next = None
+            self.spare = block
+        return output
+
+    def peek(self) -> Any:
+        """
+        Peek.
+
+        Returns
+        -------
+        Any
+            Item at the start of the queue.
+
+        Raises
+        ------
+        Exception
+            If queue is empty.
+        """
+        if self.size == 0:
+            raise Exception("Queue empty, cannot peek")
+        return self.head_block.data[self.head]
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Insert multiple items at the end of the queue in order.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be inserted at the end of the queue in order.
+        """
+        for x in data:
+            self.enqueue(x)
+
+    def __str__(self) -> str:
+        """
+        __str__.
+
+        Returns
+        -------
+        str
+            Returns a string representation of the queue.
+        """
+        return str(list(self.__iter__()))
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the queue.
+        """
+        return self.size
+
+    def __iter__(self) -> Iterator[Any]:
+        """
+        __iter__.
+
+        Returns
+        -------
+        Iterator[Any]
+            Yields all the items in the queue from the start to the end.
+        """
+        block = self.head_block
+        i = self.head
+        for _ in range(self.size):
+            if i == self.block_size:
+                block = block.next
+                i = 0
+            yield block.data[i]
+            i += 1
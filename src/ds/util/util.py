@@ -29,9 +29,11 @@ def format_nodes(nodes, chars_width):
 def format_nodes_slideshow(nodes, chars_width):
     # print([node.inspect() if node else "NA" for node in nodes])
     return (
-        f"{n.style if n.style else ''}{str(n.key):^3}\033[0m"
-        if n
-        else " " * chars_width
+        (
+            f"{n.style if n.style else ''}{str(n.key):^3}\033[0m"
+            if n
+            else " " * chars_width
+        )
         for n in nodes
     )
 
@@ -59,7 +61,7 @@ def display(tree, is_slideshow=False):
 
     def get_levels(node, depth, width):
         if len(levels) <= depth:
-            levels.append([None for x in range(2 ** depth)])
+            levels.append([None for x in range(2**depth)])
         levels[depth][width] = node
         if node.l:
             get_levels(node.l, depth + 1, width * 2)
@@ -71,7 +73,7 @@ def display(tree, is_slideshow=False):
     for level, nodes in enumerate(levels):
         # The amount of padding is inversely proportional to level depth
         inv_row = len(levels) - (level + 1)
-        gap = 2 ** inv_row
+        gap = 2**inv_row
         # We assume that each key to be represented will be no more than
         # three chars long
         chars_width = 3
@@ -111,7 +113,7 @@ def display(tree, is_slideshow=False):
             inv_row -= 1
             if inv_row == -1:
                 inv_row = 0
-            gap = 2 ** inv_row
+            gap = 2**inv_row
             pad = " " if inv_row == 0 else " " * (((gap - 1) * chars_width) + gap)
             half_pad = pad[: len(pad) // 2]
             output += half_pad
@@ -171,6 +173,32 @@ def display(tree, is_slideshow=False):
     return output
 
 
+def display_levels(data, arity):
+    """
+    Renders an implicit tree with any number of children per node, stored in an
+    array, one level per line. The children of each node on the level above are
+    grouped in brackets. Used for heaps with an arity other than 2.
+
+    Example:
+    9
+    8 2 3 4
+    [5 6 7 1] [0]
+    """
+    lines = []
+    start, width, depth = 0, 1, 0
+    while start < len(data):
+        level = [str(x) for x in data[start : start + width]]
+        if depth < 2:
+            lines.append(" ".join(level))
+        else:
+            groups = [level[i : i + arity] for i in range(0, len(level), arity)]
+            lines.append(" ".join(f"[{' '.join(g)}]" for g in groups))
+        start += width
+        width *= arity
+        depth += 1
+    return "\n".join(lines)
+
+
 def inspect(tree):
     return format_inspection([inspect_node(node) for node in tree.flatten()])
 
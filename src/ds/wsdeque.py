@@ -0,0 +1,244 @@
+from __future__ import annotations
+from threading import Lock
+from typing import Any
+
+
+class WorkStealingDeque:
+    """
+    Work-stealing deque.
+
+    A double ended queue for a work-stealing scheduler, after Chase and Lev. A single
+    owner thread pushes and pops items at the bottom (last in first out, so recently
+    created work stays together), while any number of thief threads steal items from
+    the top (first in first out, so they take the oldest and usually largest work).
+
+    Like the dynamic circular queue (./dcqueue.py) the items are stored in a ring which
+    grows when full. Instead of head and tail indices which wrap around, top and bottom
+    only ever increase and are mapped onto the ring with a mask, which is why the size
+    of the ring is always a power of two. This lets the owner and the thieves each move
+    their own index without agreeing on a shared one.
+
+    The owner does not take the lock to push, or to pop while there are at least two
+    items in the deque. Thieves always take the lock, so at most one steal happens at
+    a time. Only when the owner pops the last item, and might be racing a thief for
+    it, or grows the ring, does it take the lock. This relies on single attribute and
+    list item reads and writes being atomic and sequentially consistent, which the
+    global interpreter lock guarantees.
+
+    Example:
+
+    >>> deque = WorkStealingDeque()
+    >>> deque.extend([x for x in range(6)])
+    >>> print(deque)
+    [0, 1, 2, 3, 4, 5]
+    >>> deque.pop()
+    5
+    >>> deque.steal()
+    0
+    >>> print(deque)
+    [1, 2, 3, 4]
+
+    ...
+
+    Attributes
+    ---------
+    data : list[Any]
+        The ring holding the items of the deque.
+    mask : int
+        One less than the size of the ring, used to map top and bottom onto it.
+    top : int
+        The index of the item which will be stolen next. Only written by thieves, or
+        by the owner while holding the lock.
+    bottom : int
+        One more than the index of the item which will be popped next. Only written by
+        the owner.
+    lock : Lock
+        Serialises thieves, and the owner when it pops the last item or grows.
+
+    Methods
+    -------
+    is_empty() -> bool
+        Returns True if the deque appeared empty at the time of the call.
+    grow()
+        Double the size of the ring. Called by the owner while holding the lock.
+    push(x: Any)
+        Insert an item at the bottom of the deque. Owner only.
+    pop() -> Any
+        Remove and return the item at the bottom of the deque. Owner only.
+    steal() -> Any
+        Remove and return the item at the top of the deque. Any thread.
+    extend(data: list[Any])
+        Push multiple items in order. Owner only.
+    __len__() -> int
+        Returns the number of items in the deque at the time of the call.
+    __str__() -> str
+        Returns a string representation of the deque from top to bottom.
+    """
+
+    def __init__(self, initial_capacity: int = 32):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        initial_capacity : int = 32
+            Minimum size of the ring. It is rounded up to a power of two.
+        """
+        size = 1
+        while size < initial_capacity:
+            size *= 2
+        self.data = [None] * size
+        self.mask = size - 1
+        self.top = self.bottom = 0
+        self.lock = Lock()
+
+    def is_empty(self) -> bool:
+        """
+        Is empty.
+
+        Returns
+        -------
+        bool
+            Returns True if the deque appeared empty at the time of the call. Other
+            threads may change this straight away.
+        """
+        return self.bottom <= self.top
+
+    def grow(self):
+        """
+        Grow.
+
+        Double the size of the ring, copying the items between top and bottom to the
+        same indices in the new ring. Must be called by the owner while holding the
+        lock so that no thief reads the ring while it is replaced.
+        """
+        old, old_mask = self.data, self.mask
+        size = (old_mask + 1) * 2
+        data = [None] * size
+        mask = size - 1
+        for i in range(self.top, self.bottom):
+            data[i & mask] = old[i & old_mask]
+        self.data, self.mask = data, mask
+
+    def push(self, x: Any):
+        """
+        Push.
+
+        Insert an item at the bottom of the deque. Must only be called by the owner.
+        The lock is only taken if the ring has to grow.
+
+        Parameters
+        ----------
+        x : Any
+            Item to be inserted.
+        """
+        b = self.bottom
+        if b - self.top > self.mask:
+            with self.lock:
+                self.grow()
+        self.data[b & self.mask] = x
+        # Publish the item only after it has been written
+        self.bottom = b + 1
+
+    def pop(self) -> Any:
+        """
+        Pop.
+
+        Remove and return the item at the bottom of the deque. Must only be called by
+        the owner. The lock is only taken when the deque holds one item or none.
+
+        Returns
+        -------
+        Any
+            The most recently pushed item.
+
+        Raises
+        ------
+        Exception
+            If the deque is empty.
+        """
+        b = self.bottom - 1
+        # Claim the bottom item before looking at top. A thief which has not yet
+        # seen the new bottom can only be taking an item at or above top.
+        self.bottom = b
+        t = self.top
+        if t < b:
+            data, i = self.data, b & self.mask
+            output = data[i]
+            data[i] = None
+            return output
+        with self.lock:
+            t = self.top
+            if t == b:
+                # The last item, which no thief took first
+                data, i = self.data, b & self.mask
+                output = data[i]
+                data[i] = None
+                self.top = self.bottom = b + 1
+                return output
+            self.bottom = t
+        raise Exception("Deque empty, cannot pop")
+
+    def steal(self) -> Any:
+        """
+        Steal.
+
+        Remove and return the item at the top of the deque. Can be called by any
+        thread.
+
+        Returns
+        -------
+        Any
+            The least recently pushed item.
+
+        Raises
+        ------
+        Exception
+            If the deque is empty.
+        """
+        with self.lock:
+            t = self.top
+            if t < self.bottom:
+                data, i = self.data, t & self.mask
+                output = data[i]
+                data[i] = None
+                self.top = t + 1
+                return output
+        raise Exception("Deque empty, cannot steal")
+
+    def extend(self, data: list[Any]):
+        """
+        Extend.
+
+        Push multiple items in order. Must only be called by the owner.
+
+        Parameters
+        ----------
+        data : list[Any]
+            List of items to be pushed.
+        """
+        for x in data:
+            self.push(x)
+
+    def __len__(self) -> int:
+        """
+        __len__.
+
+        Returns
+        -------
+        int
+            Returns the number of items in the deque at the time of the call.
+        """
+        return max(self.bottom - self.top, 0)
+
+    def __str__(self) -> str:
+        """
+        __str__.
+
+        Returns
+        -------
+        str
+            Returns a string representation of the deque from top to bottom. Only
+            consistent if no other thread is using the deque.
+        """
+        return str([self.data[i & self.mask] for i in range(self.top, self.bottom)])
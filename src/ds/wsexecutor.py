@@ -0,0 +1,312 @@
+from __future__ import annotations
+from concurrent.futures import Future, wait
+from random import randrange
+from threading import Condition, Thread, local
+from typing import Any, Callable
+from .dcqueue import DynamicCircularQueue
+from .wsdeque import WorkStealingDeque
+
+
+class WorkStealingExecutor:
+    """
+    Work-stealing executor.
+
+    A thread pool where each worker owns a work-stealing deque (./wsdeque.py). Tasks
+    submitted by a worker are pushed onto its own deque and popped again last in first
+    out, so a task's subtasks run on the same thread while their data is still warm.
+    A worker with nothing left to do steals the oldest task from another worker's
+    deque. Tasks submitted from outside the pool go into a shared queue.
+
+    This suits fork-join workloads, where a task submits subtasks and then waits for
+    their results with join(). A worker which joins keeps running other tasks until
+    the result it needs is ready, rather than blocking its thread.
+
+    Example:
+
+    >>> def fib(executor, n):
+    ...     if n < 2:
+    ...         return n
+    ...     a = executor.submit(fib, executor, n - 1)
+    ...     b = executor.submit(fib, executor, n - 2)
+    ...     return executor.join(a) + executor.join(b)
+    ...
+    >>> with WorkStealingExecutor(workers=4) as executor:
+    ...     print(executor.join(executor.submit(fib, executor, 15)))
+    ...
+    610
+
+    ...
+
+    Attributes
+    ---------
+    deques : list[WorkStealingDeque]
+        The deque owned by each worker.
+    injector : DynamicCircularQueue
+        Tasks submitted from outside the pool, guarded by condition.
+    condition : Condition
+        Guards injector and lets idle workers sleep until work is submitted.
+    idle : int
+        The number of workers waiting on condition.
+    threads : list[Thread]
+        The worker threads.
+    running : bool
+        False once shutdown has been called, after which only workers can submit.
+    cancelling : bool
+        True once shutdown has been called without waiting, after which tasks which
+        have not started are cancelled rather than run.
+    local : local
+        Thread local storage holding the index of the worker on the current thread.
+
+    Methods
+    -------
+    submit(fn: Callable, *args, **kwargs) -> Future
+        Schedule fn(*args, **kwargs) to run and return a future for its result.
+    join(future: Future) -> Any
+        Wait for the result of a future, running other tasks while waiting if called
+        from a worker.
+    find_task(index: int) -> tuple
+        Find a task for a worker from its own deque, the shared queue or another
+        worker's deque.
+    run_task(task: tuple)
+        Run a task and set the result or exception on its future.
+    work(index: int)
+        The loop run by each worker thread.
+    shutdown(wait: bool)
+        Stop the workers once they have run every task submitted, or cancel the tasks
+        which have not started.
+    """
+
+    def __init__(self, workers: int = 4):
+        """
+        __init__.
+
+        Parameters
+        ----------
+        workers : int = 4
+            Number of worker threads.
+        """
+        if workers < 1:
+            raise Exception("Executor needs at least one worker", workers)
+        self.deques = [WorkStealingDeque() for _ in range(workers)]
+        self.injector = DynamicCircularQueue()
+        self.condition = Condition()
+        self.idle = 0
+        self.running = True
+        self.cancelling = False
+        self.local = local()
+        self.threads = [
+            Thread(target=self.work, args=(i,), daemon=True) for i in range(workers)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """
+        Submit.
+
+        Schedule fn(*args, **kwargs) to run. From a worker the task is pushed onto the
+        worker's own deque without taking a lock, unless another worker is asleep and
+        needs waking. From any other thread it goes into the shared queue. Workers can
+        still submit after shutdown, so that the tasks being finished can fork.
+
+        Parameters
+        ----------
+        fn : Callable
+            Function to be run.
+
+        Returns
+        -------
+        Future
+            A future for the result of the call.
+
+        Raises
+        ------
+        Exception
+            If the executor has been shut down and this is not a worker.
+        """
+        future = Future()
+        task = (future, fn, args, kwargs)
+        index = getattr(self.local, "index", None)
+        if index is not None:
+            self.deques[index].push(task)
+            # Reading idle without the lock can miss a worker just going to sleep,
+            # which then only sleeps until its timeout
+            if self.idle:
+                with self.condition:
+                    self.condition.notify()
+        else:
+            with self.condition:
+                if not self.running:
+                    raise Exception("Executor shut down, cannot submit")
+                self.injector.enqueue(task)
+                self.condition.notify()
+        return future
+
+    def find_task(self, index: int) -> tuple:
+        """
+        Find task.
+
+        Parameters
+        ----------
+        index : int
+            Index of the worker looking for a task.
+
+        Returns
+        -------
+        tuple
+            A task from the worker's own deque, then the shared queue, then another
+            worker's deque starting from a random one. None if there are no tasks.
+        """
+        deque = self.deques[index]
+        if not deque.is_empty():
+            try:
+                return deque.pop()
+            except Exception:
+                pass
+        if len(self.injector):
+            with self.condition:
+                if len(self.injector):
+                    return self.injector.dequeue()
+        workers = len(self.deques)
+        start = randrange(workers)
+        for i in range(workers):
+            victim = self.deques[(start + i) % workers]
+            if victim is not deque and not victim.is_empty():
+                try:
+                    return victim.steal()
+                except Exception:
+                    pass
+        return None
+
+    def run_task(self, task: tuple):
+        """
+        Run task.
+
+        Run a task and set the result or exception on its future. Once the executor
+        is cancelling, the future is cancelled instead.
+
+        Parameters
+        ----------
+        task : tuple
+            The future, function, positional and keyword arguments of the task.
+        """
+        future, fn, args, kwargs = task
+        if self.cancelling:
+            future.cancel()
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    def work(self, index: int):
+        """
+        Work.
+
+        The loop run by each worker thread. Runs tasks, sleeping on condition while
+        there are none, until the executor is shut down and no tasks are left. Other
+        workers may still be running tasks, but any subtasks these submit go onto
+        their own deques.
+
+        Parameters
+        ----------
+        index : int
+            Index of the worker and its deque.
+        """
+        self.local.index = index
+        while True:
+            task = self.find_task(index)
+            if task is not None:
+                self.run_task(task)
+                continue
+            with self.condition:
+                if not len(self.injector):
+                    if not self.running:
+                        return
+                    self.idle += 1
+                    self.condition.wait(0.01)
+                    self.idle -= 1
+
+    def join(self, future: Future) -> Any:
+        """
+        Join.
+
+        Wait for the result of a future. From a worker, other tasks are run while
+        waiting so that the worker's thread is never blocked.
+
+        Parameters
+        ----------
+        future : Future
+            Future returned by submit.
+
+        Returns
+        -------
+        Any
+            The result of the task.
+
+        Raises
+        ------
+        Exception
+            Any exception raised by the task.
+        """
+        index = getattr(self.local, "index", None)
+        if index is not None:
+            while not future.done():
+                task = self.find_task(index)
+                if task is not None:
+                    self.run_task(task)
+                else:
+                    wait((future,), 0.001)
+        return future.result()
+
+    def shutdown(self, wait: bool = True):
+        """
+        Shutdown.
+
+        Stop accepting tasks from outside the pool. If waiting, the workers run every
+        task already submitted, and any subtasks these submit, before exiting, as with
+        concurrent.futures. Otherwise the tasks which have not started are cancelled,
+        so that their futures are still done, and the workers exit once they finish
+        their current task.
+
+        Parameters
+        ----------
+        wait : bool = True
+            Run the remaining tasks and wait for the worker threads to exit.
+        """
+        with self.condition:
+            self.running = False
+            self.cancelling = not wait
+            if not wait:
+                while len(self.injector):
+                    future = self.injector.dequeue()[0]
+                    # Cancelling alone does not wake threads in wait()
+                    future.cancel()
+                    future.set_running_or_notify_cancel()
+            self.condition.notify_all()
+        if wait:
+            for thread in self.threads:
+                thread.join()
+
+    def __enter__(self) -> WorkStealingExecutor:
+        """
+        __enter__.
+
+        Returns
+        -------
+        WorkStealingExecutor
+            Self
+        """
+        return self
+
+    def __exit__(self, *exc):
+        """
+        __exit__.
+
+        Shut down the executor, waiting for the workers to run every task submitted
+        and exit.
+        """
+        self.shutdown()
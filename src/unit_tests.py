@@ -1,5 +1,9 @@
+import asyncio
 import random
+import threading
+import time
 import unittest
+from concurrent.futures import wait
 
 from test_expectations import expectations
 import ds
@@ -7,10 +11,22 @@ from ds.stack import Stack
 from ds.queue import Queue
 from ds.cqueue import CircularQueue
 from ds.dcqueue import DynamicCircularQueue
+from ds.squeue import SegmentedQueue
+from ds.wsdeque import WorkStealingDeque
+from ds.wsexecutor import WorkStealingExecutor
 from ds.bt import BinaryTree
 from ds.bst import BinarySearchTree
 from ds.avl import AVLTree
-from ds.heap import Heap
+from ds.heap import Heap, nlargest, nsmallest, merge, heapsort, partial_sort
+from ds.iheap import IndexedHeap
+from ds.pheap import PairingHeap
+from ds.mmheap import MinMaxHeap
+from ds import npheap
+from ds.npheap import NumericHeap
+from ds.pqueue import PriorityQueue, AsyncPriorityQueue
+from ds.rquantile import RunningQuantile, RunningMedian
+from ds.rheap import RadixHeap
+from ds.abt import ArrayBinaryTree
 
 
 class TestStack(unittest.TestCase):
@@ -159,6 +175,335 @@ class TestDCQueue(unittest.TestCase):
             for z in range(90):
                 dcqueue.dequeue()
 
+    def test_growth_factor(self):
+        dcqueue = DynamicCircularQueue(initial_capacity=4, growth_factor=1.5)
+        dcqueue.extend([0, 1, 2, 3])
+        self.assertEqual(dcqueue.max_size, 4)
+        dcqueue.enqueue(4)
+        self.assertEqual(dcqueue.max_size, 6)
+        self.assertEqual(dcqueue.data, [0, 1, 2, 3, 4, None])
+        with self.assertRaises(Exception):
+            DynamicCircularQueue(growth_factor=1)
+        with self.assertRaises(Exception):
+            DynamicCircularQueue(growth_factor=2, shrink_threshold=0.5)
+
+    def test_reserve(self):
+        dcqueue = DynamicCircularQueue(data=[0, 1, 2])
+        dcqueue.reserve(20)
+        self.assertEqual(dcqueue.max_size, 32)
+        self.assertEqual(list(dcqueue), [0, 1, 2])
+        dcqueue.extend([x for x in range(3, 40)])
+        self.assertEqual(dcqueue.max_size, 64)
+        self.assertEqual(list(dcqueue), [x for x in range(40)])
+
+    def test_shrink_hysteresis(self):
+        dcqueue = DynamicCircularQueue(data=[x for x in range(16)])
+        self.assertEqual(dcqueue.max_size, 16)
+        for _ in range(12):
+            dcqueue.dequeue()
+        self.assertEqual(dcqueue.max_size, 16)
+        dcqueue.dequeue()
+        self.assertEqual(dcqueue.max_size, 8)
+        self.assertEqual(dcqueue.data, [13, 14, 15, None, None, None, None, None])
+        # Oscillating around the capacity does not reallocate
+        data = dcqueue.data
+        for x in range(20):
+            dcqueue.extend([0, 1, 2, 3, 4])
+            for _ in range(5):
+                dcqueue.dequeue()
+        self.assertIs(dcqueue.data, data)
+
+    def test_shrink_leaves_free_slot(self):
+        # Rounding the shrunk size down used to fill the array, so the next enqueue
+        # grew it straight back
+        dcqueue = DynamicCircularQueue(
+            initial_capacity=1, growth_factor=1.5, shrink_threshold=0.65
+        )
+        dcqueue.extend(range(2))
+        dcqueue.dequeue()
+        self.assertEqual((dcqueue.max_size, len(dcqueue)), (2, 1))
+        for initial_capacity in range(1, 5):
+            for growth_factor in (1.25, 1.5, 2, 3):
+                for shrink_threshold in (0.1, 0.3, 0.5, 0.6, 0.65, 0.79):
+                    if shrink_threshold * growth_factor >= 1:
+                        continue
+                    dcqueue = DynamicCircularQueue(
+                        initial_capacity=initial_capacity,
+                        growth_factor=growth_factor,
+                        shrink_threshold=shrink_threshold,
+                    )
+                    dcqueue.extend(range(20))
+                    while dcqueue:
+                        max_size = dcqueue.max_size
+                        dcqueue.dequeue()
+                        if dcqueue.max_size < max_size:
+                            self.assertLess(len(dcqueue), dcqueue.max_size)
+
+    def test_shrink_to_fit(self):
+        dcqueue = DynamicCircularQueue(data=[x for x in range(10)])
+        for _ in range(4):
+            dcqueue.dequeue()
+        dcqueue.shrink_to_fit()
+        self.assertEqual(dcqueue.data, [4, 5, 6, 7, 8, 9])
+        dcqueue.enqueue(10)
+        self.assertEqual(list(dcqueue), [4, 5, 6, 7, 8, 9, 10])
+
+    def test_incremental_resize(self):
+        dcqueue = DynamicCircularQueue(
+            data=[x for x in range(8)], resize_mode="incremental"
+        )
+        dcqueue.enqueue(8)
+        # The old array is kept and the last two items have been migrated
+        self.assertEqual(dcqueue.old_data, [0, 1, 2, 3, 4, 5, None, None])
+        self.assertEqual(dcqueue.data[0], 8)
+        self.assertEqual(dcqueue.data[14:], [6, 7])
+        self.assertEqual(dcqueue.migrate_step, 2)
+        self.assertEqual(list(dcqueue), [x for x in range(9)])
+        self.assertEqual(dcqueue.peek(), 0)
+        self.assertEqual(dcqueue.dequeue(), 0)
+        self.assertEqual(dcqueue.old_count, 3)
+        dcqueue.enqueue(9)
+        dcqueue.enqueue(10)
+        self.assertIsNone(dcqueue.old_data)
+        self.assertEqual(len(dcqueue), 10)
+        self.assertEqual(list(dcqueue), [x for x in range(1, 11)])
+        with self.assertRaises(Exception):
+            DynamicCircularQueue(resize_mode="lazy")
+
+    def test_incremental_shrink(self):
+        # Rounding the shrunk size down left no free slot, and start_migration
+        # divided by zero
+        dcqueue = DynamicCircularQueue(
+            initial_capacity=2,
+            growth_factor=1.5,
+            shrink_threshold=0.6,
+            resize_mode="incremental",
+        )
+        dcqueue.extend(range(4))
+        for x in range(4):
+            self.assertEqual(dcqueue.dequeue(), x)
+        self.assertEqual(len(dcqueue), 0)
+        for initial_capacity in range(1, 5):
+            for growth_factor in (1.25, 1.5, 2, 3):
+                for shrink_threshold in (0.1, 0.3, 0.5, 0.6, 0.65, 0.79):
+                    if shrink_threshold * growth_factor >= 1:
+                        continue
+                    dcqueue = DynamicCircularQueue(
+                        initial_capacity=initial_capacity,
+                        growth_factor=growth_factor,
+                        shrink_threshold=shrink_threshold,
+                        resize_mode="incremental",
+                    )
+                    dcqueue.extend(range(20))
+                    for x in range(20):
+                        self.assertEqual(dcqueue.dequeue(), x)
+                    dcqueue.extend(range(5))
+                    self.assertEqual(list(dcqueue), [0, 1, 2, 3, 4])
+        with self.assertRaises(Exception):
+            DynamicCircularQueue(data=[0, 1, 2]).start_migration(3)
+
+    def test_double_ended(self):
+        dcqueue = DynamicCircularQueue(data=[2, 3])
+        dcqueue.enqueue_front(1)
+        dcqueue.enqueue_front(0)
+        self.assertEqual(dcqueue.data, [2, 3, None, None, None, None, 0, 1])
+        self.assertEqual(list(dcqueue), [0, 1, 2, 3])
+        self.assertEqual(dcqueue.peek_back(), 3)
+        self.assertEqual(dcqueue.dequeue_back(), 3)
+        self.assertEqual(dcqueue.dequeue_back(), 2)
+        self.assertEqual(dcqueue.dequeue_back(), 1)
+        self.assertEqual(dcqueue.dequeue_back(), 0)
+        self.assertTrue(dcqueue.is_empty())
+        with self.assertRaises(Exception):
+            dcqueue.dequeue_back()
+        with self.assertRaises(Exception):
+            dcqueue.peek_back()
+        dcqueue.extend_front([x for x in range(10)])
+        self.assertEqual(list(dcqueue), [x for x in range(9, -1, -1)])
+
+    def test_rotate(self):
+        dcqueue = DynamicCircularQueue(data=[x for x in range(6)])
+        dcqueue.rotate(2)
+        self.assertEqual(list(dcqueue), [4, 5, 0, 1, 2, 3])
+        self.assertEqual(dcqueue.data, [0, 1, 2, 3, None, None, 4, 5])
+        dcqueue.rotate(-3)
+        self.assertEqual(list(dcqueue), [1, 2, 3, 4, 5, 0])
+        dcqueue.rotate(5)
+        self.assertEqual(list(dcqueue), [2, 3, 4, 5, 0, 1])
+        dcqueue.extend([6, 7])
+        data = dcqueue.data[:]
+        dcqueue.rotate(3)
+        # A full array only moves head and tail
+        self.assertEqual(dcqueue.data, data)
+        self.assertEqual(list(dcqueue), [1, 6, 7, 2, 3, 4, 5, 0])
+
+    def test_double_ended_stress(self):
+        for mode in ("copy", "incremental"):
+            dcqueue = DynamicCircularQueue(resize_mode=mode)
+            contents = []
+            for x in range(300):
+                op = random.randint(0, 5)
+                if op == 0:
+                    dcqueue.enqueue(x)
+                    contents.append(x)
+                if op == 1:
+                    dcqueue.extend_front([x, x + 1, x + 2])
+                    contents = [x + 2, x + 1, x] + contents
+                if op == 2 and contents:
+                    self.assertEqual(dcqueue.dequeue_back(), contents.pop())
+                if op == 3 and contents:
+                    self.assertEqual(dcqueue.dequeue(), contents.pop(0))
+                if op == 4 and contents:
+                    k = random.randint(-len(contents), len(contents))
+                    dcqueue.rotate(k)
+                    k %= len(contents)
+                    contents = (
+                        contents[len(contents) - k :] + contents[: len(contents) - k]
+                    )
+                if op == 5:
+                    dcqueue.enqueue_front(x)
+                    contents.insert(0, x)
+                self.assertEqual(list(dcqueue), contents)
+
+    def test_incremental_stress(self):
+        dcqueue = DynamicCircularQueue(resize_mode="incremental")
+        contents = []
+        for x in range(20):
+            for y in range(random.randint(0, 200)):
+                dcqueue.enqueue(y)
+                contents.append(y)
+            for z in range(random.randint(0, len(contents))):
+                self.assertEqual(dcqueue.dequeue(), contents.pop(0))
+            self.assertEqual(list(dcqueue), contents)
+            self.assertEqual(len(dcqueue), len(contents))
+
+
+class TestSQueue(unittest.TestCase):
+    def test_empty(self):
+        squeue = SegmentedQueue()
+        self.assertTrue(squeue.is_empty())
+        squeue.enqueue(0)
+        self.assertFalse(squeue.is_empty())
+        squeue.dequeue()
+        self.assertTrue(squeue.is_empty())
+        with self.assertRaises(Exception):
+            squeue.dequeue()
+        with self.assertRaises(Exception):
+            squeue.peek()
+
+    def test_blocks(self):
+        squeue = SegmentedQueue(data=[x for x in range(10)], block_size=4)
+        self.assertEqual(list(squeue), [x for x in range(10)])
+        self.assertEqual(squeue.head_block.data, [0, 1, 2, 3])
+        self.assertEqual(squeue.tail_block.data, [8, 9, None, None])
+        block = squeue.head_block
+        for x in range(4):
+            self.assertEqual(squeue.dequeue(), x)
+        self.assertIsNot(squeue.head_block, block)
+        self.assertIs(squeue.spare, block)
+        squeue.extend([10, 11, 12])
+        self.assertIs(squeue.tail_block, block)
+        self.assertIsNone(squeue.spare)
+        self.assertEqual(squeue.peek(), 4)
+        self.assertEqual(len(squeue), 9)
+        self.assertEqual(str(squeue), str([x for x in range(4, 13)]))
+
+    def test_stress(self):
+        squeue = SegmentedQueue(block_size=8)
+        contents = []
+        for x in range(20):
+            for y in range(random.randint(0, 90)):
+                squeue.enqueue(y)
+                contents.append(y)
+            for z in range(random.randint(0, len(contents))):
+                self.assertEqual(squeue.dequeue(), contents.pop(0))
+            self.assertEqual(list(squeue), contents)
+            self.assertEqual(len(squeue), len(contents))
+
+
+class TestWSDeque(unittest.TestCase):
+    def test_ends(self):
+        deque = WorkStealingDeque(initial_capacity=3)
+        self.assertEqual(len(deque.data), 4)
+        deque.extend([x for x in range(6)])
+        self.assertEqual(len(deque.data), 8)
+        self.assertEqual(str(deque), str([x for x in range(6)]))
+        self.assertEqual(deque.pop(), 5)
+        self.assertEqual(deque.steal(), 0)
+        self.assertEqual(deque.steal(), 1)
+        self.assertEqual(deque.pop(), 4)
+        self.assertEqual(len(deque), 2)
+        self.assertEqual(deque.pop(), 3)
+        self.assertEqual(deque.pop(), 2)
+        self.assertTrue(deque.is_empty())
+        with self.assertRaises(Exception):
+            deque.pop()
+        with self.assertRaises(Exception):
+            deque.steal()
+        deque.push(6)
+        self.assertEqual(deque.steal(), 6)
+
+    def test_concurrent_steal(self):
+        deque = WorkStealingDeque(initial_capacity=2)
+        stolen = []
+        popped = []
+        done = threading.Event()
+
+        def thief():
+            while not done.is_set() or not deque.is_empty():
+                try:
+                    stolen.append(deque.steal())
+                except Exception:
+                    pass
+
+        thieves = [threading.Thread(target=thief) for _ in range(3)]
+        for thread in thieves:
+            thread.start()
+        for x in range(20000):
+            deque.push(x)
+            if x % 3 == 0:
+                try:
+                    popped.append(deque.pop())
+                except Exception:
+                    pass
+        done.set()
+        for thread in thieves:
+            thread.join()
+        # Every item is taken exactly once
+        self.assertEqual(sorted(stolen + popped), [x for x in range(20000)])
+
+
+class TestWSExecutor(unittest.TestCase):
+    def test_fork_join(self):
+        def fib(executor, n):
+            if n < 2:
+                return n
+            a = executor.submit(fib, executor, n - 1)
+            b = executor.submit(fib, executor, n - 2)
+            return executor.join(a) + executor.join(b)
+
+        with WorkStealingExecutor(workers=4) as executor:
+            self.assertEqual(executor.join(executor.submit(fib, executor, 15)), 610)
+            futures = [executor.submit(pow, x, 2) for x in range(100)]
+            self.assertEqual([f.result() for f in futures], [x**2 for x in range(100)])
+            with self.assertRaises(ZeroDivisionError):
+                executor.join(executor.submit(lambda: 1 / 0))
+        with self.assertRaises(Exception):
+            executor.submit(pow, 2, 2)
+
+    def test_shutdown(self):
+        # Leaving the with block runs every task still queued
+        with WorkStealingExecutor(workers=2) as executor:
+            futures = [executor.submit(time.sleep, 0.001) for _ in range(50)]
+        self.assertTrue(all(f.done() and not f.cancelled() for f in futures))
+        # Without waiting, the tasks which have not started are cancelled
+        executor = WorkStealingExecutor(workers=2)
+        futures = [executor.submit(time.sleep, 0.01) for _ in range(50)]
+        executor.shutdown(wait=False)
+        wait(futures, timeout=5)
+        self.assertTrue(all(f.done() for f in futures))
+        self.assertTrue(any(f.cancelled() for f in futures))
+
 
 class TestBT(unittest.TestCase):
     def test_init(self):
@@ -206,6 +551,162 @@ class TestBT(unittest.TestCase):
         tree.get(2).add_node(6, "r")
         self.assertTrue(tree.is_balanced())
 
+    def test_node_count(self):
+        tree = BinaryTree().preset(1000)
+        self.assertEqual(tree.node_count, 1000)
+        self.assertTrue(tree.packed)
+        self.assertEqual([node.key for node in tree.breadth_first()], list(range(1000)))
+        # Deleting the last node keeps the tree packed, deleting any other does not
+        tree.delete(999)
+        self.assertTrue(tree.packed)
+        tree.delete(3)
+        self.assertEqual(tree.node_count, 999 - 255)
+        self.assertFalse(tree.packed)
+        # The gaps are filled first, after which the tree is packed again
+        tree.extend([x for x in range(1000, 1256)])
+        self.assertEqual(tree.node_count, 1000)
+        self.assertTrue(tree.packed)
+        self.assertTrue(tree.is_complete())
+        tree.delete(0)
+        self.assertEqual((tree.node_count, tree.packed), (0, True))
+        # Changes made through the nodes are picked up by recount
+        tree = BinaryTree().preset(6)
+        tree.get(1).del_node("l")
+        tree.recount()
+        self.assertEqual((tree.node_count, tree.packed), (5, False))
+        tree.add(6)
+        self.assertEqual(tree.get(1).l.key, 6)
+        self.assertTrue(tree.packed)
+
+    def test_from_level_order(self):
+        tree = BinaryTree.from_level_order([0, 1, 2, None, 4, 5, None, None, None, 9])
+        self.assertEqual([node.key for node in tree.preorder()], [0, 1, 4, 9, 2, 5])
+        self.assertEqual(tree.get(4).l.key, 9)
+        self.assertEqual((tree.node_count, tree.packed), (6, False))
+        tree = BinaryTree(data=[x for x in range(20)] + [None, None])
+        self.assertEqual(str(tree), str(BinaryTree().preset(20)))
+        self.assertEqual((tree.node_count, tree.packed), (20, True))
+        self.assertIsNone(BinaryTree.from_level_order([]).root)
+        with self.assertRaises(Exception):
+            BinaryTree.from_level_order([0, None, 2, 3])
+        # A hole with a key below it is rejected before the tree is touched
+        tree = BinaryTree().preset(3)
+        root, edits = tree.root, tree.edits
+        with self.assertRaises(Exception):
+            tree.build_level_order([0, None, 2, 3])
+        self.assertIs(tree.root, root)
+        self.assertEqual((tree.node_count, tree.packed, tree.edits), (3, True, edits))
+        tree = BinaryTree(data=[0, 1, 2, None, 4], indexed=True)
+        self.assertIs(tree.get(4), tree.root.l.r)
+        self.assertIs(tree.parents[4], tree.root.l)
+        # Subclasses get their own nodes, with heights set from the bottom up
+        avl = AVLTree.from_level_order([3, 1, 5, 0, 2, 4])
+        self.assertIsInstance(avl.get(0), AVLTree.AVLNode)
+        self.assertEqual(
+            [avl.root.height, avl.get(1).height, avl.get(5).height], [2, 1, 1]
+        )
+        self.assertTrue(avl.is_bst())
+        avl.add(6)
+        self.assertTrue(avl.is_balanced())
+
+    def test_analyze(self):
+        tree = BinaryTree().preset(6)
+        self.assertEqual(
+            tree.analyze(),
+            {
+                "height": 2,
+                "size": 6,
+                "perfect": False,
+                "full": False,
+                "complete": True,
+                "balanced": True,
+                "bst": False,
+            },
+        )
+        # The cache is reused, but callers get a copy of it
+        analysis = tree.analyze()
+        self.assertIsNot(tree.analyze(), analysis)
+        cache = tree.analysis
+        analysis["size"] = 0
+        self.assertEqual(tree.analyze()["size"], 6)
+        self.assertIs(tree.analysis, cache)
+        # Changes through the tree are seen, and direct changes after a recount
+        tree.add(6)
+        self.assertTrue(tree.is_perfect())
+        tree.delete(6)
+        self.assertEqual((tree.analyze()["size"], tree.is_perfect()), (6, False))
+        tree.get(1).del_node("l")
+        tree.recount()
+        self.assertEqual(tree.analyze()["size"], 5)
+        self.assertFalse(tree.is_complete())
+        # The predicates always see direct changes
+        tree.root.l.l = BinaryTree.BTNode(7)
+        self.assertTrue(tree.is_complete())
+        self.assertEqual(tree.analyze(cached=False)["size"], 6)
+        tree.root = tree.get(1)
+        tree.recount()
+        self.assertEqual(tree.analyze()["height"], 1)
+        # Each tree has its own cache
+        other = BinaryTree().preset(3)
+        analysis = other.analyze()
+        cache = other.analysis
+        tree.add(8)
+        tree.extend([9])
+        tree.delete(9)
+        self.assertEqual(other.analyze(), analysis)
+        self.assertIs(other.analysis, cache)
+        avl = AVLTree(data=[x for x in range(7)])
+        self.assertTrue(avl.is_perfect())
+        avl.add(7)
+        self.assertEqual((avl.is_perfect(), other.analyze()), (False, analysis))
+        self.assertEqual(
+            BinaryTree().analyze(),
+            {
+                "height": -1,
+                "size": 0,
+                "perfect": True,
+                "full": True,
+                "complete": True,
+                "balanced": True,
+                "bst": True,
+            },
+        )
+        self.assertTrue(BinarySearchTree().preset(20).analyze()["bst"])
+        self.assertFalse(BinaryTree(data=["a", 1, 2]).analyze()["bst"])
+
+    def test_index(self):
+        tree = BinaryTree(data=[x for x in range(15)], indexed=True)
+        self.assertIs(tree.get(9), tree.root.l.r.l)
+        self.assertIs(tree.parents[9], tree.root.l.r)
+        self.assertIn(14, tree)
+        self.assertNotIn(15, tree)
+        with self.assertRaises(KeyError):
+            tree.get(15)
+        with self.assertRaises(Exception):
+            tree.add(3)
+        # Deleting a subtree removes all of its keys
+        tree.delete(1)
+        self.assertEqual(sorted(tree.index), [0, 2, 5, 6, 11, 12, 13, 14])
+        self.assertEqual(tree.node_count, 8)
+        tree.add(15)
+        self.assertIs(tree.parents[15], tree.root)
+        self.assertEqual(tree.get(15), tree.root.l)
+        tree.delete(0)
+        self.assertEqual((tree.index, tree.parents, tree.node_count), ({}, {}, 0))
+        tree.add(16)
+        self.assertIn(16, tree)
+        # Changes through the nodes need a reindex
+        tree.root.add_node(17, "l")
+        tree.reindex()
+        self.assertIs(tree.parents[17], tree.root)
+        tree.root.add_node(16, "r")
+        with self.assertRaises(Exception):
+            tree.reindex()
+        # Without an index, get returns the first match in preorder
+        tree = BinaryTree(data=[0, 1, 2, 1])
+        self.assertIs(tree.get(1), tree.root.l)
+        self.assertIn(2, tree)
+
     def test_breadth_first(self):
         nodes = list(BinaryTree().preset(7).breadth_first())
         keys = [node.key for node in nodes]
@@ -226,6 +727,66 @@ class TestBT(unittest.TestCase):
         keys = [node.key for node in nodes]
         self.assertEqual(keys, [3, 4, 1, 5, 6, 2, 0])
 
+    def test_reverse_flatten(self):
+        nodes = list(BinaryTree().preset(7).flatten(reverse=True))
+        keys = [node.key for node in nodes]
+        self.assertEqual(keys, [6, 2, 5, 0, 4, 1, 3])
+
+    def test_deep_traversal(self):
+        # Adding sorted keys to a bst makes a single chain of right children. It is
+        # linked directly here, as it is deeper than the recursion limit
+        bst = BinarySearchTree()
+        bst.add_root(0)
+        node = bst.root
+        for x in range(1, 5000):
+            node.add_node(x, "r")
+            node = node.r
+        keys = [x for x in range(5000)]
+        self.assertEqual([node.key for node in bst.flatten()], keys)
+        self.assertEqual([node.key for node in bst.flatten(reverse=True)], keys[::-1])
+        self.assertEqual([node.key for node in bst.preorder()], keys)
+        self.assertEqual([node.key for node in bst.postorder()], keys[::-1])
+        self.assertTrue(bst.is_bst())
+        self.assertFalse(bst.is_balanced())
+        self.assertEqual(bst.analyze()["height"], 4999)
+
+    def test_morris(self):
+        def shape(node):
+            return node and (node.key, node.height, shape(node.l), shape(node.r))
+
+        avl = AVLTree(data=[x for x in range(20)])
+        before = shape(avl.root)
+        for reverse in (False, True):
+            self.assertEqual(
+                list(avl.flatten(reverse=reverse, mode="morris")),
+                list(avl.flatten(reverse=reverse)),
+            )
+        self.assertEqual(list(avl.preorder(mode="morris")), list(avl.preorder()))
+        self.assertEqual(shape(avl.root), before)
+        # The threads are removed when the traversal is stopped early
+        for node in avl.flatten(mode="morris"):
+            if node.key == 7:
+                break
+        traversal = avl.preorder(mode="morris")
+        next(traversal)
+        next(traversal)
+        traversal.close()
+        self.assertEqual(shape(avl.root), before)
+        with self.assertRaises(Exception):
+            list(avl.flatten(mode="recursive"))
+
+    def test_slots(self):
+        node = BinaryTree().preset(3).root
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.style = "bold"
+        self.assertFalse(hasattr(AVLTree(data=[0]).root, "__dict__"))
+        # Subclasses which do not declare __slots__ can still add attributes
+        from avlslideshow import AVL_Slideshow
+
+        node = AVL_Slideshow.AVL_Slideshow_Node(0, style="bold")
+        self.assertEqual(node.style, "bold")
+
 
 class TestBST(unittest.TestCase):
     def test_init(self):
@@ -361,6 +922,715 @@ class TestHeap(unittest.TestCase):
                 heap.pop()
                 self.assertTrue(heap.is_heap())
 
+    def test_min_heap(self):
+        data = [random.randint(0, 20) for _ in range(200)]
+        heap = Heap(data=data[:], max_or_min="min")
+        self.assertTrue(heap.is_heap())
+        self.assertEqual(heap.peek(), min(data))
+        for x in range(50):
+            heap.add(x % 7)
+            data.append(x % 7)
+            self.assertTrue(heap.is_heap())
+        self.assertEqual([heap.pop() for _ in range(len(data))], sorted(data))
+        with self.assertRaises(Exception):
+            heap.pop()
+
+    def test_duplicates(self):
+        heap = Heap(data=[3, 3, 1, 3, 2, 2])
+        self.assertTrue(heap.is_heap())
+        self.assertEqual([heap.pop() for _ in range(6)], [3, 3, 3, 2, 2, 1])
+        with self.assertRaises(Exception):
+            Heap(max_or_min="middle")
+
+    def test_key(self):
+        calls = []
+
+        def key(x):
+            calls.append(x)
+            return len(x)
+
+        words = ["ccc", "a", "bb", "dd", "e", "fff"]
+        heap = Heap(data=words[:], max_or_min="min", key=key)
+        heap.add("gg")
+        self.assertTrue(heap.is_heap())
+        self.assertEqual(len(calls), 7)
+        # Equal keys come out in the order they were added
+        self.assertEqual(
+            [heap.pop() for _ in range(7)], ["a", "e", "bb", "dd", "gg", "ccc", "fff"]
+        )
+        self.assertEqual(len(calls), 7)
+
+    def test_entries(self):
+        heap = Heap(max_or_min="max", entries=True)
+        contents = []
+        for x in range(200):
+            priority = random.randint(0, 10)
+            # Dictionaries cannot be compared, so a tie must never compare them
+            heap.add({"id": x}, priority)
+            contents.append((-priority, x))
+            self.assertTrue(heap.is_heap())
+        contents.sort()
+        for priority, x in contents:
+            self.assertEqual(heap.pop_entry(), (-priority, {"id": x}))
+        heap = Heap(data=[(2, "b"), (1, "a"), (2, "c")], max_or_min="min", entries=True)
+        # Priorities and sequence numbers are kept in their own lists, not paired
+        self.assertEqual((heap.keys[0], heap.seqs[0]), (1, 2))
+        self.assertEqual(sorted(zip(heap.keys, heap.seqs)), [(1, 2), (2, 1), (2, 3)])
+        self.assertEqual(heap.peek(), "a")
+        self.assertEqual([heap.pop() for _ in range(3)], ["a", "b", "c"])
+        with self.assertRaises(Exception):
+            Heap(key=len, entries=True)
+
+    def test_arity(self):
+        for arity in (3, 4, 8):
+            for max_or_min in ("max", "min"):
+                data = [random.randint(0, 50) for _ in range(300)]
+                heap = Heap(data=data[:150], max_or_min=max_or_min, arity=arity)
+                self.assertTrue(heap.is_heap())
+                for x in data[150:]:
+                    heap.add(x)
+                    self.assertTrue(heap.is_heap())
+                output = [heap.pop() for _ in range(300)]
+                self.assertEqual(output, sorted(data, reverse=max_or_min == "max"))
+        heap = Heap(max_or_min="min", entries=True, arity=4)
+        for x in range(50):
+            heap.add(x, x % 3)
+        self.assertTrue(heap.is_heap())
+        expected = sorted(range(50), key=lambda x: (x % 3, x))
+        self.assertEqual([heap.pop() for _ in range(50)], expected)
+        heap = Heap(data=["ccc", "a", "bb"], key=len, arity=3)
+        self.assertEqual(heap.peek(), "ccc")
+        with self.assertRaises(Exception):
+            Heap(arity=1)
+
+    def test_extend(self):
+        for max_or_min in ("max", "min"):
+            for n, m in ((100, 5), (100, 1000), (0, 50)):
+                data = [random.randint(0, 100) for _ in range(n + m)]
+                heap = Heap(data=data[:n], max_or_min=max_or_min)
+                heap.extend(x for x in data[n:])
+                self.assertTrue(heap.is_heap())
+                output = [heap.pop() for _ in range(n + m)]
+                self.assertEqual(output, sorted(data, reverse=max_or_min == "max"))
+        heap = Heap(data=[(1, "b"), (0, "a")], max_or_min="min", entries=True)
+        heap.extend([(1, "c"), (2, "d")])
+        self.assertEqual([heap.pop() for _ in range(4)], ["a", "b", "c", "d"])
+        heap = Heap(data=["bb"], key=len, arity=3)
+        heap.extend(["a", "ccc"])
+        self.assertEqual([heap.pop() for _ in range(3)], ["ccc", "bb", "a"])
+
+    def test_copy(self):
+        # The default data is not shared between heaps
+        heap = Heap()
+        heap.add(1)
+        self.assertEqual(Heap().data, [])
+        data = [3, 1, 2]
+        heap = Heap(data=data)
+        heap.add(4)
+        self.assertEqual(data, [3, 1, 2])
+        heap = Heap(data=data, copy=False)
+        self.assertIs(heap.data, data)
+        self.assertEqual(data[0], 3)
+        heap = Heap(data=(x for x in range(5)), max_or_min="min", copy=False)
+        self.assertEqual(heap.pop(), 0)
+
+    def test_pushpop_replace(self):
+        for max_or_min in ("max", "min"):
+            data = [random.randint(0, 50) for _ in range(200)]
+            heap = Heap(data=data[:20], max_or_min=max_or_min)
+            contents = sorted(data[:20], reverse=max_or_min == "max")
+            for x in data[20:]:
+                if x % 2:
+                    contents.append(x)
+                    contents.sort(reverse=max_or_min == "max")
+                    self.assertEqual(heap.pushpop(x), contents.pop(0))
+                else:
+                    self.assertEqual(heap.replace(x), contents.pop(0))
+                    contents.append(x)
+                    contents.sort(reverse=max_or_min == "max")
+                self.assertTrue(heap.is_heap())
+        heap = Heap(data=[], max_or_min="min", entries=True)
+        self.assertEqual(heap.pushpop("a", 1), "a")
+        heap.add("b", 2)
+        # Ties go to the item already in the heap, as with add then pop
+        self.assertEqual(heap.pushpop("c", 2), "b")
+        self.assertEqual(heap.replace("d", 3), "c")
+        self.assertEqual(heap.pop_entry(), (3, "d"))
+        with self.assertRaises(Exception):
+            heap.replace("e", 1)
+
+    def test_top_k(self):
+        data = [random.randint(0, 30) for _ in range(300)]
+        pairs = [(x, i) for i, x in enumerate(data)]
+        for k in (0, 1, 10, 300, 400):
+            self.assertEqual(nlargest(k, iter(data)), sorted(data, reverse=True)[:k])
+            self.assertEqual(nsmallest(k, iter(data)), sorted(data)[:k])
+            # Equal keys keep the order they appeared in
+            key = lambda p: p[0] % 7
+            self.assertEqual(
+                nlargest(k, pairs, key=key), sorted(pairs, key=key, reverse=True)[:k]
+            )
+            self.assertEqual(nsmallest(k, pairs, key=key), sorted(pairs, key=key)[:k])
+
+    def test_heapsort(self):
+        for size in (0, 1, 2, 10, 257):
+            data = [random.randint(0, 20) for _ in range(size)]
+            for reverse in (False, True):
+                output = data[:]
+                heapsort(output, reverse=reverse)
+                self.assertEqual(output, sorted(data, reverse=reverse))
+                # Equal keys keep their order
+                pairs = [(x % 4, i) for i, x in enumerate(data)]
+                output = pairs[:]
+                heapsort(output, reverse=reverse, key=lambda p: p[0])
+                expected = sorted(pairs, key=lambda p: p[0], reverse=reverse)
+                self.assertEqual(output, expected)
+
+    def test_partial_sort(self):
+        data = [random.randint(0, 50) for _ in range(300)]
+        pairs = [(x % 7, i) for i, x in enumerate(data)]
+        key = lambda p: p[0]
+        for k in (0, 1, 10, 299, 300, 400):
+            for reverse in (False, True):
+                output = data[:]
+                partial_sort(output, k, reverse=reverse)
+                self.assertEqual(output[:k], sorted(data, reverse=reverse)[:k])
+                self.assertEqual(sorted(output), sorted(data))
+                output = pairs[:]
+                partial_sort(output, k, reverse=reverse, key=key)
+                expected = sorted(pairs, key=key, reverse=reverse)[:k]
+                self.assertEqual(output[:k], expected)
+                self.assertEqual(sorted(output), sorted(pairs))
+
+    def test_merge(self):
+        runs = [sorted(random.randint(0, 20) for _ in range(n)) for n in range(8)]
+        self.assertEqual(list(merge(*runs)), sorted(sum(runs, [])))
+        runs = [sorted(run, reverse=True) for run in runs]
+        self.assertEqual(
+            list(merge(*runs, reverse=True)), sorted(sum(runs, []), reverse=True)
+        )
+        runs = [[(x, i) for x in sorted(run)] for i, run in enumerate(runs)]
+        key = lambda p: p[0]
+        self.assertEqual(list(merge(*runs, key=key)), sorted(sum(runs, []), key=key))
+        self.assertEqual(list(merge()), [])
+        # Lazy, so an infinite iterable can be merged
+        evens = (x for x in range(0, 10**9, 2))
+        odds = (x for x in range(1, 10**9, 2))
+        merged = merge(evens, odds)
+        self.assertEqual([next(merged) for _ in range(10)], list(range(10)))
+
+
+class TestIndexedHeap(unittest.TestCase):
+    def test_update(self):
+        heap = IndexedHeap(data=[(5, "a"), (3, "b"), (8, "c"), (4, "d")])
+        self.assertEqual(heap.peek(), "b")
+        heap.update("c", 1)
+        self.assertEqual(heap.peek(), "c")
+        self.assertEqual(heap.priority_of("c"), 1)
+        heap.update("c", 9)
+        self.assertEqual(heap.peek(), "b")
+        heap.decrease_key("a", 2)
+        self.assertEqual(heap.peek(), "a")
+        with self.assertRaises(Exception):
+            heap.decrease_key("a", 6)
+        with self.assertRaises(KeyError):
+            heap.update("e", 1)
+        with self.assertRaises(Exception):
+            heap.add("a", 1)
+        with self.assertRaises(Exception):
+            IndexedHeap(data=[(1, "a"), (2, "a")])
+
+    def test_remove(self):
+        heap = IndexedHeap(data=[(x % 5, x) for x in range(20)], max_or_min="max")
+        for x in range(0, 20, 3):
+            heap.remove(x)
+            self.assertNotIn(x, heap)
+            self.assertTrue(heap.is_heap())
+        self.assertIn(1, heap)
+        self.assertEqual(len(heap), 13)
+        with self.assertRaises(KeyError):
+            heap.remove(0)
+        # Equal priorities come out in the order they were added
+        self.assertEqual(
+            [heap.pop() for _ in range(len(heap))],
+            [4, 14, 19, 8, 13, 2, 7, 17, 1, 11, 16, 5, 10],
+        )
+
+    def test_stress(self):
+        for max_or_min in ("max", "min"):
+            heap = IndexedHeap(max_or_min=max_or_min)
+            contents = {}
+            for x in range(500):
+                item = random.randint(0, 50)
+                priority = random.randint(0, 20)
+                op = random.randint(0, 3)
+                if op == 0 and item not in contents:
+                    heap.add(item, priority)
+                    contents[item] = priority
+                if op == 1 and item in contents:
+                    heap.update(item, priority)
+                    contents[item] = priority
+                if op == 2 and item in contents:
+                    heap.remove(item)
+                    del contents[item]
+                if op == 3 and contents:
+                    priority, item = heap.pop_entry()
+                    self.assertEqual(contents.pop(item), priority)
+                self.assertTrue(heap.is_heap())
+                self.assertEqual(len(heap), len(contents))
+                for item, i in heap.index.items():
+                    self.assertEqual(heap.data[i], item)
+
+    def test_extend(self):
+        heap = IndexedHeap(data=[(5, "a")])
+        heap.extend([(3, "b"), (8, "c")])
+        heap.extend((x, str(x)) for x in range(10))
+        self.assertEqual(heap.pop(), "0")
+        self.assertEqual(heap.priority_of("c"), 8)
+        for item, i in heap.index.items():
+            self.assertEqual(heap.data[i], item)
+        with self.assertRaises(Exception):
+            heap.extend([(1, "a")])
+        with self.assertRaises(Exception):
+            heap.extend([(1, "x"), (2, "x")])
+        self.assertNotIn("x", heap)
+
+    def test_pushpop_replace(self):
+        heap = IndexedHeap(data=[(5, "a"), (3, "b"), (8, "c")])
+        self.assertEqual(heap.pushpop("d", 1), "d")
+        self.assertEqual(heap.pushpop("e", 4), "b")
+        self.assertEqual(heap.replace("f", 9), "e")
+        self.assertNotIn("b", heap)
+        self.assertNotIn("e", heap)
+        self.assertEqual(heap.priority_of("f"), 9)
+        for item, i in heap.index.items():
+            self.assertEqual(heap.data[i], item)
+        with self.assertRaises(Exception):
+            heap.pushpop("a", 0)
+
+
+class TestPairingHeap(unittest.TestCase):
+    def test_add_pop(self):
+        for max_or_min in ("max", "min"):
+            data = [random.randint(0, 100) for _ in range(500)]
+            heap = PairingHeap(data=data[:250], max_or_min=max_or_min)
+            output = []
+            for x in data[250:]:
+                heap.add(x)
+                if x % 3 == 0:
+                    output.append(heap.pop())
+            self.assertEqual(len(heap), 500 - len(output))
+            while not heap.is_empty():
+                output.append(heap.pop())
+            self.assertEqual(len(output), 500)
+            self.assertEqual(sorted(output), sorted(data))
+        heap = PairingHeap(data=["bb", "a", "ccc"], max_or_min="min", key=len)
+        self.assertEqual(heap.peek(), "a")
+        heap.add("dddd", 0)
+        self.assertEqual(heap.pop_entry(), (0, "dddd"))
+        with self.assertRaises(Exception):
+            PairingHeap().pop()
+        with self.assertRaises(Exception):
+            PairingHeap().peek()
+
+    def test_sorted(self):
+        data = [x for x in range(100_000)]
+        random.shuffle(data)
+        # One long list of children under the root, which a recursive pop would not
+        # survive
+        heap = PairingHeap(max_or_min="min")
+        heap.add(-1)
+        heap.extend(data)
+        self.assertEqual([heap.pop() for _ in range(100_001)], [-1] + sorted(data))
+
+    def test_meld(self):
+        shards = [PairingHeap(data=[x for x in range(i, 100, 5)]) for i in range(5)]
+        heap = PairingHeap()
+        for shard in shards:
+            heap.meld(shard)
+            self.assertTrue(shard.is_empty())
+        heap.meld(heap)
+        self.assertEqual(len(heap), 100)
+        self.assertEqual([heap.pop() for _ in range(100)], list(range(99, -1, -1)))
+        with self.assertRaises(Exception):
+            heap.meld(PairingHeap(max_or_min="min"))
+
+
+class TestMinMaxHeap(unittest.TestCase):
+    def test_build(self):
+        for size in range(40):
+            data = [random.randint(0, 20) for _ in range(size)]
+            heap = MinMaxHeap(data=data)
+            self.assertTrue(heap.is_heap())
+            self.assertEqual(sorted(heap.data), sorted(data))
+            if data:
+                self.assertEqual(heap.peek_min(), min(data))
+                self.assertEqual(heap.peek_max(), max(data))
+        with self.assertRaises(Exception):
+            MinMaxHeap().peek_max()
+        with self.assertRaises(Exception):
+            MinMaxHeap().pop_min()
+
+    def test_double_ended(self):
+        heap = MinMaxHeap()
+        contents = []
+        for _ in range(2000):
+            op = random.random()
+            if op < 0.5 or not contents:
+                x = random.randint(0, 100)
+                heap.add(x)
+                contents.append(x)
+                contents.sort()
+            elif op < 0.75:
+                self.assertEqual(heap.pop_min(), contents.pop(0))
+            else:
+                self.assertEqual(heap.pop_max(), contents.pop())
+            self.assertTrue(heap.is_heap())
+            self.assertEqual(len(heap), len(contents))
+            if contents:
+                self.assertEqual(heap.peek_min(), contents[0])
+                self.assertEqual(heap.peek_max(), contents[-1])
+
+    def test_bounded(self):
+        # Keep the ten highest scores, evicting the lowest
+        heap = MinMaxHeap()
+        scores = [random.randint(0, 1000) for _ in range(500)]
+        for x in scores:
+            heap.add(x)
+            if len(heap) > 10:
+                heap.pop_min()
+        best = [heap.pop_max() for _ in range(10)]
+        self.assertEqual(best, sorted(scores, reverse=True)[:10])
+        self.assertTrue(heap.is_empty())
+
+
+@unittest.skipIf(npheap.np is None, "numpy not installed")
+class TestNumericHeap(unittest.TestCase):
+    def test_heapify(self):
+        for size in range(70):
+            data = [float(random.randint(0, 20)) for _ in range(size)]
+            for max_or_min in ("max", "min"):
+                heap = NumericHeap(keys=data, max_or_min=max_or_min)
+                self.assertTrue(heap.is_heap())
+                output = [heap.pop() for _ in range(size)]
+                self.assertEqual(output, sorted(data, reverse=max_or_min == "max"))
+        # Small batches from a large heap are popped one at a time
+        data = [random.random() for _ in range(5000)]
+        heap = NumericHeap(keys=data, max_or_min="max")
+        self.assertEqual(list(heap.pop_many(5)), sorted(data, reverse=True)[:5])
+        self.assertTrue(heap.is_heap())
+        with self.assertRaises(Exception):
+            NumericHeap().pop()
+        with self.assertRaises(Exception):
+            NumericHeap(keys=[1.0, 2.0], payload=[1])
+
+    def test_batches(self):
+        for max_or_min in ("max", "min"):
+            heap = NumericHeap(payload=[], max_or_min=max_or_min, initial_capacity=1)
+            contents = []
+            for _ in range(200):
+                op = random.random()
+                if op < 0.4:
+                    keys = [
+                        float(random.randint(0, 100))
+                        for _ in range(random.randint(0, 50))
+                    ]
+                    heap.push_many(keys, [int(k) for k in keys])
+                    contents.extend(keys)
+                elif op < 0.6:
+                    key = float(random.randint(0, 100))
+                    heap.push(key, int(key))
+                    contents.append(key)
+                else:
+                    k = random.randint(0, len(contents) + 2)
+                    keys, payload = heap.pop_many(k)
+                    contents.sort(reverse=max_or_min == "max")
+                    self.assertEqual(list(keys), contents[:k])
+                    self.assertEqual(list(payload), [int(x) for x in contents[:k]])
+                    contents = contents[k:]
+                self.assertTrue(heap.is_heap())
+                self.assertEqual(len(heap), len(contents))
+            if contents:
+                best = max(contents) if max_or_min == "max" else min(contents)
+                self.assertEqual(heap.peek(), best)
+
+
+class TestPQueue(unittest.TestCase):
+    def test_order(self):
+        queue = PriorityQueue()
+        queue.extend([("c", 3), ("a", 1), ("b", 2), ("a2", 1)])
+        queue.put("d", 4)
+        self.assertEqual(len(queue), 5)
+        self.assertEqual(queue.get(), "a")
+        self.assertEqual(queue.get_many(3), ["a2", "b", "c"])
+        self.assertEqual(queue.get_many(3), ["d"])
+        self.assertTrue(queue.is_empty())
+        with self.assertRaises(Exception):
+            queue.get(timeout=0)
+        with self.assertRaises(Exception):
+            queue.get_many(2, timeout=0.01)
+        queue = PriorityQueue(max_or_min="max", key=len)
+        queue.extend(["a", "ccc", "bb"])
+        self.assertEqual(queue.get_many(5), ["ccc", "bb", "a"])
+        with self.assertRaises(Exception):
+            queue.put("dd", 2)
+        with self.assertRaises(Exception):
+            PriorityQueue().put("e")
+        self.assertTrue(queue.is_empty())
+
+    def test_threads(self):
+        queue = PriorityQueue()
+        results = []
+        lock = threading.Lock()
+
+        def consume():
+            while True:
+                items = queue.get_many(8)
+                if items[-1] is None:
+                    # Put the sentinel back for the next consumer
+                    queue.put(None, float("inf"))
+                with lock:
+                    results.extend(x for x in items if x is not None)
+                if items[-1] is None:
+                    return
+
+        consumers = [threading.Thread(target=consume) for _ in range(4)]
+        for thread in consumers:
+            thread.start()
+
+        def produce(start):
+            for x in range(start, start + 500):
+                queue.put(x, x)
+
+        producers = [
+            threading.Thread(target=produce, args=(i * 500,)) for i in range(4)
+        ]
+        for thread in producers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        # Sorts after every number, so consumers stop once the numbers are gone
+        queue.put(None, float("inf"))
+        for thread in consumers:
+            thread.join()
+        self.assertEqual(sorted(results), list(range(2000)))
+
+
+class TestAsyncPQueue(unittest.TestCase):
+    def test_order(self):
+        async def run():
+            queue = AsyncPriorityQueue()
+            queue.extend([("c", 3), ("a", 1), ("b", 2)])
+            self.assertEqual(await queue.get(), "a")
+            self.assertEqual(await queue.get_many(5), ["b", "c"])
+            with self.assertRaises(Exception):
+                await queue.get(timeout=0)
+            with self.assertRaises(Exception):
+                await queue.get_many(2, timeout=0.01)
+            with self.assertRaises(Exception):
+                queue.put("d")
+            with self.assertRaises(Exception):
+                AsyncPriorityQueue(key=len).put("d", 1)
+
+        asyncio.run(run())
+
+    def test_waiters(self):
+        async def run():
+            queue = AsyncPriorityQueue(max_or_min="max")
+            getters = [asyncio.create_task(queue.get()) for _ in range(3)]
+            cancelled = asyncio.create_task(queue.get())
+            await asyncio.sleep(0)
+            self.assertEqual(len(queue.getters), 4)
+            cancelled.cancel()
+            for x in range(3):
+                queue.put(x, x)
+            self.assertEqual(sorted(await asyncio.gather(*getters)), [0, 1, 2])
+            self.assertTrue(queue.is_empty())
+            # A waiter woken and then cancelled passes the item on
+            first = asyncio.create_task(queue.get())
+            second = asyncio.create_task(queue.get())
+            await asyncio.sleep(0)
+            queue.put("x", 1)
+            first.cancel()
+            self.assertEqual(await second, "x")
+            # Waiters which time out or are cancelled are removed from getters
+            for _ in range(50):
+                with self.assertRaises(Exception):
+                    await queue.get(timeout=0.001)
+            self.assertEqual(len(queue.getters), 0)
+            waiting = asyncio.create_task(queue.get())
+            cancelled = asyncio.create_task(queue.get())
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+            self.assertEqual(len(queue.getters), 1)
+            queue.put("y", 1)
+            self.assertEqual(await waiting, "y")
+            self.assertEqual(len(queue.getters), 0)
+
+        asyncio.run(run())
+
+
+class TestRunningQuantile(unittest.TestCase):
+    def test_median(self):
+        median = RunningMedian()
+        with self.assertRaises(Exception):
+            median.median()
+        data = []
+        for _ in range(300):
+            x = random.randint(0, 100)
+            median.add(x)
+            data.append(x)
+            data.sort()
+            mid = len(data) // 2
+            expected = data[mid] if len(data) % 2 else (data[mid - 1] + data[mid]) / 2
+            self.assertEqual(median.median(), expected)
+        with self.assertRaises(KeyError):
+            median.remove(101)
+
+    def test_sliding_window(self):
+        samples = [random.randint(0, 50) for _ in range(2000)]
+        for q in (0, 0.25, 0.5, 0.9, 1):
+            tracker = RunningQuantile(q=q)
+            for i, x in enumerate(samples):
+                tracker.add(x)
+                if i >= 100:
+                    tracker.remove(samples[i - 100])
+                window = sorted(samples[max(0, i - 99) : i + 1])
+                position = q * (len(window) - 1)
+                below = window[int(position)]
+                above = window[min(int(position) + 1, len(window) - 1)]
+                expected = below + (above - below) * (position - int(position))
+                self.assertAlmostEqual(tracker.quantile(), expected)
+                self.assertEqual(len(tracker), len(window))
+            # Removed numbers never make up much more than half of a heap
+            self.assertLessEqual(len(tracker.low.data), 2 * tracker.low_size + 17)
+            self.assertLessEqual(len(tracker.high.data), 2 * tracker.high_size + 17)
+        with self.assertRaises(Exception):
+            RunningQuantile(q=1.5)
+
+
+class TestRadixHeap(unittest.TestCase):
+    def test_pop_order(self):
+        heap = RadixHeap()
+        with self.assertRaises(Exception):
+            heap.pop()
+        with self.assertRaises(Exception):
+            heap.peek()
+        model = []
+        last = 0
+        for _ in range(2000):
+            if model and random.random() < 0.45:
+                smallest = min(model)
+                self.assertEqual(heap.peek(), smallest)
+                self.assertEqual(heap.pop(), smallest)
+                model.remove(smallest)
+                last = smallest
+            else:
+                x = last + random.randint(0, random.choice([3, 100, 10**12]))
+                heap.add(x)
+                model.append(x)
+            self.assertEqual(len(heap), len(model))
+        self.assertEqual([heap.pop() for _ in range(len(model))], sorted(model))
+        self.assertTrue(heap.is_empty())
+
+    def test_monotone(self):
+        heap = RadixHeap(data=[5, 8])
+        # Peeking does not count as popping, so smaller priorities can still be added
+        self.assertEqual(heap.peek(), 5)
+        heap.add(3)
+        self.assertEqual(heap.pop(), 3)
+        with self.assertRaises(Exception):
+            heap.add(2)
+        heap.add(3)
+        self.assertEqual(heap.pop_entry(), (3, 3))
+
+    def test_peek_ties(self):
+        heap = RadixHeap()
+        heap.add("a", 3)
+        heap.add("b", 3)
+        self.assertEqual(heap.peek(), heap.pop())
+        self.assertEqual(heap.peek(), heap.pop())
+        for _ in range(200):
+            heap.add(random.randint(0, 10), heap.last + random.randint(0, 3))
+            heap.add(random.randint(0, 10), heap.last + random.randint(0, 3))
+            self.assertEqual(heap.peek(), heap.pop())
+        # Peek and pop agree on ties in buckets above 0
+        heap = RadixHeap()
+        for x in range(50):
+            heap.add(x, random.choice([1 << 10, 1 << 10, (1 << 10) + 1, 1 << 20]))
+        while not heap.is_empty():
+            self.assertEqual(heap.peek(), heap.pop())
+
+    def test_key(self):
+        heap = RadixHeap(data=["ccc", "a", "bb"], key=len)
+        heap.add("dddd", 0)
+        self.assertEqual([heap.pop() for _ in range(4)], ["dddd", "a", "bb", "ccc"])
+
+
+class TestArrayBinaryTree(unittest.TestCase):
+    def test_matches_bt(self):
+        array_tree, tree = ArrayBinaryTree(), BinaryTree()
+        for step in range(400):
+            # Keys repeat, so a delete can remove several subtrees
+            key = random.randrange(30)
+            if random.random() < 0.3:
+                array_tree.delete(key)
+                tree.delete(key)
+            else:
+                array_tree.add(key)
+                tree.add(key)
+            self.assertEqual(len(array_tree), tree.node_count)
+            self.assertEqual(array_tree.packed, tree.packed)
+            if tree.root:
+                self.assertEqual(str(array_tree), str(tree))
+            for traversal in ("breadth_first", "flatten", "preorder", "postorder"):
+                self.assertEqual(
+                    [node.key for node in getattr(array_tree, traversal)()],
+                    [node.key for node in getattr(tree, traversal)()],
+                )
+            for reverse in (False, True):
+                self.assertEqual(
+                    [node.key for node in array_tree.flatten(reverse, mode="morris")],
+                    [node.key for node in tree.flatten(reverse=reverse)],
+                )
+            self.assertEqual(
+                [node.key for node in array_tree.preorder(mode="morris")],
+                [node.key for node in tree.preorder()],
+            )
+        # Deleted ids are reused
+        self.assertEqual(len(array_tree.keys), len(array_tree) + len(array_tree.free))
+        with self.assertRaises(Exception):
+            list(array_tree.flatten(mode="recursive"))
+
+    def test_heights(self):
+        def height(node):
+            return -1 if node is None else 1 + max(height(node.l), height(node.r))
+
+        tree = ArrayBinaryTree().preset(20)
+        for key in (9, 2, 15):
+            tree.delete(key)
+            tree.extend(range(100, 104))
+            for node in tree.preorder():
+                self.assertEqual(node.height, height(node))
+
+    def test_get(self):
+        tree = ArrayBinaryTree(data=[0, 1, 2, 1])
+        self.assertEqual(tree.get(1), tree.root.l)
+        self.assertEqual(tree.get(2).key, 2)
+        self.assertIn(1, tree)
+        self.assertNotIn(5, tree)
+        with self.assertRaises(KeyError):
+            tree.get(5)
+        self.assertEqual(
+            tree.get(0).inspect(), {"Key": 0, "Left": 1, "Right": 2, "Height": 2}
+        )
+        tree.delete(5)
+        tree.delete(0)
+        self.assertIsNone(tree.root)
+        self.assertEqual(len(tree), 0)
+        self.assertEqual(list(tree.flatten()), [])
+
 
 if __name__ == "__main__":
     unittest.main()